@@ -0,0 +1,116 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+'''
+A middleware that compresses responses with gzip or deflate.
+'''
+
+import zlib
+
+from oslo_config import cfg
+import webob.dec
+
+from senlin.common.i18n import _
+from senlin.common import wsgi
+
+compress_opts = [
+    cfg.IntOpt('compress_min_size',
+               default=1024,
+               help=_('Responses smaller than this number of bytes are not '
+                      'compressed. Streamed responses, whose size is not '
+                      'known in advance, are always compressed.')),
+    cfg.IntOpt('compress_level',
+               default=6,
+               help=_('Compression level of the responses, from 1 (fastest) '
+                      'to 9 (smallest). 0 disables compression.')),
+]
+cfg.CONF.register_opts(compress_opts, group='senlin_api')
+
+# Supported encodings, by order of preference, and their zlib window bits
+ENCODINGS = (
+    ('gzip', 16 + zlib.MAX_WBITS),
+    ('deflate', zlib.MAX_WBITS),
+)
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-msgpack',
+                      'text/plain', 'text/html')
+
+
+def list_opts():
+    yield 'senlin_api', compress_opts
+
+
+def _compress_iter(app_iter, compressor):
+    try:
+        for chunk in app_iter:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        if hasattr(app_iter, 'close'):
+            app_iter.close()
+
+
+class CompressMiddleware(wsgi.Middleware):
+    """A middleware that compresses the responses.
+
+    The encoding is negotiated with the Accept-Encoding header of the
+    request. Responses with a body of known size are compressed at once,
+    if they are large enough, while streamed responses are compressed as
+    they are produced.
+    """
+
+    def _encoding(self, req):
+        if 'Accept-Encoding' not in req.headers:
+            return None
+        names = [name for name, wbits in ENCODINGS]
+        match = req.accept_encoding.best_match(names)
+        return match if match in names else None
+
+    def _compressible(self, req, response):
+        if req.method == 'HEAD':
+            return False
+        if response.status_int < 200 or response.status_int in (204, 304):
+            return False
+        if response.content_encoding:
+            return False
+        return response.content_type in COMPRESSIBLE_TYPES
+
+    @webob.dec.wsgify
+    def __call__(self, req):
+        response = req.get_response(self.application)
+        level = cfg.CONF.senlin_api.compress_level
+        if level <= 0 or not self._compressible(req, response):
+            return response
+
+        response.vary = tuple(response.vary or ()) + ('Accept-Encoding',)
+        encoding = self._encoding(req)
+        if encoding is None:
+            return response
+
+        length = response.content_length
+        if length is not None and length < cfg.CONF.senlin_api.\
+                compress_min_size:
+            return response
+
+        compressor = zlib.compressobj(min(level, 9), zlib.DEFLATED,
+                                      dict(ENCODINGS)[encoding])
+        if length is None:
+            response.app_iter = _compress_iter(response.app_iter, compressor)
+            response.content_length = None
+        else:
+            response.body = compressor.compress(response.body) + \
+                compressor.flush()
+        response.content_encoding = encoding
+        return response
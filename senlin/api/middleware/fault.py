@@ -79,6 +79,7 @@ class FaultWrapper(wsgi.Middleware):
         'SpecValidationFailed': webob.exc.HTTPBadRequest,
         'StopActionFailed': webob.exc.HTTPInternalServerError,
         'ValueError': webob.exc.HTTPBadRequest,
+        'VersionConflict': webob.exc.HTTPConflict,
     }
 
     def _map_exception_to_error(self, class_exception):
@@ -45,10 +45,9 @@ class VersionNegotiationFilter(wsgi.Middleware):
         # See if a version identifier is in the URI passed to
         # us already. If so, simply return the right version
         # API controller
-        msg = ("Processing request: %(method)s %(path)s Accept: "
-               "%(accept)s" % {'method': req.method,
-                               'path': req.path, 'accept': req.accept})
-        LOG.debug(msg)
+        LOG.debug("Processing request: %(method)s %(path)s Accept: "
+                  "%(accept)s", {'method': req.method,
+                                 'path': req.path, 'accept': req.accept})
 
         # If the request is for /versions, just return the versions container
         if req.path_info_peek() in ("versions", ""):
@@ -126,6 +126,10 @@ class API(wsgi.Router):
                                "/clusters",
                                action="create",
                                conditions={'method': 'POST'})
+            sub_mapper.connect("cluster_summary_index",
+                               "/clusters/summary",
+                               action="summary_index",
+                               conditions={'method': 'GET'})
             sub_mapper.connect("cluster_get",
                                "/clusters/{cluster_id}",
                                action="get",
@@ -134,6 +138,10 @@ class API(wsgi.Router):
                                "/clusters/{cluster_id}",
                                action="update",
                                conditions={'method': 'PATCH'})
+            sub_mapper.connect("cluster_summary",
+                               "/clusters/{cluster_id}/summary",
+                               action="summary",
+                               conditions={'method': 'GET'})
             sub_mapper.connect("cluster_action",
                                "/clusters/{cluster_id}/action",
                                action="action",
@@ -156,6 +164,18 @@ class API(wsgi.Router):
                                "/nodes",
                                action="create",
                                conditions={'method': 'POST'})
+            sub_mapper.connect("node_get_many",
+                               "/nodes/batch",
+                               action="get_many",
+                               conditions={'method': 'GET'})
+            sub_mapper.connect("node_create_many",
+                               "/nodes/batch",
+                               action="create_many",
+                               conditions={'method': 'POST'})
+            sub_mapper.connect("node_delete_many",
+                               "/nodes/batch",
+                               action="delete_many",
+                               conditions={'method': 'DELETE'})
             sub_mapper.connect("node_get",
                                "/nodes/{node_id}",
                                action="get",
@@ -200,6 +220,10 @@ class API(wsgi.Router):
                                "/actions",
                                action="create",
                                conditions={'method': 'POST'})
+            sub_mapper.connect("action_wait",
+                               "/actions/wait",
+                               action="wait",
+                               conditions={'method': 'GET'})
             sub_mapper.connect("action_get",
                                "/actions/{action_id}",
                                action="get",
@@ -11,14 +11,25 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import functools
+import os
+
+import eventlet
+from eventlet import event
 from webob import exc
 
+from oslo_config import cfg
 from oslo_log import log as logging
+import oslo_messaging
 
 from senlin.api.openstack.v1 import util
 from senlin.common import consts
 from senlin.common.i18n import _
+from senlin.common.i18n import _LW
+from senlin.common import messaging
 from senlin.common import serializers
+from senlin.common import utils
 from senlin.common import wsgi
 from senlin.rpc import client as rpc_client
 
@@ -53,6 +64,105 @@ class ActionData(object):
         return dict((k, v) for k, v in data if k not in self.PARAMS)
 
 
+# Waiters for the completion of actions in this process, by action ID
+_waiters = collections.defaultdict(set)
+
+# RPC server receiving the completion notifications of actions
+_listener = None
+
+
+class ActionDoneEndpoint(object):
+    '''Receive the completion notifications sent by the engines.'''
+
+    def action_done(self, context, action_id, status=None):
+        for waiter in list(_waiters.get(action_id, ())):
+            waiter.done(action_id)
+
+
+def _start_listener():
+    '''Start listening for completion notifications, once per process.
+
+    API workers are forked after the application is loaded, so this is done
+    when the first request waits for actions rather than at import time.
+    '''
+    global _listener
+    if _listener is not None:
+        return
+
+    target = oslo_messaging.Target(
+        topic=consts.ACTION_DONE_TOPIC,
+        server='%s-%s' % (cfg.CONF.host, os.getpid()),
+        version=consts.RPC_API_VERSION)
+    try:
+        listener = messaging.get_rpc_server(target, ActionDoneEndpoint())
+        listener.start()
+    except Exception as ex:
+        LOG.warning(_LW('Failed listening for completed actions, waits will '
+                        'last until their deadline: %s'), ex)
+        return
+    _listener = listener
+
+
+class ActionWaiter(object):
+    '''Wait in the API for actions to complete.
+
+    The waiter is woken by the action_done notifications that the engines
+    send when a top-level action completes, so the actions are not polled.
+    They are read when the wait starts and once more when it ends. Actions
+    derived from others are not notified, and are read at the deadline.
+    '''
+
+    # Statuses of the actions that have completed
+    DONE_STATUSES = ('SUCCEEDED', 'FAILED', 'CANCELLED')
+
+    def __init__(self, get_action, identities):
+        self.get_action = get_action
+        self.identities = list(identities)
+        self.pending = set()
+        self.event = event.Event()
+
+    def done(self, action_id):
+        self.pending.discard(action_id)
+        if not self.pending and not self.event.ready():
+            self.event.send()
+
+    def _is_done(self, action):
+        return action.get('status') in self.DONE_STATUSES
+
+    def wait(self, timeout):
+        '''Wait until the actions have completed or timeout expires.
+
+        :returns: a list of action dicts, in the order of the identities.
+        '''
+        _start_listener()
+        actions = [self.get_action(i) for i in self.identities]
+        self.pending = set(a['id'] for a in actions if not self._is_done(a))
+        if not self.pending:
+            return actions
+
+        pending = set(self.pending)
+        for action_id in pending:
+            _waiters[action_id].add(self)
+        try:
+            # Read the actions again now that the waiter is registered, so
+            # that no completion is missed
+            for action_id in pending:
+                if self._is_done(self.get_action(action_id)):
+                    self.done(action_id)
+            with eventlet.Timeout(timeout, False):
+                self.event.wait()
+        finally:
+            for action_id in pending:
+                waiters = _waiters.get(action_id)
+                if waiters is not None:
+                    waiters.discard(self)
+                    if not waiters:
+                        del _waiters[action_id]
+
+        return [self.get_action(a['id']) if a['id'] in pending else a
+                for a in actions]
+
+
 class ActionController(object):
     '''WSGI controller for Actions in Senlin v1 API.'''
 
@@ -83,16 +193,23 @@ class ActionController(object):
             'sort_dir': 'single',
             'sort_keys': 'multi',
             'show_deleted': 'single',
+            'consistent': 'single',
         }
         params = util.get_allowed_params(req.params, param_whitelist)
         filters = util.get_allowed_params(req.params, filter_whitelist)
 
+        key = consts.PARAM_CONSISTENT
+        if key in params:
+            consistent = utils.parse_bool_param(key, params.pop(key))
+            params['use_slave'] = not consistent
+
         if not filters:
             filters = None
 
-        actions = self.rpc_client.action_list(req.context,
-                                              filters=filters,
-                                              **params)
+        actions = util.paged_list(
+            functools.partial(self.rpc_client.action_list, req.context,
+                              filters=filters),
+            params)
 
         # TODO(Qiming): Add action_view to handle collection?
         return {'actions': actions}
@@ -108,14 +225,47 @@ class ActionController(object):
 
         return result
 
+    def _waiter(self, req, identities):
+        return ActionWaiter(
+            functools.partial(self.rpc_client.action_get, req.context),
+            identities)
+
+    def _wait_time(self, req):
+        '''Get the number of seconds to wait for actions, if any.'''
+        wait = req.params.get('wait')
+        if wait is None:
+            return None
+
+        wait = utils.parse_int_param('wait', wait)
+        return min(wait, cfg.CONF.senlin_api.max_action_wait)
+
     @util.policy_enforce
     def get(self, req, action_id):
-        action = self.rpc_client.action_get(req.context, action_id)
+        wait = self._wait_time(req)
+        if wait:
+            action = self._waiter(req, [action_id]).wait(wait)[0]
+        else:
+            action = self.rpc_client.action_get(req.context, action_id)
         if not action:
             raise exc.HTTPNotFound()
 
         return action
 
+    @util.policy_enforce
+    def wait(self, req):
+        '''Wait for actions, given as repeated action_id parameters.
+
+        Returns the actions as soon as all of them have completed, or when
+        the number of seconds given by the 'wait' parameter has passed.
+        '''
+        identities = req.params.getall('action_id')
+        if not identities:
+            raise exc.HTTPBadRequest(_("No action specified."))
+
+        wait = self._wait_time(req) or 0
+        actions = self._waiter(req, identities).wait(wait)
+        return {'actions': actions}
+
 
 def create_resource(options):
     '''Actions factory method.'''
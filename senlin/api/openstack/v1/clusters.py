@@ -102,9 +102,11 @@ class ClusterController(object):
             'sort_keys': 'multi',
             'show_deleted': 'single',
             'show_nested': 'single',
+            'consistent': 'single',
         }
         params = util.get_allowed_params(req.params, param_whitelist)
         filters = util.get_allowed_params(req.params, filter_whitelist)
+        fields = util.get_fields(req.params, consts.CLUSTER_FIELDS)
 
         key = consts.PARAM_SHOW_DELETED
         if key in params:
@@ -114,12 +116,24 @@ class ClusterController(object):
         if key in params:
             params[key] = utils.parse_bool_param(key, params[key])
 
+        key = consts.PARAM_CONSISTENT
+        if key in params:
+            consistent = utils.parse_bool_param(key, params.pop(key))
+            params['use_slave'] = not consistent
+
         if not filters:
             filters = None
 
+        util.etag_check(req, lambda: self.rpc_client.object_version(
+            req.context, 'cluster', filters=filters, tenant_safe=True,
+            show_deleted=params.get(consts.PARAM_SHOW_DELETED, False),
+            show_nested=params.get(consts.PARAM_SHOW_NESTED, False),
+            use_slave=params.get('use_slave', True)))
+
         clusters = self.rpc_client.cluster_list(req.context,
                                                 filters=filters,
                                                 tenant_safe=True,
+                                                fields=fields,
                                                 **params)
         return {'clusters': clusters}
 
@@ -145,9 +159,41 @@ class ClusterController(object):
     def get(self, req, cluster_id):
         '''Gets detailed information for a cluster.'''
 
-        cluster = self.rpc_client.cluster_get(req.context, cluster_id)
+        fields = util.get_fields(req.params, consts.CLUSTER_FIELDS)
+        util.etag_check(req, lambda: self.rpc_client.object_version(
+            req.context, 'cluster', cluster_id))
+
+        cluster = self.rpc_client.cluster_get(req.context, cluster_id,
+                                              fields=fields)
         return {'cluster': cluster}
 
+    def _use_slave(self, req):
+        '''Check if a summary can be read from a slave database.'''
+        key = consts.PARAM_CONSISTENT
+        if key not in req.params:
+            return True
+        return not utils.parse_bool_param(key, req.params[key])
+
+    @util.policy_enforce
+    def summary(self, req, cluster_id):
+        '''Gets node counts by status and size information of a cluster.'''
+
+        use_slave = self._use_slave(req)
+        summary = self.rpc_client.cluster_summary(req.context, cluster_id,
+                                                  use_slave=use_slave)
+        return {'summary': summary}
+
+    @util.policy_enforce
+    def summary_index(self, req):
+        '''Gets summaries of the clusters specified, or of all clusters.'''
+
+        identities = req.params.getall('cluster_id') or None
+        use_slave = self._use_slave(req)
+        summaries = self.rpc_client.cluster_summary_list(req.context,
+                                                         identities,
+                                                         use_slave=use_slave)
+        return {'summaries': summaries}
+
     @util.policy_enforce
     def update(self, req, cluster_id, body):
         '''Update an existing cluster with new parameters.'''
@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import functools
+
 from webob import exc
 
 from oslo_log import log as logging
@@ -53,6 +55,7 @@ class EventController(object):
             'sort_keys': 'multi',
             'global_tenant': 'single',
             'show_deleted': 'single',
+            'consistent': 'single',
         }
         params = util.get_allowed_params(req.params, param_whitelist)
         filters = util.get_allowed_params(req.params, filter_whitelist)
@@ -67,6 +70,11 @@ class EventController(object):
             params.pop(key)
             params['tenant_safe'] = not global_tenant
 
+        key = consts.PARAM_CONSISTENT
+        if key in params:
+            consistent = utils.parse_bool_param(key, params.pop(key))
+            params['use_slave'] = not consistent
+
         key = consts.PARAM_LIMIT
         if key in params:
             params[key] = utils.parse_int_param(key, params[key])
@@ -74,9 +82,10 @@ class EventController(object):
         if not filters:
             filters = None
 
-        actions = self.rpc_client.event_list(req.context,
-                                             filters=filters,
-                                             **params)
+        actions = util.paged_list(
+            functools.partial(self.rpc_client.event_list, req.context,
+                              filters=filters),
+            params)
 
         return {'events': actions}
 
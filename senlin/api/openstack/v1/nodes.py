@@ -14,6 +14,8 @@
 Node endpoint for Senlin v1 ReST API.
 '''
 
+import functools
+
 from webob import exc
 
 from oslo_log import log as logging
@@ -98,19 +100,34 @@ class NodeController(object):
             'marker': 'single',
             'sort_dir': 'single',
             'sort_keys': 'multi',
+            'consistent': 'single',
         }
         params = util.get_allowed_params(req.params, param_whitelist)
         filters = util.get_allowed_params(req.params, filter_whitelist)
+        fields = util.get_fields(req.params, consts.NODE_FIELDS)
 
         key = consts.PARAM_SHOW_DELETED
         if key in params:
             params[key] = utils.parse_bool_param(key, params[key])
 
+        key = consts.PARAM_CONSISTENT
+        if key in params:
+            consistent = utils.parse_bool_param(key, params.pop(key))
+            params['use_slave'] = not consistent
+
         if not filters:
             filters = None
 
-        nodes = self.rpc_client.node_list(req.context, filters=filters,
-                                          **params)
+        util.etag_check(req, lambda: self.rpc_client.object_version(
+            req.context, 'node', filters=filters,
+            cluster_id=params.get('cluster_id'),
+            show_deleted=params.get(consts.PARAM_SHOW_DELETED, False),
+            use_slave=params.get('use_slave', True)))
+
+        nodes = util.paged_list(
+            functools.partial(self.rpc_client.node_list, req.context,
+                              filters=filters, fields=fields),
+            params)
 
         return {'nodes': nodes}
 
@@ -129,9 +146,45 @@ class NodeController(object):
                                              data.role(), data.tags())
         return {'node': result}
 
+    @util.policy_enforce
+    def create_many(self, req, body):
+        '''Create a batch of nodes from one profile.'''
+        nodes_data = body.get('nodes')
+        if nodes_data is None:
+            raise exc.HTTPBadRequest(_("Malformed request data, missing "
+                                       "'nodes' key in request body."))
+
+        names = nodes_data.get('names')
+        if not names or not isinstance(names, list):
+            raise exc.HTTPBadRequest(_("No node names specified."))
+
+        data = NodeData(nodes_data)
+        result = self.rpc_client.node_create_many(req.context, names,
+                                                  data.profile_id(),
+                                                  cluster_id=data.cluster_id(),
+                                                  role=data.role(),
+                                                  tags=data.tags())
+        return {'nodes': result}
+
+    @util.policy_enforce
+    def get_many(self, req):
+        '''Get a batch of nodes, given as repeated node_id parameters.'''
+        identities = req.params.getall('node_id')
+        if not identities:
+            raise exc.HTTPBadRequest(_("No node specified."))
+
+        fields = util.get_fields(req.params, consts.NODE_FIELDS)
+        nodes = self.rpc_client.node_get_many(req.context, identities,
+                                              fields=fields)
+        return {'nodes': nodes}
+
     @util.policy_enforce
     def get(self, req, node_id):
-        node = self.rpc_client.node_get(req.context, node_id)
+        fields = util.get_fields(req.params, consts.NODE_FIELDS)
+        util.etag_check(req, lambda: self.rpc_client.object_version(
+            req.context, 'node', node_id))
+
+        node = self.rpc_client.node_get(req.context, node_id, fields=fields)
         if not node:
             raise exc.HTTPNotFound()
 
@@ -192,6 +245,33 @@ class NodeController(object):
 
         raise exc.HTTPNoContent()
 
+    @util.policy_enforce
+    def delete_many(self, req, body=None):
+        '''Delete a batch of nodes.
+
+        The nodes are given as repeated node_id parameters, or as a 'nodes'
+        list in the request body for batches too large for a query string.
+        '''
+        identities = req.params.getall('node_id')
+        if body:
+            nodes = body.get('nodes')
+            if not isinstance(nodes, list):
+                raise exc.HTTPBadRequest(_("Malformed request data, 'nodes' "
+                                           "must be a list of nodes."))
+            identities.extend(nodes)
+        if not identities:
+            raise exc.HTTPBadRequest(_("No node specified."))
+
+        results = self.rpc_client.node_delete_many(req.context, identities)
+        nodes = []
+        for result in results:
+            action = result.pop('action', None)
+            if action is not None:
+                result.update({'id': action['target'],
+                               'action_id': action['id']})
+            nodes.append(result)
+        return {'nodes': nodes}
+
 
 def create_resource(options):
     '''Nodes resource factory method.'''
@@ -97,6 +97,10 @@ class PolicyController(object):
         if not filters:
             filters = None
 
+        util.etag_check(req, lambda: self.rpc_client.object_version(
+            req.context, 'policy', filters=filters,
+            show_deleted=params.get(consts.PARAM_SHOW_DELETED, False)))
+
         policies = self.rpc_client.policy_list(req.context,
                                                filters=filters,
                                                **params)
@@ -119,6 +123,9 @@ class PolicyController(object):
 
     @util.policy_enforce
     def get(self, req, policy_id):
+        util.etag_check(req, lambda: self.rpc_client.object_version(
+            req.context, 'policy', policy_id))
+
         policy = self.rpc_client.policy_get(req.context, policy_id)
         return {'policy': policy}
 
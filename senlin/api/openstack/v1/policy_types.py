@@ -40,17 +40,26 @@ class PolicyTypeController(object):
 
     @util.policy_enforce
     def index(self, req):
-        types = self.rpc_client.policy_type_list(req.context)
-        return {'policy_types': types}
+        def fetch():
+            types = self.rpc_client.policy_type_list(req.context)
+            return {'policy_types': types}
+
+        return util.type_cache.get(
+            req, ('policy_types',), fetch,
+            lambda: self.rpc_client.type_version(req.context))
 
     @util.policy_enforce
     def schema(self, req, type_name):
-        policy_schema = self.rpc_client.policy_type_schema(req.context,
-                                                           type_name)
-        if not policy_schema:
-            raise exc.HTTPInternalServerError()
+        def fetch():
+            policy_schema = self.rpc_client.policy_type_schema(req.context,
+                                                               type_name)
+            if not policy_schema:
+                raise exc.HTTPInternalServerError()
+            return policy_schema
 
-        return policy_schema
+        return util.type_cache.get(
+            req, ('policy_type', type_name), fetch,
+            lambda: self.rpc_client.type_version(req.context))
 
 
 def create_resource(options):
@@ -37,18 +37,27 @@ class ProfileTypeController(object):
 
     @util.policy_enforce
     def index(self, req):
-        types = self.rpc_client.profile_type_list(req.context)
-        return {'profile_types': types}
+        def fetch():
+            types = self.rpc_client.profile_type_list(req.context)
+            return {'profile_types': types}
+
+        return util.type_cache.get(
+            req, ('profile_types',), fetch,
+            lambda: self.rpc_client.type_version(req.context))
 
     @util.policy_enforce
     def schema(self, req, type_name):
         '''Gets the interface schema for a specified profile type.'''
-        profile_schema = self.rpc_client.profile_type_schema(req.context,
-                                                             type_name)
-        if not profile_schema:
-            raise exc.HTTPInternalServerError()
+        def fetch():
+            profile_schema = self.rpc_client.profile_type_schema(req.context,
+                                                                 type_name)
+            if not profile_schema:
+                raise exc.HTTPInternalServerError()
+            return profile_schema
 
-        return profile_schema
+        return util.type_cache.get(
+            req, ('profile_type', type_name), fetch,
+            lambda: self.rpc_client.type_version(req.context))
 
 
 def create_resource(options):
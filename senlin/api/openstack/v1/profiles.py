@@ -102,6 +102,10 @@ class ProfileController(object):
         if not filters:
             filters = None
 
+        util.etag_check(req, lambda: self.rpc_client.object_version(
+            req.context, 'profile', filters=filters,
+            show_deleted=params.get(consts.PARAM_SHOW_DELETED, False)))
+
         profiles = self.rpc_client.profile_list(req.context,
                                                 filters=filters,
                                                 **params)
@@ -127,6 +131,9 @@ class ProfileController(object):
 
     @util.policy_enforce
     def get(self, req, profile_id):
+        util.etag_check(req, lambda: self.rpc_client.object_version(
+            req.context, 'profile', profile_id))
+
         profile = self.rpc_client.profile_get(req.context,
                                               profile_id)
 
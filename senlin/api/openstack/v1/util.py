@@ -12,10 +12,18 @@
 #    under the License.
 
 import functools
+import hashlib
+import time
 
+from oslo_config import cfg
 import six
 from webob import exc
 
+from senlin.common import consts
+from senlin.common.i18n import _
+from senlin.common import serializers
+from senlin.common import wsgi
+
 
 def policy_enforce(handler):
     """Decorator that enforces policies.
@@ -69,3 +77,170 @@ def get_allowed_params(params, whitelist):
             allowed_params[key] = value
 
     return allowed_params
+
+
+def get_fields(params, allowed):
+    """Extract the sparse fieldset requested with the ``fields`` parameter.
+
+    Field names can be given as a comma separated list, as repeated
+    parameters, or both. The 'id' field is always included.
+
+    :param params: a NestedMultiDict from webob.Request.params
+    :param allowed: the names of the fields that can be requested
+
+    :returns: a sorted list of field names, or None if all fields are wanted
+    :raises HTTPBadRequest: if a field name is not allowed
+    """
+    values = params.getall(consts.PARAM_FIELDS)
+    if not values:
+        return None
+
+    fields = set(['id'])
+    for value in values:
+        for name in value.split(','):
+            name = name.strip()
+            if not name:
+                continue
+            if name not in allowed:
+                msg = _("Invalid field '%(name)s', valid fields are: "
+                        "%(allowed)s.") % {'name': name,
+                                           'allowed': ', '.join(allowed)}
+                raise exc.HTTPBadRequest(msg)
+            fields.add(name)
+    return sorted(fields)
+
+
+def paged_list(fetch, params):
+    '''Get a listing from the engine, in pages if it can be large.
+
+    If no limit or a limit larger than the 'list_page_size' option is
+    requested, records are fetched from the engine one page at a time,
+    using the id of the last record of a page as the marker of the next,
+    and streamed to the client.
+
+    :param fetch: a function taking the listing ``params`` as keyword
+                  arguments and returning a list of records.
+    :param params: a dict of the listing parameters.
+
+    :returns: a list of records if they fit in a single page, or a
+              :class:`senlin.common.serializers.StreamedList` otherwise.
+    '''
+    page_size = cfg.CONF.senlin_api.list_page_size
+    limit = params.get(consts.PARAM_LIMIT)
+    if page_size <= 0:
+        return fetch(**params)
+    if limit is not None:
+        # Invalid limits are left to the engine to report
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            return fetch(**params)
+        if limit <= page_size:
+            return fetch(**params)
+
+    params = dict(params, limit=page_size)
+    first = fetch(**params)
+    if len(first) < page_size or limit == page_size:
+        return first
+
+    def pages():
+        page = first
+        remaining = None if limit is None else limit - len(first)
+        yield page
+        while len(page) == params['limit'] and remaining != 0:
+            if remaining is not None:
+                params['limit'] = min(page_size, remaining)
+            params['marker'] = page[-1]['id']
+            page = fetch(**params)
+            if remaining is not None:
+                remaining -= len(page)
+            yield page
+
+    return serializers.StreamedList(pages())
+
+
+def etag_check(req, get_version):
+    '''Handle the ETag of a GET request, if ETags are enabled.
+
+    The ETag is derived from the version of the requested data in the
+    database, as returned by ``get_version``, so that an unchanged object or
+    listing is detected without loading it. It also covers the query string,
+    the tenant and the accepted content types, so that the pages, filters
+    and representations of a listing get different ETags.
+
+    :param get_version: a function returning the version of the data from
+                        the engine.
+    :raises HTTPNotModified: the ETag matches the If-None-Match header.
+    '''
+    if not cfg.CONF.senlin_api.enable_etags:
+        return
+
+    version = get_version()
+    if version is None:
+        return
+
+    key = '\0'.join([version, req.path_qs, req.context.tenant_id or '',
+                     str(req.accept)])
+    etag = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    if etag in req.if_none_match:
+        raise exc.HTTPNotModified(headers={'ETag': 'W/"%s"' % etag})
+    req.environ[wsgi.ETAG_ENVIRON] = etag
+
+
+class TypeCache(object):
+    '''Cache of the profile and policy type lists and schemas.
+
+    The types only change when the plugins of the engines change, so the
+    bodies returned for them are kept, with their serialization and ETag,
+    until the type version published by the engines changes. The version is
+    checked with the engine at most once every 'type_cache_ttl' seconds.
+    '''
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.version = None
+        self.expires = 0
+        self.entries = {}
+
+    def _check_version(self, get_version, ttl):
+        now = time.time()
+        if self.version is not None and now < self.expires:
+            return
+        version = get_version()
+        if version != self.version:
+            self.entries = {}
+            self.version = version
+        self.expires = now + ttl
+
+    def get(self, req, key, fetch, get_version):
+        '''Get a cached body, or fetch it from the engine.
+
+        :param key: the key of the body in the cache.
+        :param fetch: a function returning the body from the engine.
+        :param get_version: a function returning the type version from the
+                            engine.
+        :raises HTTPNotModified: the ETag matches the If-None-Match header.
+        '''
+        ttl = cfg.CONF.senlin_api.type_cache_ttl
+        if ttl <= 0:
+            return fetch()
+
+        self._check_version(get_version, ttl)
+        entry = self.entries.get(key)
+        if entry is None:
+            tag = '\0'.join([self.version, repr(key)])
+            entry = (serializers.CachedBody(fetch()), tag)
+            self.entries[key] = entry
+
+        body, tag = entry
+        etag = hashlib.sha1(
+            '\0'.join([tag, str(req.accept)]).encode('utf-8')).hexdigest()
+        if etag in req.if_none_match:
+            raise exc.HTTPNotModified(headers={'ETag': 'W/"%s"' % etag})
+        req.environ[wsgi.ETAG_ENVIRON] = etag
+        return body
+
+
+type_cache = TypeCache()
@@ -18,10 +18,14 @@ import sys
 
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 
+from senlin.common import context
 from senlin.common.i18n import _
+from senlin.common import messaging
 from senlin.db import api
 from senlin.db import utils
+from senlin.rpc import client as rpc_client
 from senlin import version
 
 CONF = cfg.CONF
@@ -45,6 +49,30 @@ def purge_deleted():
     utils.purge_deleted(CONF.command.age, CONF.command.granularity)
 
 
+def do_engine_metrics():
+    """Print the metrics of the engine running on the given host."""
+    messaging.setup()
+    client = rpc_client.EngineClient()
+    result = client.engine_metrics(context.get_admin_context(),
+                                   server=CONF.command.host or CONF.host)
+    print(jsonutils.dumps(result, indent=2, sort_keys=True))
+
+
+def do_profiling():
+    """Change the profiling settings of the engine on the given host."""
+    enabled = {'on': True, 'off': False}.get(CONF.command.state)
+    action_types = None
+    if CONF.command.action_types is not None:
+        action_types = [t for t in CONF.command.action_types.split(',') if t]
+
+    messaging.setup()
+    client = rpc_client.EngineClient()
+    result = client.profiling_set(context.get_admin_context(),
+                                  enabled=enabled, action_types=action_types,
+                                  server=CONF.command.host or CONF.host)
+    print(jsonutils.dumps(result, indent=2, sort_keys=True))
+
+
 def add_command_parsers(subparsers):
     parser = subparsers.add_parser('db_version')
     parser.set_defaults(func=do_db_version)
@@ -63,6 +91,26 @@ def add_command_parsers(subparsers):
         choices=['days', 'hours', 'minutes', 'seconds'],
         help=_('Granularity to use for age argument, defaults to days.'))
 
+    parser = subparsers.add_parser('engine_metrics')
+    parser.set_defaults(func=do_engine_metrics)
+    parser.add_argument(
+        '--host', default=None,
+        help=_('Host of the engine to query, defaults to this host.'))
+
+    parser = subparsers.add_parser('profiling')
+    parser.set_defaults(func=do_profiling)
+    parser.add_argument('state', nargs='?', default='status',
+                        choices=['on', 'off', 'status'],
+                        help=_('Profile all actions, stop doing so or just '
+                               'show the current settings.'))
+    parser.add_argument(
+        '-t', '--action-types', default=None,
+        help=_('Comma separated list of action types to profile. An empty '
+               'string stops profiling by action type.'))
+    parser.add_argument(
+        '--host', default=None,
+        help=_('Host of the engine to change, defaults to this host.'))
+
 command_opt = cfg.SubCommandOpt('command',
                                 title='Commands',
                                 help='Show available commands.',
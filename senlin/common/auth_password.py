@@ -14,21 +14,89 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import hashlib
+import hmac
+import os
+import time
+
 from keystoneclient import exceptions as keystone_exceptions
 from keystoneclient.v2_0 import client as keystone_client
+import six
 from webob import exc
 
 
+class TokenCache(object):
+    """A bounded cache of the tokens obtained for validated credentials.
+
+    Entries are keyed by a salted hash of the credentials, so that the
+    passwords are not kept in memory. An entry is used for at most 'ttl'
+    seconds and never once its token is about to expire. The least recently
+    used entries are dropped when the cache is full.
+    """
+
+    def __init__(self, size=1000, ttl=300):
+        self.size = size
+        self.ttl = ttl
+        self._salt = os.urandom(16)
+        self._entries = collections.OrderedDict()
+
+    def key(self, username, password, tenant, auth_url):
+        # Header values are byte strings on py2, which may not be ASCII, so
+        # only text values are encoded
+        values = []
+        for v in (username, password, tenant, auth_url):
+            if isinstance(v, six.text_type):
+                v = v.encode('utf-8')
+            values.append(v or b'')
+        return hmac.new(self._salt, b'\0'.join(values),
+                        hashlib.sha256).hexdigest()
+
+    def get(self, key):
+        """Get the token info and headers cached for a key, if still valid."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        expires, token_info, headers = entry
+        if time.time() >= expires or token_info.will_expire_soon():
+            return None
+        # Keep the most recently used entries at the end
+        self._entries[key] = entry
+        return token_info, headers
+
+    def set(self, key, token_info, headers):
+        if self.size <= 0 or self.ttl <= 0:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (time.time() + self.ttl, token_info, headers)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
 class KeystonePasswordAuthProtocol(object):
     """Alternative authentication middleware that uses username and password
     to authenticate against Keystone instead of validating existing auth token.
     The benefit being that you no longer require admin/service token to
     authenticate users.
+
+    The tokens obtained are cached, see TokenCache, so that repeated
+    requests with the same credentials do not reach Keystone. The cache is
+    configured with the 'token_cache_size' and 'token_cache_time' options of
+    the filter, and disabled by setting either of them to 0.
     """
 
     def __init__(self, app, conf):
         self.app = app
         self.conf = conf
+        self.token_cache = TokenCache(
+            size=int(conf.get('token_cache_size', 1000)),
+            ttl=int(conf.get('token_cache_time', 300)))
 
     def __call__(self, env, start_response):
         """Authenticate incoming request."""
@@ -39,18 +107,35 @@ class KeystonePasswordAuthProtocol(object):
         auth_url = env.get('HTTP_X_AUTH_URL')
         if not tenant:
             return self._reject_request(env, start_response, auth_url)
-        try:
-            client = keystone_client.Client(
-                username=username, password=password, tenant_id=tenant,
-                auth_url=auth_url)
-        except (keystone_exceptions.Unauthorized,
-                keystone_exceptions.Forbidden,
-                keystone_exceptions.NotFound,
-                keystone_exceptions.AuthorizationFailure):
-            return self._reject_request(env, start_response, auth_url)
-        env['keystone.token_info'] = client.auth_ref
-        env.update(self._build_user_headers(client.auth_ref))
-        return self.app(env, start_response)
+
+        key = self.token_cache.key(username, password, tenant, auth_url)
+        cached = self.token_cache.get(key)
+        if cached is not None:
+            token_info, headers = cached
+        else:
+            try:
+                client = keystone_client.Client(
+                    username=username, password=password, tenant_id=tenant,
+                    auth_url=auth_url)
+            except (keystone_exceptions.Unauthorized,
+                    keystone_exceptions.Forbidden,
+                    keystone_exceptions.NotFound,
+                    keystone_exceptions.AuthorizationFailure):
+                return self._reject_request(env, start_response, auth_url)
+            token_info = client.auth_ref
+            headers = self._build_user_headers(token_info)
+            self.token_cache.set(key, token_info, headers)
+
+        env['keystone.token_info'] = token_info
+        env.update(headers)
+
+        def _start_response(status, response_headers, exc_info=None):
+            # The token was rejected, e.g. revoked, do not reuse it
+            if status.startswith('401'):
+                self.token_cache.invalidate(key)
+            return start_response(status, response_headers, exc_info)
+
+        return self.app(env, _start_response)
 
     def _reject_request(self, env, start_response, auth_url):
         """Redirect client to auth server."""
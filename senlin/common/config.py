@@ -53,7 +53,16 @@ service_opts = [
                help=_('Maximum depth allowed when using nested clusters.')),
     cfg.IntOpt('num_engine_workers',
                default=1,
-               help=_('Number of senlin-engine processes to fork and run.'))]
+               help=_('Number of senlin-engine processes to fork and run.')),
+    cfg.BoolOpt('db_query_stats',
+                default=False,
+                help=_('Count and time the DB statements issued for each '
+                       'request and action.')),
+    cfg.FloatOpt('db_slow_query_threshold',
+                 default=1.0,
+                 help=_('Seconds after which a DB statement is reported as '
+                        'slow when db_query_stats is enabled. Set to 0 to '
+                        'disable slow statement reporting.'))]
 
 engine_opts = [
     cfg.StrOpt('deferred_auth_method',
@@ -84,6 +93,10 @@ engine_opts = [
     cfg.IntOpt('default_action_timeout',
                default=3600,
                help=_('Timeout in seconds for actions.')),
+    cfg.IntOpt('node_index_block_size',
+               default=10,
+               help=_('Number of node indexes an engine reserves from a '
+                      'cluster at a time.')),
     cfg.IntOpt('lock_retry_times',
                default=3,
                help=_('Number of times trying to grab a lock.')),
@@ -97,7 +110,18 @@ engine_opts = [
     cfg.IntOpt('engine_life_check_timeout',
                default=2,
                help=_('RPC timeout for the engine liveness check that is used'
-                      ' for cluster locking.'))]
+                      ' for cluster locking.')),
+    cfg.IntOpt('metrics_dump_interval',
+               default=0,
+               help=_('Seconds between dumps of the engine metrics to the '
+                      'log. Set to 0 to disable the dumps.')),
+    cfg.BoolOpt('action_tracing',
+                default=False,
+                help=_('Record the time spent in each phase of an action '
+                       'into the action outputs.')),
+    cfg.StrOpt('trace_file',
+               help=_('File to append action traces to, in the Trace Event '
+                      'Format. Only used when action_tracing is enabled.'))]
 
 rpc_opts = [
     cfg.StrOpt('host',
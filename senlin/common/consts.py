@@ -13,17 +13,21 @@
 RPC_ATTRS = (
     ENGINE_TOPIC,
     ENGINE_DISPATCHER_TOPIC,
+    ACTION_DONE_TOPIC,
     RPC_API_VERSION,
 ) = (
     'senlin-engine',
     'engine-dispatcher',
+    'senlin-action-done',
     '1.0',
 )
 
 RPC_PARAMS = (
     PARAM_SHOW_DELETED, PARAM_SHOW_NESTED, PARAM_LIMIT, PARAM_GLOBAL_TENANT,
+    PARAM_FIELDS, PARAM_CONSISTENT,
 ) = (
     'show_deleted', 'show_nested', 'limit', 'global_tenant',
+    'fields', 'consistent',
 )
 
 ACTION_NAMES = (
@@ -65,6 +69,14 @@ CLUSTER_ATTRS = (
     'tags',
 )
 
+# Fields of a cluster that can be selected with the 'fields' parameter
+CLUSTER_FIELDS = (
+    'id', 'name', 'profile_id', 'profile_name', 'user', 'project', 'domain',
+    'parent', 'init_time', 'created_time', 'updated_time', 'deleted_time',
+    'size', 'timeout', 'status', 'status_reason', 'tags', 'data',
+    'nodes', 'policies',
+)
+
 NODE_ATTRS = (
     NODE_INDEX, NODE_NAME, NODE_PROFILE_ID, NODE_CLUSTER_ID,
     NODE_CREATED_TIME, NODE_UPDATED_TIME, NODE_DELETED_TIME,
@@ -75,6 +87,13 @@ NODE_ATTRS = (
     'status', 'role', 'tags',
 )
 
+# Fields of a node that can be selected with the 'fields' parameter
+NODE_FIELDS = (
+    'id', 'name', 'cluster_id', 'physical_id', 'profile_id', 'profile_name',
+    'project', 'index', 'role', 'init_time', 'created_time', 'updated_time',
+    'deleted_time', 'status', 'status_reason', 'data', 'tags',
+)
+
 PROFILE_ATTRS = (
     PROFILE_ID, PROFILE_NAME, PROFILE_TYPE, PROFILE_PERMISSION,
     PROFILE_CREATED_TIME, PROFILE_UPDATED_TIME, PROFILE_DELETED_TIME,
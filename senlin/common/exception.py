@@ -285,6 +285,11 @@ class ClusterActionNotSupported(SenlinException):
     msg_fmt = _("%(action)s is not supported for Cluster.")
 
 
+class VersionConflict(SenlinException):
+    msg_fmt = _("The %(type)s (%(id)s) was updated concurrently: expected "
+                "version %(expected)s but found version %(actual)s.")
+
+
 class Error(SenlinException):
     msg_fmt = "%(message)s"
 
@@ -0,0 +1,198 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+'''
+On-demand profiling of engine actions and API requests.
+
+Profiles are collected with cProfile and written to 'profile_dir' as
+pstats files, keeping at most 'max_files' of them. Note that cProfile
+follows the OS thread, so a profile taken in an eventlet based service
+also includes the green threads that ran during the profiled block. For
+the same reason, profiles cannot overlap: while one is being taken, the
+other blocks asking for a profile run without one.
+'''
+
+import contextlib
+import cProfile
+import os
+import re
+import tempfile
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+
+from senlin.common.i18n import _
+from senlin.common.i18n import _LW
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+
+profiling_opts = [
+    cfg.BoolOpt('enabled',
+                default=False,
+                help=_('Profile all actions and API requests.')),
+    cfg.ListOpt('action_types',
+                default=[],
+                help=_('Types of actions to profile, e.g. '
+                       'CLUSTER_SCALE_OUT.')),
+    cfg.StrOpt('profile_dir',
+               help=_('Directory where profiles are written. Defaults to '
+                      'a senlin-profiles directory in the system temporary '
+                      'directory.')),
+    cfg.IntOpt('max_files',
+               default=100,
+               help=_('Maximum number of profiles kept in profile_dir. '
+                      'The oldest profiles are removed first.')),
+]
+profiling_group = cfg.OptGroup('profiling')
+CONF.register_group(profiling_group)
+CONF.register_opts(profiling_opts, group=profiling_group)
+
+# Request header asking for a request to be profiled, honoured for admins
+PROFILE_HEADER = 'X-Senlin-Profile'
+
+_lock = threading.Lock()
+
+# Held while a profile is being taken, see profile()
+_active = threading.Lock()
+
+# Settings changed at runtime, on top of the configuration
+_runtime = {
+    'enabled': False,
+    'action_types': set(),
+}
+
+
+def list_opts():
+    yield profiling_group.name, profiling_opts
+
+
+def set_runtime(enabled=None, action_types=None):
+    '''Change the profiling settings of this process.
+
+    :param enabled: If not None, whether to profile everything.
+    :param action_types: If not None, the action types to profile.
+    :returns: The resulting settings, see :func:`get_status`.
+    '''
+    with _lock:
+        if enabled is not None:
+            _runtime['enabled'] = bool(enabled)
+        if action_types is not None:
+            _runtime['action_types'] = set(action_types)
+    return get_status()
+
+
+def get_status():
+    with _lock:
+        action_types = set(CONF.profiling.action_types)
+        action_types.update(_runtime['action_types'])
+        return {
+            'enabled': CONF.profiling.enabled or _runtime['enabled'],
+            'action_types': sorted(action_types),
+            'dir': _profile_dir(),
+        }
+
+
+def _enabled():
+    return CONF.profiling.enabled or _runtime['enabled']
+
+
+def action_enabled(action_type):
+    '''Check whether actions of the given type are to be profiled.'''
+    return (_enabled() or action_type in CONF.profiling.action_types or
+            action_type in _runtime['action_types'])
+
+
+def request_enabled(request):
+    '''Check whether an API request is to be profiled.'''
+    if _enabled():
+        return True
+    if PROFILE_HEADER not in request.headers:
+        return False
+    context = getattr(request, 'context', None)
+    return bool(getattr(context, 'is_admin', False))
+
+
+def _profile_dir():
+    return CONF.profiling.profile_dir or os.path.join(
+        tempfile.gettempdir(), 'senlin-profiles')
+
+
+def _prune(path, max_files):
+    '''Remove the oldest profiles so that at most max_files remain.'''
+    files = [os.path.join(path, f) for f in os.listdir(path)
+             if f.endswith('.prof')]
+    if len(files) <= max_files:
+        return
+    files.sort(key=os.path.getmtime)
+    for f in files[:len(files) - max_files]:
+        try:
+            os.remove(f)
+        except OSError:
+            pass
+
+
+def save(prof, name):
+    '''Write a profile to the profile directory.
+
+    :returns: The path of the profile file, or None if it was not written.
+    '''
+    path = _profile_dir()
+    name = re.sub(r'[^\w.-]', '_', name)
+    filename = os.path.join(path, '%s-%d-%s.prof' % (
+        time.strftime('%Y%m%d%H%M%S'), os.getpid(), name))
+    try:
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        prof.dump_stats(filename)
+        _prune(path, max(CONF.profiling.max_files, 1))
+    except (IOError, OSError) as ex:
+        LOG.warning(_LW('Failed saving profile %(name)s: %(ex)s'),
+                    {'name': name, 'ex': ex})
+        return None
+
+    LOG.debug('Profile of %(name)s saved to %(file)s',
+              {'name': name, 'file': filename})
+    return filename
+
+
+@contextlib.contextmanager
+def profile(name, enabled=True):
+    '''Profile a block of code if enabled and save it under ``name``.
+
+    Green threads share one OS thread, so a second profiler enabled while
+    one is running would replace it, and the first one disabled would stop
+    both. The block is run without profiling if a profile is already being
+    taken.
+    '''
+    if not enabled:
+        yield
+        return
+
+    if not _active.acquire(False):
+        LOG.debug('Not profiling %s, another profile is being taken', name)
+        yield
+        return
+
+    try:
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            save(prof, name)
+    finally:
+        _active.release()
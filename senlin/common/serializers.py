@@ -16,24 +16,181 @@ Utility methods for serializing responses
 
 import datetime
 import json
+import logging as sys_logging
 
 from oslo_log import log as logging
+import six
+
+from senlin.common.i18n import _LE
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 LOG = logging.getLogger(__name__)
 
+JSON_CONTENT_TYPE = 'application/json'
+MSGPACK_CONTENT_TYPE = 'application/x-msgpack'
+
+# Longest response logged at debug level, in characters
+MAX_LOG_LENGTH = 1024
+
+
+class StreamedList(object):
+    '''A list in a response, produced one page of records at a time.
+
+    When a response contains a StreamedList, the JSON serializer writes the
+    response body as the pages are produced instead of building it in
+    memory.
+    '''
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def __iter__(self):
+        for page in self.pages:
+            for record in page:
+                yield record
+
+
+class CachedBody(dict):
+    '''A response body that is kept across requests.
+
+    Its JSON serialization is computed once, when it is first sent, and
+    reused for the following responses.
+    '''
+
+    _json = None
+
+    def to_json(self):
+        if self._json is None:
+            self._json = _to_bytes(_encoder.encode(self))
+        return self._json
+
+
+def _sanitizer(obj):
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    return obj
+
+
+# The encoder is built once instead of on every json.dumps() call with a
+# 'default' hook. The standard library json module uses its C accelerated
+# encoder when it is available.
+_encoder = json.JSONEncoder(default=_sanitizer)
+
+
+def _to_bytes(text):
+    if isinstance(text, six.text_type):
+        return text.encode('utf-8')
+    return text
+
+
+def _log_response(kind, response):
+    # Avoid formatting, and copying, big responses unless they are logged
+    if not LOG.isEnabledFor(sys_logging.DEBUG):
+        return
+    if len(response) > MAX_LOG_LENGTH:
+        response = '%s... (%d characters)' % (
+            response[:MAX_LOG_LENGTH], len(response))
+    LOG.debug("%(kind)s response : %(response)s",
+              {'kind': kind, 'response': response})
+
+
+def negotiate(request, serializer):
+    '''Choose the response serializer from the Accept header of a request.
+
+    The MessagePack serializer replaces the JSON one for clients that
+    prefer it, if the msgpack library is installed. JSON is used otherwise.
+    '''
+    if msgpack is None or not isinstance(serializer, JSONResponseSerializer):
+        return serializer
+    offers = [JSON_CONTENT_TYPE, MSGPACK_CONTENT_TYPE]
+    if request.accept.best_match(offers) == MSGPACK_CONTENT_TYPE:
+        return MsgPackResponseSerializer()
+    return serializer
+
 
 class JSONResponseSerializer(object):
 
     def to_json(self, data):
-        def sanitizer(obj):
-            if isinstance(obj, datetime.datetime):
-                return obj.isoformat()
-            return obj
+        response = _encoder.encode(data)
+        _log_response('JSON', response)
+        return response
+
+    def iter_json(self, data):
+        '''Serialize a dict containing StreamedList values in chunks.
+
+        The status and headers of the response are sent before the pages
+        are produced. If producing a page fails, the list is closed where
+        it stopped and an 'error' key describing the failure is added to
+        the body, so that the client still gets a well-formed document and
+        can tell it is incomplete.
+        '''
+        sep = '{'
+        error = None
+        for key, value in six.iteritems(data):
+            yield _to_bytes('%s%s: ' % (sep, _encoder.encode(key)))
+            sep = ', '
+            if not isinstance(value, StreamedList):
+                yield _to_bytes(_encoder.encode(value))
+                continue
+
+            head = '['
+            try:
+                for page in value.pages:
+                    if not page:
+                        continue
+                    chunk = ', '.join(_encoder.encode(r) for r in page)
+                    yield _to_bytes(head + chunk)
+                    head = ', '
+            except Exception as ex:
+                LOG.exception(_LE('Failed streaming the %(key)s of a '
+                                  'response: %(ex)s'), {'key': key, 'ex': ex})
+                if error is None:
+                    error = {
+                        'code': 500,
+                        'type': ex.__class__.__name__.split('_Remote')[0],
+                        'message': six.text_type(ex).split('\n', 1)[0],
+                        'truncated': key,
+                    }
+            yield _to_bytes('[]' if head == '[' else ']')
+        if error is not None:
+            yield _to_bytes('%s"error": %s' % (sep, _encoder.encode(error)))
+        yield _to_bytes('{}' if sep == '{' else '}')
+
+    def default(self, response, result):
+        response.content_type = JSON_CONTENT_TYPE
+        if isinstance(result, CachedBody):
+            response.body = result.to_json()
+        elif isinstance(result, dict) and any(
+                isinstance(v, StreamedList) for v in result.values()):
+            LOG.debug("JSON response : streamed %s", list(result.keys()))
+            response.app_iter = self.iter_json(result)
+        else:
+            response.body = self.to_json(result)
+
+
+def _msgpack_default(obj):
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    if isinstance(obj, StreamedList):
+        return list(obj)
+    raise TypeError('%r is not serializable' % obj)
+
+
+class MsgPackResponseSerializer(object):
+    '''Compact binary responses, for clients accepting MessagePack.
+
+    Streamed listings are collected before being serialized.
+    '''
 
-        response = json.dumps(data, default=sanitizer)
-        LOG.debug("JSON response : %s" % response)
+    def to_msgpack(self, data):
+        response = msgpack.packb(data, default=_msgpack_default)
+        LOG.debug("MessagePack response : %d bytes", len(response))
         return response
 
     def default(self, response, result):
-        response.content_type = 'application/json'
-        response.body = self.to_json(result)
+        response.content_type = MSGPACK_CONTENT_TYPE
+        response.body = self.to_msgpack(result)
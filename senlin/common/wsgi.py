@@ -39,6 +39,7 @@ from oslo_utils import importutils
 from paste import deploy
 import routes
 import routes.middleware
+import routes.util
 import six
 import webob.dec
 import webob.exc
@@ -48,11 +49,15 @@ from senlin.common.i18n import _
 from senlin.common.i18n import _LE
 from senlin.common.i18n import _LI
 from senlin.common.i18n import _LW
+from senlin.common import profiler
 from senlin.common import serializers
 
 
 URL_LENGTH_LIMIT = 50000
 
+# Key of the request environ holding the ETag of the response, if any
+ETAG_ENVIRON = 'senlin.etag'
+
 api_opts = [
     cfg.StrOpt('bind_host', default='0.0.0.0',
                help=_('Address to bind the server. Useful when '
@@ -76,6 +81,24 @@ api_opts = [
     cfg.IntOpt('workers', default=0,
                help=_("Number of workers for Senlin service."),
                deprecated_group='DEFAULT'),
+    cfg.BoolOpt('enable_etags', default=False,
+                help=_("Return ETags with clusters, nodes, profiles and "
+                       "policies, and answer conditional GET requests with "
+                       "304 Not Modified when the data is unchanged. This "
+                       "costs one extra, cheap, engine call per GET.")),
+    cfg.IntOpt('list_page_size', default=500,
+               help=_("Number of records fetched from the engine at a time "
+                      "for large node, event and action listings, which "
+                      "are then streamed to the client. Set to 0 to fetch "
+                      "listings in a single call.")),
+    cfg.IntOpt('max_action_wait', default=60,
+               help=_("Maximum number of seconds a request can wait for "
+                      "actions to complete with the 'wait' parameter.")),
+    cfg.IntOpt('type_cache_ttl', default=60,
+               help=_("Number of seconds the profile and policy type lists "
+                      "and schemas are served from the cache of the API "
+                      "before their version is checked with the engine. "
+                      "Set to 0 to disable the cache.")),
 ]
 api_group = cfg.OptGroup('senlin_api')
 cfg.CONF.register_group(api_group)
@@ -357,6 +380,170 @@ def debug_filter(app, conf, **local_conf):
     return Debug(app)
 
 
+class _RouteNode(object):
+    '''A path segment in a RouteTable.'''
+
+    def __init__(self):
+        self.static = {}
+        self.var = None
+        # (order, methods, route, names) of the routes ending here
+        self.routes = []
+        self.methods = {}
+        self.any_method = None
+
+    def finish(self):
+        '''Choose the route used for each method at this node.
+
+        The first route declared wins, as with routes.Mapper.
+        '''
+        self.routes.sort(key=lambda entry: entry[0])
+        methods = set()
+        for order, route_methods, route, names in self.routes:
+            if route_methods is None:
+                if self.any_method is None:
+                    self.any_method = (order, route, names)
+            else:
+                methods.update(route_methods)
+        for method in methods:
+            for order, route_methods, route, names in self.routes:
+                if route_methods is None or method in route_methods:
+                    self.methods[method] = (order, route, names)
+                    break
+
+        for child in self.static.values():
+            child.finish()
+        if self.var is not None:
+            self.var.finish()
+
+    def lookup(self, method):
+        return self.methods.get(method, self.any_method)
+
+
+class RouteTable(object):
+    '''The routes of a routes.Mapper, compiled into a tree of segments.
+
+    A request path is matched by walking the tree one segment at a time,
+    instead of trying the regular expression of every route in turn. The
+    route to use for each method of a path template is chosen when the
+    table is built, so a lookup does a fixed amount of work for a given
+    template, whatever the number of routes.
+
+    Only routes made of whole static or variable segments, without
+    requirements and with conditions on the method only, can be compiled.
+    '''
+
+    def __init__(self):
+        self.root = _RouteNode()
+
+    @classmethod
+    def compile(cls, mapper):
+        '''Build the table of a mapper.
+
+        :returns: a RouteTable, or None if some routes of the mapper cannot
+                  be compiled, in which case the mapper must be used.
+        '''
+        if (mapper.prefix or mapper.sub_domains or mapper.minimization or
+                mapper.always_scan):
+            return None
+
+        table = cls()
+        for order, route in enumerate(mapper.matchlist):
+            if not table._add(order, route):
+                return None
+        table.root.finish()
+        return table
+
+    @staticmethod
+    def _segments(route):
+        segments = [[]]
+        for part in route.routelist:
+            if isinstance(part, dict):
+                if part.get('type') != ':' or part['name'] in route.reqs:
+                    return None
+                segments[-1].append(part)
+                continue
+            pieces = part.split('/')
+            segments[-1].append(pieces[0])
+            segments.extend([piece] for piece in pieces[1:])
+
+        result = []
+        for segment in segments:
+            parts = [p for p in segment if p != '']
+            if all(isinstance(p, six.string_types) for p in parts):
+                result.append(''.join(parts))
+            elif len(parts) == 1:
+                result.append(parts[0])
+            else:
+                return None
+        return result
+
+    def _add(self, order, route):
+        if route.static:
+            return True
+        if route.redirect or route.minimization:
+            return False
+
+        methods = None
+        for key, value in six.iteritems(route.conditions or {}):
+            if key != 'method':
+                return False
+            if isinstance(value, six.string_types):
+                value = [value]
+            methods = frozenset(value)
+
+        segments = self._segments(route)
+        if segments is None:
+            return False
+
+        node = self.root
+        names = []
+        for segment in segments:
+            if isinstance(segment, dict):
+                if segment['name'] == 'path_info':
+                    return False
+                names.append(segment['name'])
+                if node.var is None:
+                    node.var = _RouteNode()
+                node = node.var
+            else:
+                node = node.static.setdefault(segment, _RouteNode())
+        node.routes.append((order, methods, route, tuple(names)))
+        return True
+
+    def match(self, method, path):
+        '''Match a request against the table.
+
+        :returns: a (route, match dict) tuple, or None if no route matches.
+        '''
+        states = [(self.root, ())]
+        for segment in path.split('/'):
+            next_states = []
+            for node, values in states:
+                child = node.static.get(segment)
+                if child is not None:
+                    next_states.append((child, values))
+                if node.var is not None and segment:
+                    next_states.append((node.var, values + (segment,)))
+            if not next_states:
+                return None
+            states = next_states
+
+        best = None
+        for node, values in states:
+            entry = node.lookup(method)
+            if entry is not None and (best is None or entry[0] < best[0][0]):
+                best = (entry, values)
+        if best is None:
+            return None
+
+        (order, route, names), values = best
+        result = dict(route.defaults)
+        for name, value in zip(names, values):
+            result[name] = routes.util.as_unicode(value, route.encoding,
+                                                  route.decode_errors)
+        return route, result
+
+
 class Router(object):
     '''WSGI middleware that maps incoming requests to WSGI apps.'''
 
@@ -387,6 +574,7 @@ class Router(object):
         self.map = mapper
         self._router = routes.middleware.RoutesMiddleware(self._dispatch,
                                                           self.map)
+        self._table = RouteTable.compile(self.map)
 
     @webob.dec.wsgify
     def __call__(self, req):
@@ -394,8 +582,34 @@ class Router(object):
 
         If no match, return a 404.
         '''
+        if not self._route(req.environ):
+            return self._router
+        return self._dispatch
+
+    def _route(self, environ):
+        '''Match a request with the compiled route table.
 
-        return self._router
+        The routing arguments are set in the environ as the routes middleware
+        would do. Requests overriding their method with a '_method'
+        parameter are left to the routes middleware, which handles them.
+
+        :returns: False if the request must be routed by the routes
+                  middleware instead.
+        '''
+        if (self._table is None or
+                '_method' in environ.get('QUERY_STRING', '') or
+                (environ['REQUEST_METHOD'] == 'POST' and
+                 routes.middleware.is_form_post(environ))):
+            return False
+
+        method = environ['REQUEST_METHOD']
+        match = self._table.match(method, environ['PATH_INFO'])
+        route, args = match if match is not None else (None, {})
+        url = routes.util.URLGenerator(self.map, environ)
+        environ['wsgiorg.routing_args'] = (url, args)
+        environ['routes.route'] = route
+        environ['routes.url'] = url
+        return True
 
     @staticmethod
     @webob.dec.wsgify
@@ -529,6 +743,13 @@ class Resource(object):
     @webob.dec.wsgify(RequestClass=Request)
     def __call__(self, request):
         """WSGI method that controls (de)serialization and method dispatch."""
+        if profiler.request_enabled(request):
+            name = 'api-%s-%s' % (request.method, request.path)
+            with profiler.profile(name):
+                return self._process(request)
+        return self._process(request)
+
+    def _process(self, request):
         action_args = self.get_action_args(request.environ)
         action = action_args.pop('action', None)
         content_type = request.params.get("ContentType")
@@ -572,10 +793,14 @@ class Resource(object):
             log_exception(err, sys.exc_info())
             raise translate_exception(err, request.best_match_language())
 
-        serializer = self.serializer or serializers.JSONResponseSerializer()
+        serializer = serializers.negotiate(
+            request, self.serializer or serializers.JSONResponseSerializer())
         try:
             response = webob.Response(request=request)
             self.dispatch(serializer, action, response, action_result)
+            etag = request.environ.get(ETAG_ENVIRON)
+            if etag is not None:
+                response.etag = (etag, False)
             return response
 
         # return unserializable result (typically an exception)
@@ -27,12 +27,24 @@ _BACKEND_MAPPING = {'sqlalchemy': 'senlin.db.sqlalchemy.api'}
 IMPL = api.DBAPI.from_config(CONF, backend_mapping=_BACKEND_MAPPING)
 
 
-def get_engine():
-    return IMPL.get_engine()
+def get_engine(use_slave=False):
+    return IMPL.get_engine(use_slave=use_slave)
 
 
-def get_session():
-    return IMPL.get_session()
+def get_session(use_slave=False):
+    return IMPL.get_session(use_slave=use_slave)
+
+
+def transaction(context):
+    return IMPL.transaction(context)
+
+
+def query_stats(owner):
+    return IMPL.query_stats(owner)
+
+
+def get_query_counters():
+    return IMPL.get_query_counters()
 
 
 # Clusters
@@ -57,16 +69,22 @@ def cluster_get_next_index(context, cluster_id):
     return IMPL.cluster_get_next_index(context, cluster_id)
 
 
+def cluster_reserve_indexes(context, cluster_id, count):
+    return IMPL.cluster_reserve_indexes(context, cluster_id, count)
+
+
 def cluster_get_by_name_and_parent(context, cluster_name, parent):
     return IMPL.cluster_get_by_name_and_parent(context, cluster_name, parent)
 
 
 def cluster_get_all(context, limit=None, marker=None, sort_keys=None,
                     sort_dir=None, filters=None, tenant_safe=True,
-                    show_deleted=False, show_nested=False):
+                    show_deleted=False, show_nested=False, use_slave=False,
+                    columns=None):
     return IMPL.cluster_get_all(context, limit, marker, sort_keys, sort_dir,
                                 filters, tenant_safe, show_deleted,
-                                show_nested)
+                                show_nested, use_slave=use_slave,
+                                columns=columns)
 
 
 def cluster_get_all_by_parent(context, parent):
@@ -74,15 +92,31 @@ def cluster_get_all_by_parent(context, parent):
 
 
 def cluster_count_all(context, filters=None, tenant_safe=True,
-                      show_deleted=False, show_nested=False):
+                      show_deleted=False, show_nested=False,
+                      use_slave=False):
     return IMPL.cluster_count_all(context, filters=filters,
                                   tenant_safe=tenant_safe,
                                   show_deleted=show_deleted,
-                                  show_nested=show_nested)
+                                  show_nested=show_nested,
+                                  use_slave=use_slave)
+
+
+def cluster_version(context, cluster_id):
+    return IMPL.cluster_version(context, cluster_id)
 
 
-def cluster_update(context, cluster_id, values):
-    return IMPL.cluster_update(context, cluster_id, values)
+def cluster_version_all(context, filters=None, tenant_safe=True,
+                        show_deleted=False, show_nested=False,
+                        use_slave=False):
+    return IMPL.cluster_version_all(context, filters=filters,
+                                    tenant_safe=tenant_safe,
+                                    show_deleted=show_deleted,
+                                    show_nested=show_nested,
+                                    use_slave=use_slave)
+
+
+def cluster_update(context, cluster_id, values, version=None):
+    return IMPL.cluster_update(context, cluster_id, values, version=version)
 
 
 def cluster_delete(context, cluster_id):
@@ -94,10 +128,38 @@ def node_create(context, values):
     return IMPL.node_create(context, values)
 
 
+def node_create_many(context, values_list):
+    return IMPL.node_create_many(context, values_list)
+
+
+def node_delete_many(context, node_ids):
+    return IMPL.node_delete_many(context, node_ids)
+
+
+def node_soft_delete_by_cluster(context, cluster_id):
+    return IMPL.node_soft_delete_by_cluster(context, cluster_id)
+
+
 def node_get(context, node_id, show_deleted=False):
     return IMPL.node_get(context, node_id, show_deleted=show_deleted)
 
 
+def node_get_many(context, node_ids, show_deleted=False):
+    return IMPL.node_get_many(context, node_ids, show_deleted=show_deleted)
+
+
+def node_version(context, node_id):
+    return IMPL.node_version(context, node_id)
+
+
+def node_version_all(context, cluster_id=None, show_deleted=False,
+                     filters=None, tenant_safe=True, use_slave=False):
+    return IMPL.node_version_all(context, cluster_id=cluster_id,
+                                 show_deleted=show_deleted, filters=filters,
+                                 tenant_safe=tenant_safe,
+                                 use_slave=use_slave)
+
+
 def node_get_by_name(context, name, show_deleted=False):
     return IMPL.node_get_by_name(context, name, show_deleted=show_deleted)
 
@@ -109,18 +171,29 @@ def node_get_by_short_id(context, short_id, show_deleted=False):
 
 def node_get_all(context, cluster_id=None, show_deleted=False,
                  limit=None, marker=None, sort_keys=None, sort_dir=None,
-                 filters=None, tenant_safe=True):
+                 filters=None, tenant_safe=True, use_slave=False,
+                 columns=None):
     return IMPL.node_get_all(context, cluster_id=cluster_id,
                              show_deleted=show_deleted,
                              limit=limit, marker=marker,
                              sort_keys=sort_keys, sort_dir=sort_dir,
-                             filters=filters, tenant_safe=tenant_safe)
+                             filters=filters, tenant_safe=tenant_safe,
+                             use_slave=use_slave, columns=columns)
 
 
 def node_get_all_by_cluster(context, cluster_id):
     return IMPL.node_get_all_by_cluster(context, cluster_id)
 
 
+def node_count_by_cluster(context, cluster_id):
+    return IMPL.node_count_by_cluster(context, cluster_id)
+
+
+def node_summary_by_cluster(context, cluster_ids, use_slave=False):
+    return IMPL.node_summary_by_cluster(context, cluster_ids,
+                                        use_slave=use_slave)
+
+
 def node_get_by_name_and_cluster(context, node_name, cluster_id):
     return IMPL.node_get_by_name_and_cluster(context,
                                              node_name, cluster_id)
@@ -130,8 +203,8 @@ def node_get_by_physical_id(context, physical_id):
     return IMPL.node_get_by_physical_id(context, physical_id)
 
 
-def node_update(context, node_id, values):
-    return IMPL.node_update(context, node_id, values)
+def node_update(context, node_id, values, version=None):
+    return IMPL.node_update(context, node_id, values, version=version)
 
 
 def node_migrate(context, node_id, to_cluster, timestamp):
@@ -192,6 +265,15 @@ def policy_get_all(context, limit=None, marker=None, sort_keys=None,
                                filters=filters, show_deleted=show_deleted)
 
 
+def policy_version(context, policy_id):
+    return IMPL.policy_version(context, policy_id)
+
+
+def policy_version_all(context, filters=None, show_deleted=False):
+    return IMPL.policy_version_all(context, filters=filters,
+                                   show_deleted=show_deleted)
+
+
 def policy_update(context, policy_id, values):
     return IMPL.policy_update(context, policy_id, values)
 
@@ -248,6 +330,15 @@ def profile_get_all(context, limit=None, marker=None, sort_keys=None,
                                 filters=filters, show_deleted=show_deleted)
 
 
+def profile_version(context, profile_id):
+    return IMPL.profile_version(context, profile_id)
+
+
+def profile_version_all(context, filters=None, show_deleted=False):
+    return IMPL.profile_version_all(context, filters=filters,
+                                    show_deleted=show_deleted)
+
+
 def profile_update(context, profile_id, values):
     return IMPL.profile_update(context, profile_id, values)
 
@@ -271,12 +362,13 @@ def event_get_by_short_id(context, short_id):
 
 def event_get_all(context, limit=None, marker=None, sort_keys=None,
                   sort_dir=None, filters=None, tenant_safe=True,
-                  show_deleted=False):
+                  show_deleted=False, use_slave=False):
 
     return IMPL.event_get_all(context, limit=limit, marker=marker,
                               sort_keys=sort_keys, sort_dir=sort_dir,
                               filters=filters, tenant_safe=tenant_safe,
-                              show_deleted=show_deleted)
+                              show_deleted=show_deleted,
+                              use_slave=use_slave)
 
 
 def event_count_by_cluster(context, cluster_id):
@@ -301,6 +393,10 @@ def action_get(context, action_id):
     return IMPL.action_get(context, action_id)
 
 
+def action_update(context, action_id, values, version=None):
+    return IMPL.action_update(context, action_id, values, version=version)
+
+
 def action_get_by_name(context, name):
     return IMPL.action_get_by_name(context, name)
 
@@ -317,16 +413,22 @@ def action_get_all_ready(context):
     return IMPL.action_get_all_ready(context)
 
 
+def action_count_by_status(context):
+    return IMPL.action_count_by_status(context)
+
+
 def action_get_all_by_owner(context, owner):
     return IMPL.action_get_all_by_owner(context, owner)
 
 
 def action_get_all(context, filters=None, limit=None, marker=None,
-                   sort_keys=None, sort_dir=None, show_deleted=False):
+                   sort_keys=None, sort_dir=None, show_deleted=False,
+                   use_slave=False):
     return IMPL.action_get_all(context, filters=filters,
                                limit=limit, marker=marker,
                                sort_keys=sort_keys, sort_dir=sort_dir,
-                               show_deleted=show_deleted)
+                               show_deleted=show_deleted,
+                               use_slave=use_slave)
 
 
 def action_add_dependency(context, depended, dependent):
@@ -14,8 +14,11 @@
 Implementation of SQLAlchemy backend.
 '''
 
+import collections
+import contextlib
 import six
 import sys
+import uuid
 
 from oslo_config import cfg
 from oslo_db.sqlalchemy import session as db_session
@@ -24,6 +27,8 @@ from oslo_log import log as logging
 from oslo_utils import timeutils
 
 from sqlalchemy import exc
+from sqlalchemy import func
+from sqlalchemy import orm
 from sqlalchemy.orm import session as orm_session
 
 from senlin.common import consts
@@ -32,12 +37,14 @@ from senlin.common.i18n import _
 from senlin.db.sqlalchemy import filters as db_filters
 from senlin.db.sqlalchemy import migration
 from senlin.db.sqlalchemy import models
+from senlin.db.sqlalchemy import query_stats as db_stats
 
 LOG = logging.getLogger(__name__)
 
 
 CONF = cfg.CONF
 CONF.import_opt('max_events_per_cluster', 'senlin.common.config')
+CONF.import_opt('db_query_stats', 'senlin.common.config')
 
 # Action status definitions:
 #  ACTION_INIT:      Not ready to be executed because fields are being
@@ -64,10 +71,31 @@ def get_facade():
 
     if not _facade:
         _facade = db_session.EngineFacade.from_config(CONF)
+        if CONF.db_query_stats:
+            db_stats.install(_facade.get_engine())
+            db_stats.install(_facade.get_engine(use_slave=True))
     return _facade
 
-get_engine = lambda: get_facade().get_engine()
-get_session = lambda: get_facade().get_session()
+
+def get_engine(use_slave=False):
+    return get_facade().get_engine(use_slave=use_slave)
+
+
+def get_session(use_slave=False):
+    return get_facade().get_session(use_slave=use_slave)
+
+
+def query_stats(owner):
+    '''Count the DB statements issued by the current thread for ``owner``.
+
+    :returns: A context manager yielding a ``QueryStats`` object. Nothing is
+              counted unless the ``db_query_stats`` option is enabled.
+    '''
+    return db_stats.collect(owner)
+
+
+def get_query_counters():
+    return db_stats.get_counters()
 
 
 def get_backend():
@@ -75,8 +103,17 @@ def get_backend():
     return sys.modules[__name__]
 
 
-def model_query(context, *args):
-    session = _session(context)
+def model_query(context, *args, **kwargs):
+    '''Query helper.
+
+    :param use_slave: if True and a slave connection is configured, run the
+                      query against the slave database. Only reads that can
+                      tolerate some staleness should set this.
+    '''
+    if kwargs.get('use_slave') and CONF.database.slave_connection:
+        session = get_session(use_slave=True)
+    else:
+        session = _session(context)
     query = session.query(*args)
     return query
 
@@ -94,7 +131,8 @@ def _get_sort_keys(sort_keys, mapping):
 
 
 def _paginate_query(context, query, model, limit=None, marker=None,
-                    sort_keys=None, sort_dir=None, default_sort_keys=None):
+                    sort_keys=None, sort_dir=None, default_sort_keys=None,
+                    use_slave=False):
     if not sort_keys:
         sort_keys = default_sort_keys or []
         if not sort_dir:
@@ -106,7 +144,8 @@ def _paginate_query(context, query, model, limit=None, marker=None,
 
     model_marker = None
     if marker:
-        model_marker = model_query(context, model).get(marker)
+        model_marker = model_query(context, model,
+                                   use_slave=use_slave).get(marker)
     try:
         query = utils.paginate_query(query, model, limit, sort_keys,
                                      model_marker, sort_dir)
@@ -120,9 +159,10 @@ def soft_delete_aware_query(context, *args, **kwargs):
     """Object query helper that accounts for the `show_deleted` field.
 
     :param show_deleted: if True, overrides context's show_deleted field.
+    :param use_slave: if True, the query may be run against a slave database.
     """
 
-    query = model_query(context, *args)
+    query = model_query(context, *args, use_slave=kwargs.get('use_slave'))
     show_deleted = kwargs.get('show_deleted') or context.show_deleted
 
     if (not show_deleted) or show_deleted in ('False', 'false', 'no', 'No'):
@@ -157,10 +197,77 @@ def query_by_name(context, model, name, tenant_safe=False,
         raise exception.MultipleChoices(arg=name)
 
 
+def _load_only(query, columns):
+    '''Restrict the columns loaded by a query, for sparse fieldsets.
+
+    The columns not listed stay deferred, i.e. they are only loaded from
+    the database if they are accessed.
+    '''
+    if columns:
+        query = query.options(orm.load_only(*columns))
+    return query
+
+
 def _session(context):
     return (context and context.session) or get_session()
 
 
+@contextlib.contextmanager
+def transaction(context):
+    '''Group the DB calls made with a context into one unit of work.
+
+    All writes issued through the context's session inside the block are
+    committed together when the outermost block exits, or rolled back
+    together if an exception escapes. Blocks can be nested. Never make
+    remote calls or wait on locks inside a transaction.
+    '''
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        yield session
+
+
+def _update_if_version(context, model, obj_id, values, version):
+    '''Update a row only if it is still at the given version.
+
+    :returns: The new version of the row, or None if the row doesn't exist.
+    :raises VersionConflict: The row was updated since it was read.
+    '''
+    session = _session(context)
+    values = dict(values)
+    values['version'] = model.version + 1
+    with session.begin(subtransactions=True):
+        query = session.query(model).filter_by(id=obj_id)
+        count = query.filter_by(version=version).update(
+            values, synchronize_session='evaluate')
+        current = session.query(model.version).filter_by(id=obj_id).first()
+
+    if current is None:
+        return None
+    if count == 0:
+        raise exception.VersionConflict(type=model.__tablename__, id=obj_id,
+                                        expected=version, actual=current[0])
+    return current[0]
+
+
+def _query_version(query, model):
+    '''Summarize the rows matched by a query into a version string.
+
+    The string changes whenever one of the rows is created, updated or
+    deleted, so it can be used as the ETag of the rows in the API. It is
+    computed with a single aggregate query and doesn't load the rows.
+    '''
+    columns = [func.count(model.id), func.max(model.created_time),
+               func.max(model.updated_time), func.max(model.deleted_time)]
+    if issubclass(model, models.Versioned):
+        columns.append(func.sum(model.version))
+    if model is models.Cluster:
+        columns.append(func.sum(model.etag_counter))
+    row = query.with_entities(*columns).one()
+    if row[0] == 0:
+        return None
+    return '-'.join(six.text_type(c) for c in row)
+
+
 # Clusters
 def cluster_create(context, values):
     cluster_ref = models.Cluster()
@@ -193,21 +300,51 @@ def cluster_get_by_short_id(context, short_id):
     return query_by_short_id(context, models.Cluster, short_id)
 
 
-def cluster_get_next_index(context, cluster_id):
-    query = model_query(context, models.Cluster)
-    session = query.session
-    session.begin()
-    cluster = query.get(cluster_id)
+def _cluster_size_update(session, cluster_id, delta):
+    # Apply the delta in the database instead of reading and rewriting the
+    # row, so that concurrent node operations don't overwrite each other.
+    # The ETag counter is bumped because the members of the cluster changed,
+    # the version is left alone so that conditional updates of the cluster
+    # don't conflict with node bookkeeping.
+    session.query(models.Cluster).filter_by(id=cluster_id).update(
+        {models.Cluster.size: models.Cluster.size + delta,
+         models.Cluster.etag_counter: models.Cluster.etag_counter + 1},
+        synchronize_session='evaluate')
+
 
-    if cluster is None:
-        session.rollback()
+def _cluster_etag_bump(session, cluster_id):
+    session.query(models.Cluster).filter_by(id=cluster_id).update(
+        {models.Cluster.etag_counter: models.Cluster.etag_counter + 1},
+        synchronize_session='evaluate')
+
+
+def _cluster_reserve_indexes(session, cluster_id, count):
+    # Bump the counter with a single UPDATE so concurrent reservations only
+    # hold the cluster row for the duration of one statement.
+    updated = session.query(models.Cluster).filter_by(id=cluster_id).update(
+        {models.Cluster.next_index: models.Cluster.next_index + count},
+        synchronize_session='evaluate')
+    if not updated:
         return None
 
-    index = cluster.next_index
-    cluster.next_index += 1
-    cluster.save(session)
-    session.commit()
-    return index
+    query = session.query(models.Cluster.next_index).filter_by(id=cluster_id)
+    return query.scalar() - count
+
+
+def cluster_reserve_indexes(context, cluster_id, count):
+    '''Reserve a block of node indexes from a cluster.
+
+    :param count: number of indexes to reserve.
+    :returns: the first index of the reserved block, or None if the cluster
+              cannot be found. The block is [first, first + count).
+    '''
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        return _cluster_reserve_indexes(session, cluster_id, count)
+
+
+def cluster_get_next_index(context, cluster_id):
+    return cluster_reserve_indexes(context, cluster_id, 1)
 
 
 def cluster_get_all_by_parent(context, parent):
@@ -225,9 +362,10 @@ def cluster_get_by_name_and_parent(context, cluster_name, parent):
 
 
 def _query_cluster_get_all(context, tenant_safe=True, show_deleted=False,
-                           show_nested=False):
+                           show_nested=False, use_slave=False):
     query = soft_delete_aware_query(context, models.Cluster,
-                                    show_deleted=show_deleted)
+                                    show_deleted=show_deleted,
+                                    use_slave=use_slave)
 
     if not show_nested:
         query = query.filter_by(parent=None)
@@ -239,10 +377,13 @@ def _query_cluster_get_all(context, tenant_safe=True, show_deleted=False,
 
 def cluster_get_all(context, limit=None, marker=None, sort_keys=None,
                     sort_dir=None, filters=None, tenant_safe=True,
-                    show_deleted=False, show_nested=False):
+                    show_deleted=False, show_nested=False, use_slave=False,
+                    columns=None):
     query = _query_cluster_get_all(context, tenant_safe=tenant_safe,
                                    show_deleted=show_deleted,
-                                   show_nested=show_nested)
+                                   show_nested=show_nested,
+                                   use_slave=use_slave)
+    query = _load_only(query, columns)
     if filters is None:
         filters = {}
 
@@ -257,19 +398,54 @@ def cluster_get_all(context, limit=None, marker=None, sort_keys=None,
     query = db_filters.exact_filter(query, models.Cluster, filters)
     return _paginate_query(context, query, models.Cluster, limit=limit,
                            marker=marker, sort_keys=keys, sort_dir=sort_dir,
-                           default_sort_keys=['init_time']).all()
+                           default_sort_keys=['init_time'],
+                           use_slave=use_slave).all()
 
 
 def cluster_count_all(context, filters=None, tenant_safe=True,
-                      show_deleted=False, show_nested=False):
+                      show_deleted=False, show_nested=False,
+                      use_slave=False):
     query = _query_cluster_get_all(context, tenant_safe=tenant_safe,
                                    show_deleted=show_deleted,
-                                   show_nested=show_nested)
+                                   show_nested=show_nested,
+                                   use_slave=use_slave)
     query = db_filters.exact_filter(query, models.Cluster, filters)
     return query.count()
 
 
-def cluster_update(context, cluster_id, values):
+def cluster_version(context, cluster_id):
+    query = model_query(context, models.Cluster).filter_by(id=cluster_id)
+    return _query_version(query, models.Cluster)
+
+
+def cluster_version_all(context, filters=None, tenant_safe=True,
+                        show_deleted=False, show_nested=False,
+                        use_slave=False):
+    query = _query_cluster_get_all(context, tenant_safe=tenant_safe,
+                                   show_deleted=show_deleted,
+                                   show_nested=show_nested,
+                                   use_slave=use_slave)
+    query = db_filters.exact_filter(query, models.Cluster, filters)
+    return _query_version(query, models.Cluster)
+
+
+def cluster_update(context, cluster_id, values, version=None):
+    '''Update a cluster with new property values.
+
+    :param version: If specified, only update the cluster if it is still at
+                    this version and return the new version.
+    :raises NotFound: The specified cluster does not exist in database.
+    :raises VersionConflict: The cluster is no longer at ``version``.
+    '''
+    if version is not None:
+        res = _update_if_version(context, models.Cluster, cluster_id, values,
+                                 version)
+        if res is None:
+            raise exception.NotFound(
+                _('Attempt to update a cluster with id "%s" that does '
+                  'not exist failed') % cluster_id)
+        return res
+
     cluster = cluster_get(context, cluster_id)
 
     if not cluster:
@@ -290,22 +466,19 @@ def cluster_delete(context, cluster_id):
             _('Attempt to delete a cluster with id "%s" that does '
               'not exist failed') % cluster_id)
 
-    query = session.query(models.Node).filter_by(cluster_id=cluster_id)
-    nodes = query.all()
+    with session.begin(subtransactions=True):
+        node_soft_delete_by_cluster(context, cluster_id)
 
-    if len(nodes) != 0:
-        for node in nodes:
-            session.delete(node)
+        # Delete all related cluster_policies records
+        query = session.query(models.ClusterPolicies)
+        query.filter_by(cluster_id=cluster_id).delete(
+            synchronize_session='evaluate')
 
-    # Delete all related cluster_policies records
-    for cp in cluster.policies:
-        session.delete(cp)
-
-    # Do soft delete and set the status
-    cluster.update_and_save({'deleted_time': timeutils.utcnow(),
-                             'status': 'DELETED',
-                             'status_reason': 'Cluster deletion succeeded'
-                             }, session=session)
+        # Do soft delete and set the status
+        cluster.update_and_save({'deleted_time': timeutils.utcnow(),
+                                 'status': 'DELETED',
+                                 'status_reason': 'Cluster deletion succeeded'
+                                 }, session=session)
 
 
 # Nodes
@@ -317,16 +490,94 @@ def node_create(context, values):
         values['status_reason'] = values['status_reason'][:255]
     node.update(values)
     cluster_id = values.get('cluster_id', None)
-    if cluster_id is not None:
-        cluster = session.query(models.Cluster).get(cluster_id)
-        cluster.size += 1
-        cluster.next_index += 1
-        cluster.save(session)
-
-    node.save(session)
+    with session.begin(subtransactions=True):
+        if cluster_id is not None:
+            _cluster_size_update(session, cluster_id, 1)
+        node.save(session)
     return node
 
 
+def node_create_many(context, values_list):
+    '''Create a batch of nodes with a single multi-row INSERT.
+
+    :param values_list: A list of dictionaries, one for each node.
+    :returns: A list containing the IDs of the new nodes, in order.
+    '''
+    rows = []
+    sizes = collections.Counter()
+    for values in values_list:
+        row = dict(values)
+        row['id'] = row.get('id') or str(uuid.uuid4())
+        row['version'] = 1
+        if row.get('status_reason'):
+            row['status_reason'] = row['status_reason'][:255]
+        if row.get('cluster_id') is not None:
+            sizes[row['cluster_id']] += 1
+        rows.append(row)
+
+    if not rows:
+        return []
+
+    # A multi-row INSERT takes the same columns for all rows. Rows are
+    # grouped by the keys they set, so that the columns a row leaves out
+    # get their defaults instead of explicit NULLs.
+    groups = collections.OrderedDict()
+    for row in rows:
+        groups.setdefault(frozenset(row), []).append(row)
+
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        for group in groups.values():
+            session.execute(models.Node.__table__.insert(), group)
+        for cluster_id, count in sizes.items():
+            _cluster_size_update(session, cluster_id, count)
+
+    return [r['id'] for r in rows]
+
+
+def _node_soft_delete(session, query):
+    # Soft delete the nodes matched by the query and shrink their clusters
+    query = query.filter_by(deleted_time=None)
+    counts = query.with_entities(models.Node.cluster_id,
+                                 func.count(models.Node.id))
+    counts = counts.group_by(models.Node.cluster_id).all()
+
+    query.update({'deleted_time': timeutils.utcnow(),
+                  'version': models.Node.version + 1},
+                 synchronize_session='fetch')
+    for cluster_id, count in counts:
+        if cluster_id is not None:
+            _cluster_size_update(session, cluster_id, -count)
+
+    return sum(count for cluster_id, count in counts)
+
+
+def node_delete_many(context, node_ids):
+    '''Soft delete a batch of nodes with a single UPDATE.
+
+    :returns: The number of nodes deleted.
+    '''
+    if not node_ids:
+        return 0
+
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        query = session.query(models.Node)
+        query = query.filter(models.Node.id.in_(node_ids))
+        return _node_soft_delete(session, query)
+
+
+def node_soft_delete_by_cluster(context, cluster_id):
+    '''Soft delete all member nodes of a cluster with a single UPDATE.
+
+    :returns: The number of nodes deleted.
+    '''
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        query = session.query(models.Node).filter_by(cluster_id=cluster_id)
+        return _node_soft_delete(session, query)
+
+
 def node_get(context, node_id, show_deleted=False):
     node = model_query(context, models.Node).get(node_id)
     if not node:
@@ -338,6 +589,35 @@ def node_get(context, node_id, show_deleted=False):
     return node
 
 
+def node_get_many(context, node_ids, show_deleted=False):
+    '''Get the nodes with the given IDs with a single query.
+
+    Nodes that don't exist are left out of the result, which is in no
+    particular order.
+    '''
+    if not node_ids:
+        return []
+
+    query = soft_delete_aware_query(context, models.Node,
+                                    show_deleted=show_deleted)
+    return query.filter(models.Node.id.in_(node_ids)).all()
+
+
+def node_version(context, node_id):
+    query = model_query(context, models.Node).filter_by(id=node_id)
+    return _query_version(query, models.Node)
+
+
+def node_version_all(context, cluster_id=None, show_deleted=False,
+                     filters=None, tenant_safe=True, use_slave=False):
+    query = _query_node_get_all(context, show_deleted=show_deleted,
+                                cluster_id=cluster_id, use_slave=use_slave)
+    if tenant_safe:
+        query = query.filter_by(project=context.tenant_id)
+    query = db_filters.exact_filter(query, models.Node, filters)
+    return _query_version(query, models.Node)
+
+
 def node_get_by_name(context, name, show_deleted=False):
     return query_by_name(context, models.Node, name, show_deleted=show_deleted)
 
@@ -347,9 +627,11 @@ def node_get_by_short_id(context, short_id, show_deleted=False):
                              show_deleted=show_deleted)
 
 
-def _query_node_get_all(context, show_deleted=False, cluster_id=None):
+def _query_node_get_all(context, show_deleted=False, cluster_id=None,
+                        use_slave=False):
     query = soft_delete_aware_query(context, models.Node,
-                                    show_deleted=show_deleted)
+                                    show_deleted=show_deleted,
+                                    use_slave=use_slave)
 
     if cluster_id:
         query = query.filter_by(cluster_id=cluster_id)
@@ -359,12 +641,16 @@ def _query_node_get_all(context, show_deleted=False, cluster_id=None):
 
 def node_get_all(context, cluster_id=None, show_deleted=False,
                  limit=None, marker=None, sort_keys=None, sort_dir=None,
-                 filters=None, tenant_safe=True):
+                 filters=None, tenant_safe=True, use_slave=False,
+                 columns=None):
     if cluster_id is None:
-        query = _query_node_get_all(context, show_deleted=show_deleted)
+        query = _query_node_get_all(context, show_deleted=show_deleted,
+                                    use_slave=use_slave)
     else:
         query = _query_node_get_all(context, show_deleted=show_deleted,
-                                    cluster_id=cluster_id)
+                                    cluster_id=cluster_id,
+                                    use_slave=use_slave)
+    query = _load_only(query, columns)
 
     if tenant_safe:
         query = query.filter_by(project=context.tenant_id)
@@ -385,7 +671,8 @@ def node_get_all(context, cluster_id=None, show_deleted=False,
     return _paginate_query(context, query, models.Node,
                            limit=limit, marker=marker,
                            sort_keys=keys, sort_dir=sort_dir,
-                           default_sort_keys=['init_time']).all()
+                           default_sort_keys=['init_time'],
+                           use_slave=use_slave).all()
 
 
 def node_get_all_by_cluster(context, cluster_id):
@@ -394,6 +681,34 @@ def node_get_all_by_cluster(context, cluster_id):
     return nodes
 
 
+def node_count_by_cluster(context, cluster_id):
+    '''Count the nodes that are currently members of a cluster.'''
+    query = model_query(context, models.Node).filter_by(cluster_id=cluster_id)
+    return query.filter_by(deleted_time=None).count()
+
+
+def node_summary_by_cluster(context, cluster_ids, use_slave=False):
+    '''Aggregate the live member nodes of clusters by status.
+
+    :param cluster_ids: IDs of the clusters to summarize.
+    :returns: A list of (cluster_id, status, count, oldest_created_time,
+              newest_created_time) tuples, one for each cluster and status
+              that has nodes.
+    '''
+    if not cluster_ids:
+        return []
+
+    query = model_query(context, models.Node.cluster_id, models.Node.status,
+                        func.count(models.Node.id),
+                        func.min(models.Node.created_time),
+                        func.max(models.Node.created_time),
+                        use_slave=use_slave)
+    query = query.filter(models.Node.cluster_id.in_(cluster_ids))
+    query = query.filter(models.Node.deleted_time.is_(None))
+    query = query.group_by(models.Node.cluster_id, models.Node.status)
+    return query.all()
+
+
 def node_get_by_name_and_cluster(context, node_name, cluster_id):
     q0 = model_query(context, models.Node).filter_by(name=node_name)
     node = q0.filter_by(cluster_id=cluster_id).first()
@@ -405,13 +720,25 @@ def node_get_by_physical_id(context, phy_id):
     return query.first()
 
 
-def node_update(context, node_id, values):
+def node_update(context, node_id, values, version=None):
     '''Update a node with new property values.
 
     :param node_id: ID of the node to be updated.
     :param values: A dictionary of values to be updated on the node.
+    :param version: If specified, only update the node if it is still at
+                    this version and return the new version.
     :raises NotFound: The specified node does not exist in database.
+    :raises VersionConflict: The node is no longer at ``version``.
     '''
+    if version is not None:
+        res = _update_if_version(context, models.Node, node_id, values,
+                                 version)
+        if res is None:
+            raise exception.NotFound(
+                _('Attempt to update a node with id "%s" that does '
+                  'not exists failed.') % node_id)
+        return res
+
     query = model_query(context, models.Node)
     node = query.get(node_id)
 
@@ -426,20 +753,16 @@ def node_update(context, node_id, values):
 
 def node_migrate(context, node_id, to_cluster, timestamp):
     session = _session(context)
-    session.begin()
+    session.begin(subtransactions=True)
 
     node = session.query(models.Node).get(node_id)
     from_cluster = node.cluster_id
     if from_cluster is not None:
-        cluster1 = session.query(models.Cluster).get(from_cluster)
-        cluster1.size -= 1
+        _cluster_size_update(session, from_cluster, -1)
         node.index = -1
     if to_cluster is not None:
-        cluster2 = session.query(models.Cluster).get(to_cluster)
-        cluster2.size += 1
-        index = cluster2.next_index
-        cluster2.next_index += 1
-        node.index = index
+        _cluster_size_update(session, to_cluster, 1)
+        node.index = _cluster_reserve_indexes(session, to_cluster, 1)
     node.cluster_id = to_cluster
     node.updated_time = timestamp
     session.commit()
@@ -453,13 +776,10 @@ def node_delete(context, node_id, force=False):
         # Note: this is okay, because the node may have already gone
         return
 
-    if node.cluster_id is not None:
-        cluster = session.query(models.Cluster).get(node.cluster_id)
-        cluster.size -= 1
-        cluster.save(session)
-
-    node.soft_delete(session=session)
-    session.flush()
+    with session.begin(subtransactions=True):
+        if node.cluster_id is not None:
+            _cluster_size_update(session, node.cluster_id, -1)
+        node.soft_delete(session=session)
 
 
 # Locks
@@ -599,6 +919,18 @@ def policy_get(context, policy_id, show_deleted=False):
     return policy
 
 
+def policy_version(context, policy_id):
+    query = model_query(context, models.Policy).filter_by(id=policy_id)
+    return _query_version(query, models.Policy)
+
+
+def policy_version_all(context, filters=None, show_deleted=False):
+    query = soft_delete_aware_query(context, models.Policy,
+                                    show_deleted=show_deleted)
+    query = db_filters.exact_filter(query, models.Policy, filters)
+    return _query_version(query, models.Policy)
+
+
 def policy_get_by_name(context, name, show_deleted=False):
     return query_by_name(context, models.Policy, name,
                          show_deleted=show_deleted)
@@ -696,7 +1028,10 @@ def cluster_policy_attach(context, cluster_id, policy_id, values):
     binding.cluster_id = cluster_id
     binding.policy_id = policy_id
     binding.update(values)
-    binding.save(_session(context))
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        binding.save(session)
+        _cluster_etag_bump(session, cluster_id)
     return binding
 
 
@@ -708,8 +1043,9 @@ def cluster_policy_detach(context, cluster_id, policy_id):
     if bindings is None:
         return
 
-    session.delete(bindings)
-    session.flush()
+    with session.begin(subtransactions=True):
+        session.delete(bindings)
+        _cluster_etag_bump(session, cluster_id)
 
 
 def cluster_policy_update(context, cluster_id, policy_id, values):
@@ -741,6 +1077,18 @@ def profile_get(context, profile_id, show_deleted=False):
     return profile
 
 
+def profile_version(context, profile_id):
+    query = model_query(context, models.Profile).filter_by(id=profile_id)
+    return _query_version(query, models.Profile)
+
+
+def profile_version_all(context, filters=None, show_deleted=False):
+    query = soft_delete_aware_query(context, models.Profile,
+                                    show_deleted=show_deleted)
+    query = db_filters.exact_filter(query, models.Profile, filters)
+    return _query_version(query, models.Profile)
+
+
 def profile_get_by_name(context, name, show_deleted=False):
     return query_by_name(context, models.Profile, name,
                          show_deleted=show_deleted)
@@ -843,7 +1191,8 @@ def event_get_by_short_id(context, short_id):
 
 def _event_filter_paginate_query(context, query, filters=None,
                                  limit=None, marker=None,
-                                 sort_keys=None, sort_dir=None):
+                                 sort_keys=None, sort_dir=None,
+                                 use_slave=False):
     if filters is None:
         filters = {}
 
@@ -860,21 +1209,24 @@ def _event_filter_paginate_query(context, query, filters=None,
     return _paginate_query(context, query, models.Event,
                            limit=limit, marker=marker,
                            sort_keys=keys, sort_dir=sort_dir,
-                           default_sort_keys=['timestamp']).all()
+                           default_sort_keys=['timestamp'],
+                           use_slave=use_slave).all()
 
 
 def event_get_all(context, limit=None, marker=None, sort_keys=None,
                   sort_dir=None, filters=None, tenant_safe=True,
-                  show_deleted=False):
+                  show_deleted=False, use_slave=False):
     query = soft_delete_aware_query(context, models.Event,
-                                    show_deleted=show_deleted)
+                                    show_deleted=show_deleted,
+                                    use_slave=use_slave)
     if tenant_safe:
         query = query.filter_by(project=context.tenant_id)
 
     return _event_filter_paginate_query(context, query, filters=filters,
                                         limit=limit, marker=marker,
                                         sort_keys=sort_keys,
-                                        sort_dir=sort_dir)
+                                        sort_dir=sort_dir,
+                                        use_slave=use_slave)
 
 
 def event_count_by_cluster(context, cluster_id):
@@ -958,6 +1310,32 @@ def action_get(context, action_id):
     return action
 
 
+def action_update(context, action_id, values, version=None):
+    '''Update an action with new property values.
+
+    :param version: If specified, only update the action if it is still at
+                    this version and return the new version.
+    :raises NotFound: The specified action does not exist in database.
+    :raises VersionConflict: The action is no longer at ``version``.
+    '''
+    if version is not None:
+        res = _update_if_version(context, models.Action, action_id, values,
+                                 version)
+        if res is None:
+            raise exception.NotFound(
+                _('Action with id "%s" not found') % action_id)
+        return res
+
+    query = model_query(context, models.Action)
+    action = query.get(action_id)
+    if not action:
+        raise exception.NotFound(
+            _('Action with id "%s" not found') % action_id)
+
+    action.update(values)
+    action.save(query.session)
+
+
 def action_get_by_name(context, name):
     return query_by_name(context, models.Action, name)
 
@@ -978,6 +1356,17 @@ def action_get_all_ready(context):
     return query.all()
 
 
+def action_count_by_status(context):
+    '''Count the actions in each status.
+
+    :returns: A dict mapping action status to the number of actions.
+    '''
+    query = model_query(context, models.Action.status,
+                        func.count(models.Action.id))
+    query = query.group_by(models.Action.status)
+    return dict(query.all())
+
+
 def action_get_all_by_owner(context, owner_id):
     query = model_query(context, models.Action).\
         filter_by(owner=owner_id)
@@ -985,9 +1374,11 @@ def action_get_all_by_owner(context, owner_id):
 
 
 def action_get_all(context, filters=None, limit=None, marker=None,
-                   sort_keys=None, sort_dir=None, show_deleted=False):
+                   sort_keys=None, sort_dir=None, show_deleted=False,
+                   use_slave=False):
     query = soft_delete_aware_query(context, models.Action,
-                                    show_deleted=show_deleted)
+                                    show_deleted=show_deleted,
+                                    use_slave=use_slave)
 
     if filters is None:
         filters = {}
@@ -1012,7 +1403,8 @@ def action_get_all(context, filters=None, limit=None, marker=None,
     return _paginate_query(context, query, models.Action,
                            limit=limit, marker=marker,
                            sort_keys=keys, sort_dir=sort_dir,
-                           default_sort_keys=['created_time']).all()
+                           default_sort_keys=['created_time'],
+                           use_slave=use_slave).all()
 
 
 def _action_dependency_add(context, action_id, field, adds):
@@ -1069,7 +1461,7 @@ def action_add_dependency(context, depended, dependent):
     session = query.session
 
     if isinstance(depended, list):   # e.g. D depends on A,B,C
-        session.begin()
+        session.begin(subtransactions=True)
         for d in depended:
             _action_dependency_add(context, d, "depended_by", dependent)
 
@@ -1084,7 +1476,7 @@ def action_add_dependency(context, depended, dependent):
     else:
         dependents = dependent
 
-    session.begin()
+    session.begin(subtransactions=True)
     _action_dependency_add(context, depended, "depended_by", dependent)
 
     for d in dependents:
@@ -1101,7 +1493,7 @@ def action_del_dependency(context, depended, dependent):
     session = query.session
 
     if isinstance(depended, list):   # e.g. D depends on A,B,C
-        session.begin()
+        session.begin(subtransactions=True)
         for d in depended:
             _action_dependency_del(query, d, "depended_by", dependent)
 
@@ -1116,7 +1508,7 @@ def action_del_dependency(context, depended, dependent):
     else:
         dependents = dependent
 
-    session.begin()
+    session.begin(subtransactions=True)
     _action_dependency_del(query, depended, "depended_by", dependent)
 
     for d in dependents:
@@ -1132,7 +1524,7 @@ def action_mark_succeeded(context, action_id, timestamp):
             _('Action with id "%s" not found') % action_id)
 
     session = query.session
-    session.begin()
+    session.begin(subtransactions=True)
 
     action.owner = None
     action.status = ACTION_SUCCEEDED
@@ -1167,7 +1559,7 @@ def action_mark_failed(context, action_id, timestamp, reason=None):
     query = model_query(context, models.Action)
 
     session = query.session
-    session.begin()
+    session.begin(subtransactions=True)
 
     action = query.get(action_id)
     action.owner = None
@@ -1210,7 +1602,7 @@ def action_mark_cancelled(context, action_id, timestamp):
             _('Action with id "%s" not found') % action_id)
 
     session = query.session
-    session.begin()
+    session.begin(subtransactions=True)
 
     action.owner = None
     action.status = ACTION_CANCELED
@@ -1235,7 +1627,7 @@ def action_acquire(context, action_id, owner, timestamp):
         return None
 
     try:
-        session.begin()
+        session.begin(subtransactions=True)
         try:
 
             action.owner = owner
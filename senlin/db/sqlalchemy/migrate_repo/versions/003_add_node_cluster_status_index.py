@@ -0,0 +1,33 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import sqlalchemy
+
+
+def upgrade(migrate_engine):
+    meta = sqlalchemy.MetaData()
+    meta.bind = migrate_engine
+
+    node = sqlalchemy.Table('node', meta, autoload=True)
+    index = sqlalchemy.Index('ix_node_cluster_id_status',
+                             node.c.cluster_id, node.c.status)
+    index.create(migrate_engine)
+
+
+def downgrade(migrate_engine):
+    meta = sqlalchemy.MetaData()
+    meta.bind = migrate_engine
+
+    node = sqlalchemy.Table('node', meta, autoload=True)
+    index = sqlalchemy.Index('ix_node_cluster_id_status',
+                             node.c.cluster_id, node.c.status)
+    index.drop(migrate_engine)
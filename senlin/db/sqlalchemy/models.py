@@ -60,7 +60,7 @@ class SenlinBase(models.ModelBase):
             session = orm_session.Session.object_session(self)
             if not session:
                 session = get_session()
-        session.begin()
+        session.begin(subtransactions=True)
         session.delete(self)
         session.commit()
 
@@ -69,7 +69,7 @@ class SenlinBase(models.ModelBase):
             session = orm_session.Session.object_session(self)
             if not session:
                 session = get_session()
-        session.begin()
+        session.begin(subtransactions=True)
         for k, v in six.iteritems(values):
             setattr(self, k, v)
         session.commit()
@@ -82,7 +82,21 @@ class SoftDelete(object):
                              session=session)
 
 
-class Cluster(BASE, SenlinBase, SoftDelete):
+class Versioned(object):
+    """Mixin for rows that support optimistic concurrency control.
+
+    The version is bumped whenever the row is updated through the ORM, so
+    that a conditional update based on an old version can be detected.
+    """
+    version = sqlalchemy.Column(sqlalchemy.Integer, default=1)
+
+
+@sqlalchemy.event.listens_for(Versioned, 'before_update', propagate=True)
+def _bump_version(mapper, connection, target):
+    target.version = target.__class__.version + 1
+
+
+class Cluster(BASE, SenlinBase, SoftDelete, Versioned):
     """Represents a cluster created by the Senlin engine."""
 
     __tablename__ = 'cluster'
@@ -106,6 +120,9 @@ class Cluster(BASE, SenlinBase, SoftDelete):
     size = sqlalchemy.Column(sqlalchemy.Integer)
     next_index = sqlalchemy.Column(sqlalchemy.Integer)
     timeout = sqlalchemy.Column(sqlalchemy.Integer)
+    # Bumped when the nodes or policies of the cluster change, for ETags.
+    # Unlike the version, it doesn't fail conditional updates of the row.
+    etag_counter = sqlalchemy.Column(sqlalchemy.Integer, default=0)
 
     status = sqlalchemy.Column(sqlalchemy.String(255))
     status_reason = sqlalchemy.Column(sqlalchemy.String(255))
@@ -113,10 +130,14 @@ class Cluster(BASE, SenlinBase, SoftDelete):
     data = sqlalchemy.Column(types.Dict)
 
 
-class Node(BASE, SenlinBase, SoftDelete):
+class Node(BASE, SenlinBase, SoftDelete, Versioned):
     """Represents a Node created by the Senlin engine."""
 
     __tablename__ = 'node'
+    __table_args__ = (
+        sqlalchemy.Index('ix_node_cluster_id_status', 'cluster_id', 'status'),
+        SenlinBase.__table_args__,
+    )
 
     id = sqlalchemy.Column('id', sqlalchemy.String(36), primary_key=True,
                            default=lambda: str(uuid.uuid4()))
@@ -227,7 +248,7 @@ class Profile(BASE, SenlinBase, SoftDelete):
     deleted_time = sqlalchemy.Column(sqlalchemy.DateTime)
 
 
-class Action(BASE, SenlinBase, SoftDelete):
+class Action(BASE, SenlinBase, SoftDelete, Versioned):
     '''An action persisted in the Senlin database.'''
 
     __tablename__ = 'action'
@@ -0,0 +1,179 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+'''
+Statement counting and slow query reporting for the SQLAlchemy backend.
+
+Event listeners installed on an engine time every statement and attribute
+it to the scopes opened with :func:`collect` in the current thread (or
+green thread), typically one per RPC request or action. Statement text is
+recorded with its bind placeholders only; parameter values are never
+logged.
+'''
+
+import contextlib
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from sqlalchemy import event
+
+from senlin.common.i18n import _LW
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+CONF.import_opt('db_slow_query_threshold', 'senlin.common.config')
+
+# Maximum number of slow statements remembered by each scope
+MAX_SLOW_STATEMENTS = 10
+
+# Maximum length of statement text kept for a slow statement
+MAX_STATEMENT_LENGTH = 512
+
+_local = threading.local()
+
+_counters_lock = threading.Lock()
+_counters = {
+    'statements': 0,
+    'time': 0.0,
+    'slow_statements': 0,
+}
+
+
+class QueryStats(object):
+    '''Statements issued on behalf of one request or action.'''
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.statements = 0
+        self.time = 0.0
+        self.slow = []
+
+    def add(self, elapsed, slow=None):
+        self.statements += 1
+        self.time += elapsed
+        if slow is not None and len(self.slow) < MAX_SLOW_STATEMENTS:
+            self.slow.append(slow)
+
+    def to_dict(self):
+        return {
+            'statements': self.statements,
+            'time': round(self.time, 6),
+            'slow_statements': list(self.slow),
+        }
+
+
+def _scopes():
+    stack = getattr(_local, 'scopes', None)
+    if stack is None:
+        stack = _local.scopes = []
+    return stack
+
+
+def _redact(parameters):
+    '''Describe statement parameters without revealing their values.'''
+    if not parameters:
+        return ''
+    if isinstance(parameters, (list, tuple)) and parameters and \
+            isinstance(parameters[0], (list, tuple, dict)):
+        return '<%d parameter sets redacted>' % len(parameters)
+    return '<%d parameters redacted>' % len(parameters)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                           executemany):
+    if context is not None:
+        context._senlin_query_start = time.time()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    start = getattr(context, '_senlin_query_start', None)
+    if start is None:
+        return
+    elapsed = time.time() - start
+
+    slow = None
+    threshold = CONF.db_slow_query_threshold
+    if threshold and elapsed >= threshold:
+        slow = {
+            'statement': statement[:MAX_STATEMENT_LENGTH],
+            'parameters': _redact(parameters),
+            'time': round(elapsed, 6),
+        }
+
+    scopes = _scopes()
+    for stats in scopes:
+        stats.add(elapsed, slow)
+
+    with _counters_lock:
+        _counters['statements'] += 1
+        _counters['time'] += elapsed
+        if slow is not None:
+            _counters['slow_statements'] += 1
+
+    if slow is not None:
+        owner = scopes[-1].owner if scopes else None
+        LOG.warning(_LW('Slow DB statement (%(time).3fs) for %(owner)s: '
+                        '%(statement)s %(parameters)s'),
+                    {'time': elapsed, 'owner': owner,
+                     'statement': slow['statement'],
+                     'parameters': slow['parameters']})
+
+
+def install(engine):
+    '''Install the statement timing listeners on an engine.'''
+    if not event.contains(engine, 'before_cursor_execute',
+                          _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def uninstall(engine):
+    '''Remove the statement timing listeners from an engine.'''
+    if event.contains(engine, 'before_cursor_execute',
+                      _before_cursor_execute):
+        event.remove(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.remove(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+@contextlib.contextmanager
+def collect(owner):
+    '''Attribute statements issued in the current thread to ``owner``.
+
+    Scopes can be nested; a statement is counted in every open scope.
+    '''
+    stats = QueryStats(owner)
+    stack = _scopes()
+    stack.append(stats)
+    try:
+        yield stats
+    finally:
+        stack.remove(stats)
+        if stats.statements:
+            LOG.debug('%(owner)s issued %(count)d DB statements in '
+                      '%(time).3fs, %(slow)d slow',
+                      {'owner': owner, 'count': stats.statements,
+                       'time': stats.time, 'slow': len(stats.slow)})
+
+
+def get_counters():
+    '''Get process wide statement counters.'''
+    with _counters_lock:
+        return dict(_counters)
+
+
+def reset_counters():
+    with _counters_lock:
+        _counters.update(statements=0, time=0.0, slow_statements=0)
@@ -12,10 +12,108 @@
 
 import json
 
+from oslo_utils import importutils
+import six
 from sqlalchemy.dialects import mysql
 from sqlalchemy.ext import mutable
 from sqlalchemy import types
 
+# The encoder of the standard library is C accelerated already. For decoding,
+# simplejson is considerably faster on large documents, so it is used when
+# installed. On py2 its C speedups return ``str`` for ASCII-only strings,
+# where the standard library returns ``unicode``, so the standard library is
+# kept there. The choice is made once at import time.
+if six.PY2:
+    _decoder_module = json
+else:
+    _decoder_module = importutils.try_import('simplejson') or json
+
+
+def _is_scalar(value):
+    return not isinstance(value, (dict, list))
+
+
+def _is_flat(value):
+    '''Check if a decoded value contains no nested containers.
+
+    Lists of scalars are allowed as values, e.g. the roles of a context.
+    '''
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, list):
+        return True
+
+    for v in value:
+        if isinstance(v, dict):
+            return False
+        if isinstance(v, list) and not all(_is_scalar(i) for i in v):
+            return False
+    return True
+
+
+def _copy(value):
+    '''Copy a flat value, including the lists it contains.'''
+    if isinstance(value, dict):
+        return dict((k, list(v) if isinstance(v, list) else v)
+                    for k, v in value.items())
+    if isinstance(value, list):
+        return [list(v) if isinstance(v, list) else v for v in value]
+    return value
+
+
+class JSONCodec(object):
+    '''Encoder/decoder used by the JSON column types.
+
+    Values are encoded in compact form. Decoded values of flat documents,
+    whose values are scalars or lists of scalars, are remembered by their
+    raw text. Rows carrying identical content (e.g. the contexts of actions
+    derived from the same request, unless they carry token info) are thus
+    only parsed once. A fresh copy is returned on every hit, callers are
+    free to modify the result.
+    '''
+
+    SEPARATORS = (',', ':')
+
+    def __init__(self, decoder_module=None, cache_size=1024,
+                 max_text_size=4096):
+        self.decoder_module = decoder_module or _decoder_module
+        self.cache_size = cache_size
+        self.max_text_size = max_text_size
+        self._cache = {}
+
+        # Build the encoder/decoder once, the dumps()/loads() shortcuts
+        # construct a new encoder on each call when options are given.
+        encoder = json.JSONEncoder(separators=self.SEPARATORS)
+        self._encode = encoder.encode
+        self._decode = self.decoder_module.JSONDecoder().decode
+
+    def encode(self, value):
+        return self._encode(value)
+
+    def decode(self, text):
+        if text is None:
+            return None
+
+        try:
+            return _copy(self._cache[text])
+        except KeyError:
+            pass
+
+        value = self._decode(text)
+        if len(text) <= self.max_text_size and _is_flat(value):
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[text] = value
+            return _copy(value)
+
+        return value
+
+    def clear(self):
+        self._cache.clear()
+
+
+CODEC = JSONCodec()
+
 
 class MutableList(mutable.Mutable, list):
     @classmethod
@@ -53,8 +151,11 @@ class MutableList(mutable.Mutable, list):
         self.changed()
 
 
-class Dict(types.TypeDecorator):
+class JSONEncoded(types.TypeDecorator):
+    '''Base type for values stored as JSON text.'''
+
     impl = types.Text
+    codec = CODEC
 
     def load_dialect_impl(self, dialect):
         if dialect.name == 'mysql':
@@ -63,30 +164,18 @@ class Dict(types.TypeDecorator):
             return self.impl
 
     def process_bind_param(self, value, dialect):
-        return json.dumps(value)
+        return self.codec.encode(value)
 
     def process_result_value(self, value, dialect):
-        if value is None:
-            return None
-        return json.loads(value)
+        return self.codec.decode(value)
 
 
-class List(types.TypeDecorator):
-    impl = types.Text
-
-    def load_dialect_impl(self, dialect):
-        if dialect.name == 'mysql':
-            return dialect.type_descriptor(mysql.LONGTEXT())
-        else:
-            return self.impl
+class Dict(JSONEncoded):
+    pass
 
-    def process_bind_param(self, value, dialect):
-        return json.dumps(value)
 
-    def process_result_value(self, value, dialect):
-        if value is None:
-            return None
-        return json.loads(value)
+class List(JSONEncoded):
+    pass
 
 
 mutable.MutableDict.associate_with(Dict)
@@ -0,0 +1,119 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+'''
+In-memory cloud driver for testing and benchmarking.
+
+Servers only live in the memory of the process. Every call takes a time
+drawn from a latency distribution and fails with a given probability, so
+that the engine can be exercised at scale without a real cloud.
+'''
+
+import random
+import threading
+import uuid
+
+import eventlet
+
+from senlin.common import exception
+from senlin.drivers import base
+
+LATENCY_DISTRIBUTIONS = (
+    CONSTANT, UNIFORM, EXPONENTIAL,
+) = (
+    'constant', 'uniform', 'exponential',
+)
+
+# Servers of the fake cloud, shared by all clients in the process
+_servers = {}
+_lock = threading.Lock()
+
+
+class FakeServer(object):
+    def __init__(self, id, name, metadata=None):
+        self.id = id
+        self.name = name
+        self.metadata = metadata or {}
+        self.status = 'ACTIVE'
+
+
+class FakeCloudClient(base.DriverBase):
+    '''Fake cloud driver.'''
+
+    def __init__(self, context, latency=None, failure_rate=0.0, rand=None):
+        '''Initializer.
+
+        :param latency: A dict with the 'distribution' of call latencies,
+                        one of LATENCY_DISTRIBUTIONS, their 'mean' and
+                        optionally their 'max', in seconds.
+        :param failure_rate: Probability of a call to fail, from 0 to 1.
+        :param rand: A random.Random instance, for repeatable runs.
+        '''
+        super(FakeCloudClient, self).__init__(context)
+        self.latency = latency or {}
+        self.failure_rate = failure_rate or 0.0
+        self.random = rand or random
+
+    def _latency(self):
+        distribution = self.latency.get('distribution') or CONSTANT
+        mean = float(self.latency.get('mean') or 0)
+        if mean <= 0:
+            return 0
+
+        if distribution == UNIFORM:
+            value = self.random.uniform(0, 2 * mean)
+        elif distribution == EXPONENTIAL:
+            value = self.random.expovariate(1.0 / mean)
+        else:
+            value = mean
+
+        if self.latency.get('max') is not None:
+            value = min(value, float(self.latency['max']))
+        return value
+
+    def _call(self, operation):
+        '''Simulate the latency and failures of a cloud call.'''
+        delay = self._latency()
+        if delay > 0:
+            eventlet.sleep(delay)
+
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            raise exception.Error('Injected failure of fake %s' % operation)
+
+    def server_create(self, name, metadata=None):
+        self._call('server_create')
+        server = FakeServer(str(uuid.uuid4()), name, metadata)
+        with _lock:
+            _servers[server.id] = server
+        return server
+
+    def server_get(self, server_id):
+        self._call('server_get')
+        server = _servers.get(server_id)
+        if server is None:
+            raise exception.Error('Fake server %s not found' % server_id)
+        return server
+
+    def server_update(self, server_id, metadata=None):
+        self._call('server_update')
+        server = self.server_get(server_id)
+        server.metadata = metadata or {}
+        return server
+
+    def server_delete(self, server_id):
+        self._call('server_delete')
+        with _lock:
+            _servers.pop(server_id, None)
+
+    @staticmethod
+    def server_count():
+        return len(_servers)
@@ -21,7 +21,11 @@ from senlin.common import context as req_context
 from senlin.common import exception
 from senlin.common.i18n import _
 from senlin.common.i18n import _LI
+from senlin.common import profiler
 from senlin.db import api as db_api
+from senlin.engine import dispatcher
+from senlin.engine import metrics
+from senlin.engine import tracing
 from senlin.policies import base as policy_mod
 
 wallclock = time.time
@@ -35,6 +39,9 @@ CAUSES = (
     'Derived Action',
 )
 
+# Maximum number of derived actions followed to find the root of a trace
+MAX_TRACE_DEPTH = 10
+
 
 class Action(object):
     '''An action can be performed on a cluster or a node of a cluster.'''
@@ -61,6 +68,9 @@ class Action(object):
         'SUCCEEDED', 'FAILED', 'CANCELLED',
     )
 
+    # Statuses of the actions that have completed
+    DONE_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
     # Signal commands
     COMMANDS = (
         SIG_CANCEL, SIG_SUSPEND, SIG_RESUME,
@@ -176,12 +186,12 @@ class Action(object):
 
         if self.id:
             values['updated_time'] = datetime.datetime.utcnow()
-            action = db_api.action_update(context, values)
+            db_api.action_update(context, self.id, values)
         else:
             values['created_time'] = datetime.datetime.utcnow()
             action = db_api.action_create(context, values)
+            self.id = action.id
 
-        self.id = action.id
         return self.id
 
     @classmethod
@@ -226,14 +236,16 @@ class Action(object):
 
     @classmethod
     def load_all(cls, context, filters=None, limit=None, marker=None,
-                 sort_keys=None, sort_dir=None, show_deleted=False):
+                 sort_keys=None, sort_dir=None, show_deleted=False,
+                 use_slave=False):
         '''Retrieve all actions of from database.'''
 
         records = db_api.action_get_all(context, filters=filters,
                                         limit=limit, marker=marker,
                                         sort_keys=sort_keys,
                                         sort_dir=sort_dir,
-                                        show_deleted=show_deleted)
+                                        show_deleted=show_deleted,
+                                        use_slave=use_slave)
 
         for record in records:
             yield cls._from_db_record(record)
@@ -327,36 +339,37 @@ class Action(object):
         :param target: A tuple of ('when', action_name)
         :return: A dictionary that contains the check result.
         """
-        # Initialize an empty dict for policy check result
-        data = policy_mod.PolicyData()
+        with tracing.span('policy_check', target=target):
+            # Initialize an empty dict for policy check result
+            data = policy_mod.PolicyData()
 
-        if target not in ['BEFORE', 'AFTER']:
-            return data
+            if target not in ['BEFORE', 'AFTER']:
+                return data
 
-        # Get list of policy IDs attached to cluster
-        bindings = db_api.cluster_policy_get_all(self.context, cluster_id,
-                                                 sort_keys=['priority'],
-                                                 filters={'enabled': True})
+            # Get list of policy IDs attached to cluster
+            bindings = db_api.cluster_policy_get_all(self.context, cluster_id,
+                                                     sort_keys=['priority'],
+                                                     filters={'enabled': True})
 
-        for p in bindings:
-            policy = policy_mod.Policy.load(self.context, p.policy_id)
-            if (target, self.action) not in policy.TARGET:
-                continue
+            for p in bindings:
+                policy = policy_mod.Policy.load(self.context, p.policy_id)
+                if (target, self.action) not in policy.TARGET:
+                    continue
 
-            if target == 'BEFORE':
-                method = getattr(policy, 'pre_op')
-            else:  # target == 'AFTER'
-                method = getattr(policy, 'post_op')
+                if target == 'BEFORE':
+                    method = getattr(policy, 'pre_op')
+                else:  # target == 'AFTER'
+                    method = getattr(policy, 'post_op')
 
-            # Pass data from one policy to another
-            data = method(cluster_id, self, data)
+                # Pass data from one policy to another
+                data = method(cluster_id, self, data)
 
-            # Abort policy checking if failures found
-            if data.status == policy_mod.CHECK_ERROR:
-                LOG.warning(_('Failed policy checking: %s'), data.reason)
-                return data
+                # Abort policy checking if failures found
+                if data.status == policy_mod.CHECK_ERROR:
+                    LOG.warning(_('Failed policy checking: %s'), data.reason)
+                    return data
 
-        return data
+            return data
 
     def to_dict(self):
         action_dict = {
@@ -387,26 +400,62 @@ class Action(object):
         return cls(context=context, **kwargs)
 
 
+def _trace_link(context, action, trace):
+    '''Make the trace of a derived action part of the trace of its cause.'''
+    if action.cause != CAUSE_DERIVED or not action.depended_by:
+        return
+
+    parent_id = action.depended_by[0]
+    root_id = parent_id
+    # Derived actions are rarely nested, but don't follow a broken chain
+    for i in range(MAX_TRACE_DEPTH):
+        parent = db_api.action_get(context, root_id)
+        if (parent is None or parent.cause != CAUSE_DERIVED or
+                not parent.depended_by):
+            break
+        root_id = parent.depended_by[0]
+
+    trace.link(root_id, parent_id)
+
+
 def ActionProc(context, action_id, worker_id):
     '''Action process.'''
 
+    with tracing.trace('ActionProc', action_id) as trace:
+        return _action_proc(context, action_id, worker_id, trace)
+
+
+def _action_proc(context, action_id, worker_id, trace):
     # Step 1: lock the action for execution
     timestamp = wallclock()
-    result = db_api.action_acquire(context, action_id, worker_id, timestamp)
+    with tracing.span('acquire'):
+        result = db_api.action_acquire(context, action_id, worker_id,
+                                       timestamp)
     if result is None:
         LOG.debug(_('Failed locking action "%s" for execution'), action_id)
         return False
 
     # Step 2: materialize the action object
-    action = Action.load(context, action_id=action_id)
+    with tracing.span('load'):
+        action = Action.load(context, action_id=action_id)
+        if trace is not None:
+            trace.root.name = action.action
+            _trace_link(context, action, trace)
 
     LOG.info(_LI('Action %(name)s [%(id)s] started'),
              {'name': six.text_type(action.action), 'id': action.id})
 
     reason = 'Action completed'
+    stats = None
     try:
         # Step 3: execute the action
-        result, reason = action.execute()
+        with db_api.query_stats(action.id) as stats:
+            with metrics.timer('action.duration.%s' % action.action):
+                with tracing.span('execute'):
+                    with profiler.profile(
+                            'action-%s-%s' % (action.action, action.id),
+                            profiler.action_enabled(action.action)):
+                        result, reason = action.execute()
 
         # NOTE: The following exception report is not giving useful
         # information for some reasons.
@@ -419,5 +468,25 @@ def ActionProc(context, action_id, worker_id):
         #            '%(reason)s'), {'action': action.action,
         #                            'reason': reason})
     finally:
+        # Record the DB statements issued by the action, if they were counted
+        # and the trace of the action, if it is traced
+        outputs = {}
+        if stats is not None and stats.statements:
+            outputs['db_stats'] = stats.to_dict()
+        if trace is not None:
+            trace.root.finish()
+            outputs['trace'] = trace.to_dict()
+        if outputs:
+            action.outputs.update(outputs)
+            db_api.action_update(context, action.id,
+                                 {'outputs': action.outputs})
+
         # NOTE: locks on action is eventually released here by status update
-        action.set_status(result, reason)
+        with tracing.span('set_status'):
+            action.set_status(result, reason)
+        metrics.counter('action.status.%s' % action.status).inc()
+        # Wake the API requests waiting for the action. Only the actions
+        # requested through the API are notified, not the derived ones.
+        if (action.cause == CAUSE_RPC and
+                action.status in action.DONE_STATUSES):
+            dispatcher.notify_done(context, action.id, action.status)
@@ -86,6 +86,7 @@ class ClusterAction(base.Action):
         '''Utility method for node creation.'''
         placement = policy_data.get('placement', None)
 
+        nodes = []
         for m in range(count):
             name = 'node-%s-%003d' % (cluster.id[:8], cluster.size + m + 1)
             node = node_mod.Node(name, cluster.profile_id, cluster.id,
@@ -94,21 +95,28 @@ class ClusterAction(base.Action):
             if placement is not None:
                 # We assume placement is a list
                 node.data['placement'] = placement[m]
-            node.store(self.context)
-
-            kwargs = {
-                'name': 'node_create_%s' % node.id[:8],
-                'target': node.id,
-                'cause': base.CAUSE_DERIVED,
-            }
+            nodes.append(node)
+
+        # Store all nodes, their actions and dependencies in one unit of
+        # work before any of the new actions is made visible to workers.
+        actions = []
+        with db_api.transaction(self.context):
+            node_mod.Node.store_many(self.context, nodes)
+            for node in nodes:
+                kwargs = {
+                    'name': 'node_create_%s' % node.id[:8],
+                    'target': node.id,
+                    'cause': base.CAUSE_DERIVED,
+                }
 
-            action = base.Action(self.context, 'NODE_CREATE', **kwargs)
-            action.store(self.context)
+                action = base.Action(self.context, 'NODE_CREATE', **kwargs)
+                action.store(self.context)
+                db_api.action_add_dependency(self.context, action.id, self.id)
+                actions.append(action)
 
-            # Build dependency and make the new action ready
-            db_api.action_add_dependency(self.context, action.id, self.id)
+        # Make the new actions ready
+        for action in actions:
             action.set_status(self.READY)
-
             dispatcher.notify(self.context, dispatcher.Dispatcher.NEW_ACTION,
                               None, action_id=action.id)
 
@@ -187,17 +195,20 @@ class ClusterAction(base.Action):
             if not destroy:
                 action_name = consts.NODE_LEAVE
 
-        for node_id in nodes:
-            action = base.Action(self.context, action_name,
-                                 name='node_delete_%s' % node_id[:8],
-                                 target=node_id,
-                                 cause=base.CAUSE_DERIVED)
-            action.store(self.context)
-
-            # Build dependency and make the new action ready
-            db_api.action_add_dependency(self.context, action.id, self.id)
+        actions = []
+        with db_api.transaction(self.context):
+            for node_id in nodes:
+                action = base.Action(self.context, action_name,
+                                     name='node_delete_%s' % node_id[:8],
+                                     target=node_id,
+                                     cause=base.CAUSE_DERIVED)
+                action.store(self.context)
+                db_api.action_add_dependency(self.context, action.id, self.id)
+                actions.append(action)
+
+        # Make the new actions ready
+        for action in actions:
             action.set_status(self.READY)
-
             dispatcher.notify(self.context, dispatcher.Dispatcher.NEW_ACTION,
                               None, action_id=action.id)
 
@@ -209,7 +220,19 @@ class ClusterAction(base.Action):
     def do_delete(self, cluster, policy_data):
         reason = 'Deletion in progress'
         cluster.set_status(self.context, cluster.DELETING, reason)
-        nodes = [node.id for node in cluster.get_nodes()]
+
+        # Nodes never created in the cloud only have DB records to remove.
+        # Nodes in other statuses, e.g. with a creation still running, are
+        # deleted by actions like the others.
+        nodes = []
+        orphans = []
+        for node in cluster.get_nodes():
+            if (not node.physical_id and
+                    node.status in (node.INIT, node.ERROR)):
+                orphans.append(node.id)
+            else:
+                nodes.append(node.id)
+        db_api.node_delete_many(self.context, orphans)
 
         # For cluster delete, we delete the nodes
         data = {
@@ -15,11 +15,13 @@ import datetime
 from oslo_config import cfg
 from oslo_log import log as logging
 
+from senlin.common import consts
 from senlin.common import exception
 from senlin.common.i18n import _LE
 from senlin.common.i18n import _LW
 from senlin.db import api as db_api
 from senlin.engine import event as events
+from senlin.engine import index_allocator
 from senlin.engine import node as node_mod
 from senlin.openstack.common import periodic_task
 from senlin.profiles import base as profiles_base
@@ -45,6 +47,9 @@ class Cluster(periodic_task.PeriodicTasks):
         'UPDATING', 'UPDATE_CANCELLED',
     )
 
+    # Fields of the dict form that are computed from the runtime data
+    RUNTIME_FIELDS = ('nodes', 'policies', 'profile_name')
+
     def __init__(self, name, profile_id, size=0, context=None, **kwargs):
         '''Intialize a cluster object.
 
@@ -89,12 +94,17 @@ class Cluster(periodic_task.PeriodicTasks):
         if context is not None:
             self._load_runtime_data(context)
 
-    def _load_runtime_data(self, context):
-        self.rt = {
-            'profile': profiles_base.Profile.load(context, self.profile_id),
-            'nodes': node_mod.Node.load_all(context, cluster_id=self.id),
-            'policies': [],
-        }
+    def _load_runtime_data(self, context, fields=None):
+        '''Load the runtime data, or only what the given fields need.'''
+        self.rt = {}
+        if fields is None or 'profile_name' in fields:
+            self.rt['profile'] = profiles_base.Profile.load(
+                context, self.profile_id)
+        if fields is None or 'nodes' in fields:
+            self.rt['nodes'] = node_mod.Node.load_all(context,
+                                                      cluster_id=self.id)
+        if fields is None or 'policies' in fields:
+            self.rt['policies'] = []
 
     def store(self, context):
         '''Store the cluster in database and return its ID.
@@ -135,12 +145,43 @@ class Cluster(periodic_task.PeriodicTasks):
         return self.id
 
     @classmethod
-    def _from_db_record(cls, context, record):
+    def db_columns(cls, fields):
+        '''Get the DB columns needed to build the given fields.
+
+        :param fields: names of the fields wanted, or None for all fields.
+        :returns: a list of column names, or None for all columns.
+        '''
+        if fields is None:
+            return None
+
+        columns = set(['id'])
+        for field in fields:
+            if field == 'profile_name':
+                columns.add('profile_id')
+            elif (field in consts.CLUSTER_FIELDS and
+                  field not in cls.RUNTIME_FIELDS):
+                columns.add(field)
+        return sorted(columns)
+
+    @classmethod
+    def _from_db_record(cls, context, record, fields=None):
         '''Construct a cluster object from database record.
 
         :param context: the context used for DB operations;
         :param record: a DB cluster object that will receive all fields;
+        :param fields: names of the fields wanted, or None for all fields.
+                       Only the columns needed are read from the record, and
+                       only the runtime data needed by the fields is loaded.
         '''
+        if fields is not None:
+            kwargs = dict((c, getattr(record, c))
+                          for c in cls.db_columns(fields))
+            cluster = cls(kwargs.pop('name', None),
+                          kwargs.pop('profile_id', None),
+                          kwargs.pop('size', 0), **kwargs)
+            cluster._load_runtime_data(context, fields=fields)
+            return cluster
+
         kwargs = {
             'id': record.id,
             'user': record.user,
@@ -163,7 +204,8 @@ class Cluster(periodic_task.PeriodicTasks):
                    context=context, **kwargs)
 
     @classmethod
-    def load(cls, context, cluster_id=None, cluster=None, show_deleted=False):
+    def load(cls, context, cluster_id=None, cluster=None, show_deleted=False,
+             fields=None):
         '''Retrieve a cluster from database.'''
         if cluster is None:
             cluster = db_api.cluster_get(context, cluster_id,
@@ -171,23 +213,31 @@ class Cluster(periodic_task.PeriodicTasks):
             if cluster is None:
                 raise exception.ClusterNotFound(cluster=cluster_id)
 
-        return cls._from_db_record(context, cluster)
+        return cls._from_db_record(context, cluster, fields=fields)
 
     @classmethod
     def load_all(cls, context, limit=None, marker=None, sort_keys=None,
                  sort_dir=None, filters=None, tenant_safe=True,
-                 show_deleted=False, show_nested=False):
+                 show_deleted=False, show_nested=False, use_slave=False,
+                 fields=None):
         '''Retrieve all clusters from database.'''
 
         records = db_api.cluster_get_all(context, limit, marker, sort_keys,
                                          sort_dir, filters, tenant_safe,
-                                         show_deleted, show_nested)
+                                         show_deleted, show_nested,
+                                         use_slave=use_slave,
+                                         columns=cls.db_columns(fields))
 
         for record in records:
-            cluster = cls._from_db_record(context, record)
+            cluster = cls._from_db_record(context, record, fields=fields)
             yield cluster
 
-    def to_dict(self):
+    def to_dict(self, fields=None):
+        '''Get the dict form of the cluster.
+
+        :param fields: names of the fields to include, or None for all
+                       fields.
+        '''
         info = {
             'id': self.id,
             'name': self.name,
@@ -206,10 +256,15 @@ class Cluster(periodic_task.PeriodicTasks):
             'status_reason': self.status_reason,
             'tags': self.tags,
             'data': self.data,
-            'nodes': [node.id for node in self.rt['nodes']],
-            'policies': [policy.id for policy in self.rt['policies']],
-            'profile_name': self.rt['profile'].name,
         }
+        if fields is None or 'nodes' in fields:
+            info['nodes'] = [node.id for node in self.rt['nodes']]
+        if fields is None or 'policies' in fields:
+            info['policies'] = [policy.id for policy in self.rt['policies']]
+        if fields is None or 'profile_name' in fields:
+            info['profile_name'] = self.rt['profile'].name
+        if fields is not None:
+            info = dict((k, v) for k, v in info.items() if k in fields)
         return info
 
     @classmethod
@@ -256,6 +311,7 @@ class Cluster(periodic_task.PeriodicTasks):
         '''
         #self.set_status(context, self.DELETED)
         db_api.cluster_delete(context, self.id)
+        index_allocator.discard(self.id)
         return True
 
     def do_update(self, context, new_profile_id, **kwargs):
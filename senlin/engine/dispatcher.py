@@ -55,8 +55,19 @@ class Dispatcher(service.Service):
         '''
         return True
 
-    def new_action(self, context, action_id=None):
-        self.TG.start_action(context, action_id, self.engine_id)
+    def new_action(self, context, action_id=None, action_ids=None):
+        '''Start an action, or a batch of actions notified at once.
+
+        Each action of a batch gets its own copy of the context, so that
+        the action threads don't share a DB session.
+        '''
+        if action_ids is None:
+            self.TG.start_action(context, action_id, self.engine_id)
+            return
+
+        for action_id in action_ids:
+            ctx = context.__class__.from_dict(context.to_dict())
+            self.TG.start_action(ctx, action_id, self.engine_id)
 
     def cancel_action(self, context, action_id):
         '''Cancel an action.'''
@@ -110,3 +121,21 @@ def notify(context, call, engine_id, *args, **kwargs):
         return True
     except oslo_messaging.MessagingTimeout:
         return False
+
+
+def notify_done(context, action_id, status):
+    '''Tell the API processes that an action has completed.
+
+    The notification is a fanout cast to the API processes waiting for
+    actions, the engine dispatchers don't receive it.
+
+    :param context: rpc request context
+    :param action_id: ID of the action that reached a terminal state
+    :param status: the terminal status of the action
+    '''
+    client = rpc_messaging.get_rpc_client(version=consts.RPC_API_VERSION)
+    cast_context = client.prepare(version=consts.RPC_API_VERSION,
+                                  topic=consts.ACTION_DONE_TOPIC,
+                                  fanout=True)
+    cast_context.cast(context, 'action_done', action_id=action_id,
+                      status=status)
@@ -11,6 +11,7 @@
 # under the License.
 
 import glob
+import hashlib
 import os.path
 import six
 from stevedore import extension
@@ -52,6 +53,8 @@ class Environment(object):
         :param is_global: boolean indicating if this is a user created one.
         '''
         self.params = {}
+        self._version = None
+        self._schemas = {}
         if is_global:
             self.profile_registry = registry.Registry('profiles')
             self.policy_registry = registry.Registry('policies')
@@ -98,6 +101,34 @@ class Environment(object):
         self.params.update(env_dict.get(self.PARAMETERS, {}))
         self.profile_registry.load(env_dict.get(self.CUSTOM_PROFILES, {}))
         self.policy_registry.load(env_dict.get(self.CUSTOM_POLICIES, {}))
+        self._changed()
+
+    def _changed(self):
+        '''Forget the version and schemas computed for the old plugins.'''
+        self._version = None
+        self._schemas = {}
+
+    @property
+    def version(self):
+        '''A stamp of the registered profile and policy types.
+
+        It is derived from the names and implementations of the plugins
+        only, so that all engines loading the same plugins publish the same
+        version, and it changes whenever a plugin is registered or replaced.
+        '''
+        if self._version is None:
+            items = (self.profile_registry.signature() +
+                     self.policy_registry.signature())
+            data = '\n'.join(items).encode('utf-8')
+            self._version = hashlib.sha1(data).hexdigest()
+        return self._version
+
+    def _get_schema(self, kind, name, plugin):
+        key = (kind, name)
+        if key not in self._schemas:
+            self._schemas[key] = dict((n, dict(schema)) for n, schema in
+                                      plugin.spec_schema.items())
+        return self._schemas[key]
 
     def _check_profile_type_name(self, name):
         if name == "" or name is None:
@@ -110,6 +141,7 @@ class Environment(object):
     def register_profile(self, name, plugin):
         self._check_profile_type_name(name)
         self.profile_registry.register_plugin(name, plugin)
+        self._changed()
 
     def get_profile(self, name):
         self._check_profile_type_name(name)
@@ -121,6 +153,13 @@ class Environment(object):
     def get_profile_types(self):
         return self.profile_registry.get_types()
 
+    def get_profile_schema(self, name):
+        '''Get the spec schema of a profile type, as a dict.
+
+        The dict is built once per profile type and then reused.
+        '''
+        return self._get_schema('profile', name, self.get_profile(name))
+
     def _check_policy_type_name(self, name):
         if name == "" or name is None:
             msg = _('Policy type name not specified')
@@ -132,6 +171,7 @@ class Environment(object):
     def register_policy(self, name, plugin):
         self._check_policy_type_name(name)
         self.policy_registry.register_plugin(name, plugin)
+        self._changed()
 
     def get_policy(self, name):
         self._check_policy_type_name(name)
@@ -143,6 +183,13 @@ class Environment(object):
     def get_policy_types(self):
         return self.policy_registry.get_types()
 
+    def get_policy_schema(self, name):
+        '''Get the spec schema of a policy type, as a dict.
+
+        The dict is built once per policy type and then reused.
+        '''
+        return self._get_schema('policy', name, self.get_policy(name))
+
     def read_global_environment(self):
         '''Read and parse global enviroment files.'''
 
@@ -100,14 +100,15 @@ class Event(object):
     @classmethod
     def load_all(cls, context, filters=None, limit=None, marker=None,
                  sort_keys=None, sort_dir=None, tenant_safe=True,
-                 show_deleted=False):
+                 show_deleted=False, use_slave=False):
         '''Retrieve all events from database.'''
 
         records = db_api.event_get_all(context, limit=limit, marker=marker,
                                        sort_keys=sort_keys, sort_dir=sort_dir,
                                        filters=filters,
                                        tenant_safe=tenant_safe,
-                                       show_deleted=show_deleted)
+                                       show_deleted=show_deleted,
+                                       use_slave=use_slave)
 
         for record in records:
             yield cls.from_db_record(record)
@@ -0,0 +1,101 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+'''
+Hi-lo allocation of node indexes.
+
+Instead of bumping a cluster's 'next_index' for every node created, an
+engine reserves a block of indexes from the cluster with one UPDATE and
+then hands them out from memory. Indexes stay unique across engines, but
+they are no longer guaranteed to be contiguous: a block reserved by an
+engine that stops before using it is simply skipped.
+'''
+
+import threading
+
+from oslo_config import cfg
+
+from senlin.db import api as db_api
+
+CONF = cfg.CONF
+CONF.import_opt('node_index_block_size', 'senlin.common.config')
+
+
+class IndexAllocator(object):
+    '''Per-engine cache of node index blocks reserved from clusters.'''
+
+    def __init__(self, block_size=None):
+        self.block_size = block_size
+        # cluster_id -> [next index to hand out, end of block (exclusive)]
+        self._blocks = {}
+        # cluster_id -> lock serializing the reservations for the cluster
+        self._locks = {}
+        # Guards the two dicts above, never held across a DB call
+        self._lock = threading.Lock()
+
+    def _take(self, cluster_id):
+        '''Take an index from the cached block of a cluster, if any.'''
+        with self._lock:
+            block = self._blocks.get(cluster_id)
+            if block is None or block[0] >= block[1]:
+                return None
+            index = block[0]
+            block[0] += 1
+            return index
+
+    def _cluster_lock(self, cluster_id):
+        with self._lock:
+            return self._locks.setdefault(cluster_id, threading.Lock())
+
+    def allocate(self, context, cluster_id):
+        '''Get a new node index for the specified cluster.
+
+        :returns: A node index, or None if the cluster cannot be found.
+        '''
+        index = self._take(cluster_id)
+        if index is not None:
+            return index
+
+        # Only the allocations for the same cluster wait for the reservation
+        with self._cluster_lock(cluster_id):
+            # Another thread may have reserved a block in the meantime
+            index = self._take(cluster_id)
+            if index is not None:
+                return index
+
+            size = max(self.block_size or CONF.node_index_block_size, 1)
+            first = db_api.cluster_reserve_indexes(context, cluster_id, size)
+
+            with self._lock:
+                if first is None:
+                    self._blocks.pop(cluster_id, None)
+                    self._locks.pop(cluster_id, None)
+                    return None
+                self._blocks[cluster_id] = [first + 1, first + size]
+            return first
+
+    def discard(self, cluster_id):
+        '''Forget about the indexes reserved for a cluster.'''
+        with self._lock:
+            self._blocks.pop(cluster_id, None)
+            self._locks.pop(cluster_id, None)
+
+
+_allocator = IndexAllocator()
+
+
+def allocate(context, cluster_id):
+    return _allocator.allocate(context, cluster_id)
+
+
+def discard(cluster_id):
+    _allocator.discard(cluster_id)
@@ -0,0 +1,164 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+'''
+In-process metrics of an engine.
+
+Counters and histograms are updated by the engine as it runs; gauges are
+functions evaluated each time a snapshot is taken. A snapshot is a plain
+dict that can be logged, returned over RPC or printed by senlin-manage.
+'''
+
+import bisect
+import contextlib
+import threading
+import time
+
+from oslo_log import log as logging
+
+from senlin.common.i18n import _LW
+
+LOG = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the default histogram buckets
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 600, 3600)
+
+
+class Counter(object):
+    '''A value that only goes up.'''
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def to_dict(self):
+        return self.value
+
+
+class Histogram(object):
+    '''Distribution of observed values over a fixed set of buckets.'''
+
+    def __init__(self, buckets=None):
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+        # The last slot counts values above the largest bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = None
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def to_dict(self):
+        with self._lock:
+            buckets = dict((str(b), c)
+                           for b, c in zip(self.buckets, self.counts))
+            buckets['inf'] = self.counts[-1]
+            return {
+                'count': self.count,
+                'sum': self.sum,
+                'max': self.max,
+                'buckets': buckets,
+            }
+
+
+class Registry(object):
+    '''Named counters, histograms and gauges of an engine.'''
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name):
+        with self._lock:
+            if name not in self._counters:
+                self._counters[name] = Counter()
+            return self._counters[name]
+
+    def histogram(self, name, buckets=None):
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = Histogram(buckets)
+            return self._histograms[name]
+
+    def gauge(self, name, func):
+        '''Register a function that reports the current value of a gauge.'''
+        with self._lock:
+            self._gauges[name] = func
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = dict(self._histograms)
+            gauges = dict(self._gauges)
+
+        result = {
+            'counters': dict((n, c.to_dict()) for n, c in counters.items()),
+            'histograms': dict((n, h.to_dict())
+                               for n, h in histograms.items()),
+            'gauges': {},
+        }
+        for name, func in gauges.items():
+            try:
+                result['gauges'][name] = func()
+            except Exception as ex:
+                LOG.warning(_LW('Failed reading gauge %(name)s: %(ex)s'),
+                            {'name': name, 'ex': ex})
+                result['gauges'][name] = None
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._gauges.clear()
+
+
+REGISTRY = Registry()
+
+
+def counter(name):
+    return REGISTRY.counter(name)
+
+
+def histogram(name, buckets=None):
+    return REGISTRY.histogram(name, buckets)
+
+
+def gauge(name, func):
+    REGISTRY.gauge(name, func)
+
+
+def snapshot():
+    return REGISTRY.snapshot()
+
+
+@contextlib.contextmanager
+def timer(name):
+    '''Observe the time spent in a block in the named histogram.'''
+    start = time.time()
+    try:
+        yield
+    finally:
+        histogram(name).observe(time.time() - start)
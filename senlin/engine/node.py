@@ -14,11 +14,13 @@ import datetime
 
 from oslo_log import log as logging
 
+from senlin.common import consts
 from senlin.common import exception
 from senlin.common.i18n import _LE
 from senlin.common.i18n import _LW
 from senlin.db import api as db_api
 from senlin.engine import event as event_mod
+from senlin.engine import index_allocator
 from senlin.profiles import base as profile_base
 
 LOG = logging.getLogger(__name__)
@@ -40,6 +42,9 @@ class Node(object):
         'CREATING', 'UPDATING', 'DELETING',
     )
 
+    # Fields of the dict form that are computed from the runtime data
+    RUNTIME_FIELDS = ('profile_name',)
+
     def __init__(self, name, profile_id, cluster_id, context=None, **kwargs):
         self.id = kwargs.get('id', None)
         if name:
@@ -51,7 +56,10 @@ class Node(object):
 
         self.physical_id = kwargs.get('physical_id', '')
         self.profile_id = profile_id
-        self.project = kwargs.get('project', context.project_id)
+        if 'project' in kwargs:
+            self.project = kwargs['project']
+        else:
+            self.project = context.project_id
         self.cluster_id = cluster_id
         self.index = kwargs.get('index', -1)
         self.role = kwargs.get('role', '')
@@ -75,14 +83,8 @@ class Node(object):
             'profile': profile_base.Profile.load(context, self.profile_id),
         }
 
-    def store(self, context):
-        '''Store the node record into database table.
-
-        The invocation of DB API could be a node_create or a node_update,
-        depending on whether node has an ID assigned.
-        '''
-
-        values = {
+    def _db_values(self):
+        return {
             'name': self.name,
             'physical_id': self.physical_id,
             'cluster_id': self.cluster_id,
@@ -100,6 +102,14 @@ class Node(object):
             'tags': self.tags,
         }
 
+    def store(self, context):
+        '''Store the node record into database table.
+
+        The invocation of DB API could be a node_create or a node_update,
+        depending on whether node has an ID assigned.
+        '''
+
+        values = self._db_values()
         if self.id:
             db_api.node_update(context, self.id, values)
             # TODO(Qiming): create event/log
@@ -113,12 +123,60 @@ class Node(object):
         return self.id
 
     @classmethod
-    def _from_db_record(cls, context, record):
+    def store_many(cls, context, nodes):
+        '''Create the records for a list of new nodes with one DB call.'''
+        now = datetime.datetime.utcnow()
+        values_list = []
+        for node in nodes:
+            node.init_time = now
+            values_list.append(node._db_values())
+
+        node_ids = db_api.node_create_many(context, values_list)
+        for node, node_id in zip(nodes, node_ids):
+            node.id = node_id
+
+        return node_ids
+
+    @classmethod
+    def db_columns(cls, fields):
+        '''Get the DB columns needed to build the given fields.
+
+        :param fields: names of the fields wanted, or None for all fields.
+        :returns: a list of column names, or None for all columns.
+        '''
+        if fields is None:
+            return None
+
+        columns = set(['id'])
+        for field in fields:
+            if field == 'profile_name':
+                columns.add('profile_id')
+            elif (field in consts.NODE_FIELDS and
+                  field not in cls.RUNTIME_FIELDS):
+                columns.add(field)
+        return sorted(columns)
+
+    @classmethod
+    def _from_db_record(cls, context, record, fields=None):
         '''Construct a node object from database record.
 
         :param context: the context used for DB operations;
         :param record: a DB node object that contains all fields;
+        :param fields: names of the fields wanted, or None for all fields.
+                       Only the columns needed are read from the record, and
+                       the runtime data is only loaded if a field needs it.
         '''
+        if fields is not None:
+            kwargs = dict((c, getattr(record, c))
+                          for c in cls.db_columns(fields))
+            kwargs.setdefault('project', None)
+            node = cls(kwargs.pop('name', None),
+                       kwargs.pop('profile_id', None),
+                       kwargs.pop('cluster_id', None), **kwargs)
+            if not set(fields).isdisjoint(cls.RUNTIME_FIELDS):
+                node._load_runtime_data(context)
+            return node
+
         kwargs = {
             'id': record.id,
             'physical_id': record.physical_id,
@@ -139,19 +197,21 @@ class Node(object):
                    context=context, **kwargs)
 
     @classmethod
-    def load(cls, context, node_id=None, node=None, show_deleted=False):
+    def load(cls, context, node_id=None, node=None, show_deleted=False,
+             fields=None):
         '''Retrieve a node from database.'''
         if node is None:
             node = db_api.node_get(context, node_id, show_deleted=show_deleted)
             if node is None:
                 raise exception.NodeNotFound(node=node_id)
 
-        return cls._from_db_record(context, node)
+        return cls._from_db_record(context, node, fields=fields)
 
     @classmethod
     def load_all(cls, context, cluster_id=None, show_deleted=False,
                  limit=None, marker=None, sort_keys=None, sort_dir=None,
-                 filters=None, tenant_safe=True):
+                 filters=None, tenant_safe=True, use_slave=False,
+                 fields=None):
         '''Retrieve all nodes of from database.'''
 
         records = db_api.node_get_all(context, cluster_id=cluster_id,
@@ -159,11 +219,19 @@ class Node(object):
                                       limit=limit, marker=marker,
                                       sort_keys=sort_keys, sort_dir=sort_dir,
                                       filters=filters,
-                                      tenant_safe=tenant_safe)
+                                      tenant_safe=tenant_safe,
+                                      use_slave=use_slave,
+                                      columns=cls.db_columns(fields))
 
-        return [cls._from_db_record(context, record) for record in records]
+        return [cls._from_db_record(context, record, fields=fields)
+                for record in records]
 
-    def to_dict(self):
+    def to_dict(self, fields=None):
+        '''Get the dict form of the node.
+
+        :param fields: names of the fields to include, or None for all
+                       fields.
+        '''
         node_dict = {
             'id': self.id,
             'name': self.name,
@@ -181,8 +249,12 @@ class Node(object):
             'status_reason': self.status_reason,
             'data': self.data,
             'tags': self.tags,
-            'profile_name': self.rt['profile'].name,
         }
+        if fields is None or not set(fields).isdisjoint(self.RUNTIME_FIELDS):
+            node_dict['profile_name'] = self.rt['profile'].name
+        if fields is not None:
+            node_dict = dict((k, v) for k, v in node_dict.items()
+                             if k in fields)
         return node_dict
 
     @classmethod
@@ -213,21 +285,28 @@ class Node(object):
         if self.status != self.INIT:
             LOG.error(_LE('Node is in status "%s"'), self.status)
             return False
-        self.set_status(context, self.CREATING, reason='Creation in progress')
-        event_mod.info(context, self, 'create', self.status, self.status_reason)
+        with db_api.transaction(context):
+            self.set_status(context, self.CREATING,
+                            reason='Creation in progress')
+            event_mod.info(context, self, 'create', self.status,
+                           self.status_reason)
+
         physical_id = profile_base.Profile.create_object(context, self)
         if not physical_id:
             return False
 
+        # The index block reservation must be committed on its own: the
+        # allocator keeps handing out indexes from it even if the node
+        # record update below is rolled back.
         if self.cluster_id is not None:
-            self.index = db_api.cluster_get_next_index(context,
-                                                       self.cluster_id)
-
-        self.physical_id = physical_id
-        self.created_time = datetime.datetime.utcnow()
-        self.status = self.ACTIVE
-        self.status_reason = 'Creation succeeded'
-        self.store(context)
+            self.index = index_allocator.allocate(context, self.cluster_id)
+
+        with db_api.transaction(context):
+            self.physical_id = physical_id
+            self.created_time = datetime.datetime.utcnow()
+            self.status = self.ACTIVE
+            self.status_reason = 'Creation succeeded'
+            self.store(context)
         return True
 
     def do_delete(self, context):
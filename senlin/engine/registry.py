@@ -149,6 +149,17 @@ class Registry(object):
 
         return _as_dict(self._registry)
 
+    def signature(self):
+        '''Return a sorted list of the plugins, as 'name:module.class'.'''
+        items = []
+        for name, info in six.iteritems(self._registry):
+            plugin = info.plugin
+            items.append('%s:%s:%s.%s' % (
+                self.registry_name, name,
+                getattr(plugin, '__module__', ''),
+                getattr(plugin, '__name__', plugin)))
+        return sorted(items)
+
     def get_types(self):
         '''Return a list of valid profile types.'''
         return [{'name': name} for name in six.iterkeys(self._registry)]
@@ -18,6 +18,7 @@ from oslo_log import log as logging
 
 from senlin.engine.actions import base as action_mod
 from senlin.engine import dispatcher
+from senlin.engine import metrics
 from senlin.openstack.common import threadgroup
 
 LOG = logging.getLogger(__name__)
@@ -76,6 +77,7 @@ class ThreadGroupManager(object):
             self.threads.pop(action_id)
             check_and_notify_retry()
 
+        metrics.counter('actions.started').inc()
         th = self.start(action_mod.ActionProc, context, action_id, worker_id)
         self.threads[action_id] = th
         th.link(release, context, action_id)
@@ -102,10 +104,9 @@ class ThreadGroupManager(object):
     def add_timer(self, interval, func, *args, **kwargs):
         '''Define a periodic task, to be run in a separate thread, in the
         target threadgroups.
-        Interval is from cfg.CONF.periodic_interval
         '''
 
-        self.group.add_timer(cfg.CONF.periodic_interval, func, *args, **kwargs)
+        self.group.add_timer(interval, func, *args, **kwargs)
 
     def stop_timers(self):
         self.group.stop_timers()
@@ -11,6 +11,7 @@
 # under the License.
 
 import contextlib
+import functools
 import uuid
 
 from oslo_config import cfg
@@ -24,7 +25,9 @@ from senlin.common.i18n import _LI
 from senlin.common.i18n import _LW
 from senlin.common import messaging as rpc_messaging
 from senlin.db import api as db_api
+from senlin.engine import metrics
 from senlin.engine import scheduler
+from senlin.engine import tracing
 
 CONF = cfg.CONF
 
@@ -180,6 +183,22 @@ class BaseLock(object):
             raise
 
 
+def _lock_metrics(target_type):
+    '''Record lock waits as metrics and trace spans, and count failures.'''
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            with tracing.span('lock.%s' % target_type):
+                with metrics.timer('lock.wait.%s' % target_type):
+                    result = func(*args, **kwargs)
+            if not result:
+                metrics.counter('lock.failed.%s' % target_type).inc()
+            return result
+        return wrapped
+    return decorator
+
+
+@_lock_metrics('cluster')
 def cluster_lock_acquire(cluster_id, action_id, scope=CLUSTER_SCOPE,
                          forced=False):
     '''Try to lock the specified cluster
@@ -206,6 +225,7 @@ def cluster_lock_acquire(cluster_id, action_id, scope=CLUSTER_SCOPE,
 
     # Step 3: Last resort is 'forced locking', only needed when retry failed
     if forced:
+        metrics.counter('lock.forced.cluster').inc()
         owners = db_api.cluster_lock_steal(cluster_id, action_id)
         return action_id in owners
 
@@ -220,6 +240,7 @@ def cluster_lock_release(cluster_id, action_id, scope):
     db_api.cluster_lock_release(cluster_id, action_id, scope)
 
 
+@_lock_metrics('node')
 def node_lock_acquire(node_id, action_id, forced=False):
     '''Try to lock the specified node.
 
@@ -245,6 +266,7 @@ def node_lock_acquire(node_id, action_id, forced=False):
 
     # Step 3: Last resort is 'forced locking', only needed when retry failed
     if forced:
+        metrics.counter('lock.forced.node').inc()
         owner = db_api.node_lock_steal(node_id, action_id)
         return action_id == owner
 
@@ -10,6 +10,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
 import functools
 import random
 import six
@@ -17,6 +18,8 @@ import six
 from oslo_config import cfg
 from oslo_log import log as logging
 import oslo_messaging
+from oslo_serialization import jsonutils
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
 
 from senlin.common import consts
@@ -26,6 +29,7 @@ from senlin.common.i18n import _
 from senlin.common.i18n import _LE
 from senlin.common.i18n import _LI
 from senlin.common import messaging as rpc_messaging
+from senlin.common import profiler
 from senlin.common import utils
 from senlin.db import api as db_api
 from senlin.engine.actions import base as action_mod
@@ -33,6 +37,7 @@ from senlin.engine import cluster as cluster_mod
 from senlin.engine import dispatcher
 from senlin.engine import environment
 from senlin.engine import event as event_mod
+from senlin.engine import metrics
 from senlin.engine import node as node_mod
 from senlin.engine import scheduler
 from senlin.engine import senlin_lock
@@ -57,6 +62,7 @@ service_opts = [
 ]
 
 CONF = cfg.CONF
+CONF.import_opt('metrics_dump_interval', 'senlin.common.config')
 CONF.register_opts(service_opts)
 
 
@@ -65,8 +71,10 @@ def request_context(func):
     def wrapped(self, ctx, *args, **kwargs):
         if ctx is not None and not isinstance(ctx, context.RequestContext):
             ctx = context.RequestContext.from_dict(ctx.to_dict())
+        owner = getattr(ctx, 'request_id', None) or func.__name__
         try:
-            return func(self, ctx, *args, **kwargs)
+            with db_api.query_stats(owner):
+                return func(self, ctx, *args, **kwargs)
         except exception.SenlinException:
             raise oslo_messaging.rpc.dispatcher.ExpectedException()
     return wrapped
@@ -83,6 +91,9 @@ class EngineService(service.Service):
     by the RPC caller.
     '''
 
+    # Types of objects whose versions can be checked by object_version()
+    VERSIONED_TYPES = ('cluster', 'node', 'profile', 'policy')
+
     def __init__(self, host, topic, manager=None,
                  periodic_enable=None, periodic_fuzzy_delay=None,
                  periodic_interval_max=None):
@@ -136,6 +147,7 @@ class EngineService(service.Service):
                                       self.periodic_interval_max)
 
         self.dispatcher.start()
+        self._init_metrics()
 
         target = oslo_messaging.Target(version=consts.RPC_API_VERSION,
                                        server=self.host,
@@ -176,16 +188,114 @@ class EngineService(service.Service):
     def get_revision(self, context):
         return cfg.CONF.revision['senlin_engine_revision']
 
+    def _init_metrics(self):
+        '''Register the gauges of this engine and start the metrics dump.'''
+        metrics.gauge('engine.action_threads', lambda: len(self.TG.threads))
+        metrics.gauge('engine.greenthreads',
+                      lambda: len(self.TG.group.threads))
+        metrics.gauge('actions.by_status',
+                      lambda: db_api.action_count_by_status(
+                          context.get_admin_context()))
+        metrics.gauge('db.statements',
+                      lambda: db_api.get_query_counters()['statements'])
+        metrics.gauge('db.time', lambda: db_api.get_query_counters()['time'])
+
+        if CONF.metrics_dump_interval > 0:
+            self.TG.add_timer(CONF.metrics_dump_interval, self._dump_metrics)
+
+    def _dump_metrics(self):
+        LOG.info(_LI('Metrics of engine %(engine)s: %(metrics)s'),
+                 {'engine': self.engine_id,
+                  'metrics': jsonutils.dumps(metrics.snapshot(),
+                                             sort_keys=True)})
+
+    @request_context
+    def profiling_set(self, context, enabled=None, action_types=None):
+        '''Change the profiling settings of this engine at runtime.
+
+        :param enabled: If not None, whether to profile all actions.
+        :param action_types: If not None, the action types to profile.
+        '''
+        if not context.is_admin:
+            raise exception.Forbidden()
+        return profiler.set_runtime(enabled=enabled,
+                                    action_types=action_types)
+
+    @request_context
+    def engine_metrics(self, context):
+        '''Get a snapshot of the metrics of this engine.'''
+        result = metrics.snapshot()
+        result.update({
+            'engine_id': self.engine_id,
+            'host': self.host,
+            'timestamp': timeutils.utcnow().isoformat(),
+        })
+        return result
+
+    @request_context
+    def object_version(self, context, obj_type, identity=None, filters=None,
+                       show_deleted=False, tenant_safe=True,
+                       show_nested=False, cluster_id=None, use_slave=True):
+        '''Get the version of an object or of a listing of objects.
+
+        The version is computed with a single aggregate DB query, without
+        loading the objects, so that the API can answer conditional GET
+        requests cheaply.
+
+        :param obj_type: One of VERSIONED_TYPES.
+        :param identity: ID, name or short ID of an object. If None, the
+                         version of the listing selected by the other
+                         parameters is returned.
+        :param use_slave: Whether the version of a listing can be read from
+                          a slave database. Set it to False to read what
+                          was just written to the primary.
+        :returns: An opaque version string, or None for an empty listing.
+        '''
+        if obj_type not in self.VERSIONED_TYPES:
+            raise exception.InvalidParameter(name='obj_type', value=obj_type)
+
+        if identity is not None:
+            db_obj = getattr(self, '%s_find' % obj_type)(context, identity)
+            func = getattr(db_api, '%s_version' % obj_type)
+            return func(context, db_obj.id)
+
+        show_deleted = utils.parse_bool_param('show_deleted', show_deleted)
+        tenant_safe = utils.parse_bool_param('tenant_safe', tenant_safe)
+        use_slave = utils.parse_bool_param('use_slave', use_slave)
+        if obj_type == 'cluster':
+            return db_api.cluster_version_all(
+                context, filters=filters, tenant_safe=tenant_safe,
+                show_deleted=show_deleted,
+                show_nested=utils.parse_bool_param('show_nested',
+                                                   show_nested),
+                use_slave=use_slave)
+        if obj_type == 'node':
+            if cluster_id is not None:
+                cluster_id = self.cluster_find(context, cluster_id).id
+            return db_api.node_version_all(context, cluster_id=cluster_id,
+                                           show_deleted=show_deleted,
+                                           filters=filters,
+                                           tenant_safe=tenant_safe,
+                                           use_slave=use_slave)
+
+        func = getattr(db_api, '%s_version_all' % obj_type)
+        return func(context, filters=filters, show_deleted=show_deleted)
+
+    @request_context
+    def type_version(self, context):
+        '''Get the version of the profile and policy type catalogs.
+
+        The API caches the type lists and schemas until this changes.
+        '''
+        return environment.global_env().version
+
     @request_context
     def profile_type_list(self, context):
         return environment.global_env().get_profile_types()
 
     @request_context
     def profile_type_schema(self, context, type_name):
-        profile = environment.global_env().get_profile(type_name)
-
-        data = dict((name, dict(schema))
-                    for name, schema in profile.spec_schema.items())
+        data = environment.global_env().get_profile_schema(type_name)
         return {'spec': data}
 
     @request_context
@@ -286,10 +396,7 @@ class EngineService(service.Service):
 
     @request_context
     def policy_type_schema(self, context, type_name):
-        policy_type = environment.global_env().get_policy(type_name)
-
-        data = dict((name, dict(schema))
-                    for name, schema in policy_type.spec_schema.items())
+        data = environment.global_env().get_policy_schema(type_name)
         return {'spec': data}
 
     @request_context
@@ -383,11 +490,13 @@ class EngineService(service.Service):
     @request_context
     def cluster_list(self, context, limit=None, marker=None, sort_keys=None,
                      sort_dir=None, filters=None, tenant_safe=True,
-                     show_deleted=False, show_nested=False):
+                     show_deleted=False, show_nested=False, fields=None,
+                     use_slave=True):
         limit = utils.parse_int_param('limit', limit)
         tenant_safe = utils.parse_bool_param('tenant_safe', tenant_safe)
         show_deleted = utils.parse_bool_param('show_deleted', show_deleted)
         show_nested = utils.parse_bool_param('show_nested', show_nested)
+        use_slave = utils.parse_bool_param('use_slave', use_slave)
         clusters = cluster_mod.Cluster.load_all(context, limit=limit,
                                                 marker=marker,
                                                 sort_keys=sort_keys,
@@ -395,9 +504,11 @@ class EngineService(service.Service):
                                                 filters=filters,
                                                 tenant_safe=tenant_safe,
                                                 show_deleted=show_deleted,
-                                                show_nested=show_nested)
+                                                show_nested=show_nested,
+                                                use_slave=use_slave,
+                                                fields=fields)
 
-        return [cluster.to_dict() for cluster in clusters]
+        return [cluster.to_dict(fields) for cluster in clusters]
 
     def cluster_find(self, context, identity, show_deleted=False):
         '''Find a cluster with the given identity (could be name or ID).'''
@@ -421,10 +532,61 @@ class EngineService(service.Service):
         return cluster
 
     @request_context
-    def cluster_get(self, context, identity):
+    def cluster_get(self, context, identity, fields=None):
         db_cluster = self.cluster_find(context, identity)
-        cluster = cluster_mod.Cluster.load(context, cluster=db_cluster)
-        return cluster.to_dict()
+        cluster = cluster_mod.Cluster.load(context, cluster=db_cluster,
+                                           fields=fields)
+        return cluster.to_dict(fields)
+
+    def _cluster_summaries(self, context, db_clusters, use_slave=True):
+        summaries = collections.OrderedDict()
+        for c in db_clusters:
+            summaries[c.id] = {
+                'id': c.id,
+                'name': c.name,
+                'status': c.status,
+                'desired_size': c.size,
+                'actual_size': 0,
+                'nodes': {},
+                'oldest_node_created_time': None,
+                'newest_node_created_time': None,
+            }
+
+        rows = db_api.node_summary_by_cluster(context, list(summaries),
+                                              use_slave=use_slave)
+        for cluster_id, status, count, oldest, newest in rows:
+            summary = summaries[cluster_id]
+            summary['nodes'][status] = count
+            summary['actual_size'] += count
+            if oldest is not None:
+                current = summary['oldest_node_created_time']
+                if current is None or oldest < current:
+                    summary['oldest_node_created_time'] = oldest
+            if newest is not None:
+                current = summary['newest_node_created_time']
+                if current is None or newest > current:
+                    summary['newest_node_created_time'] = newest
+
+        return list(summaries.values())
+
+    @request_context
+    def cluster_summary(self, context, identity, use_slave=True):
+        use_slave = utils.parse_bool_param('use_slave', use_slave)
+        db_cluster = self.cluster_find(context, identity)
+        return self._cluster_summaries(context, [db_cluster],
+                                       use_slave=use_slave)[0]
+
+    @request_context
+    def cluster_summary_list(self, context, identities=None, use_slave=True):
+        use_slave = utils.parse_bool_param('use_slave', use_slave)
+        if identities:
+            db_clusters = [self.cluster_find(context, identity)
+                           for identity in identities]
+        else:
+            db_clusters = db_api.cluster_get_all(context, tenant_safe=True,
+                                                 use_slave=use_slave)
+        return self._cluster_summaries(context, db_clusters,
+                                       use_slave=use_slave)
 
     @request_context
     def cluster_create(self, context, name, size, profile_id, parent=None,
@@ -707,8 +869,10 @@ class EngineService(service.Service):
     @request_context
     def node_list(self, context, cluster_id=None, show_deleted=False,
                   limit=None, marker=None, sort_keys=None, sort_dir=None,
-                  filters=None, tenant_safe=True):
+                  filters=None, tenant_safe=True, fields=None,
+                  use_slave=True):
         show_deleted = utils.parse_bool_param('show_deleted', show_deleted)
+        use_slave = utils.parse_bool_param('use_slave', use_slave)
         if cluster_id is not None:
             db_cluster = self.cluster_find(context, cluster_id)
             cluster_id = db_cluster.id
@@ -717,13 +881,45 @@ class EngineService(service.Service):
                                        limit=limit, marker=marker,
                                        sort_keys=sort_keys, sort_dir=sort_dir,
                                        filters=filters,
-                                       tenant_safe=tenant_safe)
+                                       tenant_safe=tenant_safe,
+                                       use_slave=use_slave, fields=fields)
 
-        return [node.to_dict() for node in nodes]
+        return [node.to_dict(fields) for node in nodes]
 
-    @request_context
-    def node_create(self, context, name, profile_id, cluster_id=None,
-                    role=None, tags=None):
+    def _node_find_many(self, context, identities):
+        '''Find a batch of nodes by ID, name or short ID.
+
+        The nodes given by ID are fetched with a single query, the others
+        are looked up one at a time with node_find.
+
+        :returns: a list of (identity, DB node, error) tuples in the order of
+                  the identities, where error is None or a dict telling why
+                  the node was not found.
+        '''
+        ids = [i for i in identities if uuidutils.is_uuid_like(i)]
+        found = dict((n.id, n) for n in db_api.node_get_many(context, ids))
+
+        results = []
+        for identity in identities:
+            db_node = found.get(identity)
+            if db_node is None:
+                try:
+                    db_node = self.node_find(context, identity)
+                except exception.SenlinException as ex:
+                    error = {
+                        'type': ex.__class__.__name__,
+                        'message': six.text_type(ex),
+                    }
+                    results.append((identity, None, error))
+                    continue
+            results.append((identity, db_node, None))
+        return results
+
+    def _node_create_check(self, context, profile_id, cluster_id):
+        '''Check the profile and cluster of new nodes.
+
+        :returns: the DB profile and the ID of the cluster, if any.
+        '''
         db_profile = self.profile_find(context, profile_id)
         if cluster_id is not None:
             db_cluster = self.cluster_find(context, cluster_id)
@@ -743,6 +939,14 @@ class EngineService(service.Service):
                             'operation aborted.')
                     raise exception.ProfileTypeNotMatch(message=msg)
 
+        return db_profile, cluster_id
+
+    @request_context
+    def node_create(self, context, name, profile_id, cluster_id=None,
+                    role=None, tags=None):
+        db_profile, cluster_id = self._node_create_check(context, profile_id,
+                                                         cluster_id)
+
         LOG.info(_LI('Creating node %s'), name)
 
         # Create a node instance
@@ -766,10 +970,71 @@ class EngineService(service.Service):
         return result
 
     @request_context
-    def node_get(self, context, identity):
+    def node_get(self, context, identity, fields=None):
         db_node = self.node_find(context, identity)
-        node = node_mod.Node.load(context, node=db_node)
-        return node.to_dict()
+        node = node_mod.Node.load(context, node=db_node, fields=fields)
+        return node.to_dict(fields)
+
+    @request_context
+    def node_create_many(self, context, names, profile_id, cluster_id=None,
+                         role=None, tags=None):
+        '''Create a batch of nodes from one profile.
+
+        The node records and their actions are stored in one transaction,
+        and the actions are sent to the dispatcher in one notification.
+
+        :returns: a list of node dicts, in the order of the names, each with
+                  the ID of its creation action as the 'action' key.
+        '''
+        db_profile, cluster_id = self._node_create_check(context, profile_id,
+                                                         cluster_id)
+
+        LOG.info(_LI('Creating %d nodes'), len(names))
+
+        tags = tags or {}
+        nodes = [node_mod.Node(name, db_profile.id, cluster_id,
+                               context=context, role=role, tags=dict(tags))
+                 for name in names]
+
+        actions = []
+        with db_api.transaction(context):
+            node_mod.Node.store_many(context, nodes)
+            for node in nodes:
+                action = action_mod.Action(context, 'NODE_CREATE',
+                                           name='node_create_%s' % node.id[:8],
+                                           target=node.id,
+                                           cause=action_mod.CAUSE_RPC)
+                action.store(context)
+                actions.append(action)
+
+        if actions:
+            dispatcher.notify(context, self.dispatcher.NEW_ACTION, None,
+                              action_ids=[a.id for a in actions])
+
+        results = []
+        for node, action in zip(nodes, actions):
+            result = node.to_dict()
+            result['action'] = action.id
+            results.append(result)
+        return results
+
+    @request_context
+    def node_get_many(self, context, identities, fields=None):
+        '''Get a batch of nodes by ID, name or short ID.
+
+        :returns: a list with, for each identity in order, a dict with the
+                  'identity' and either the 'node' or an 'error'.
+        '''
+        results = []
+        for identity, db_node, error in self._node_find_many(context,
+                                                             identities):
+            if error is not None:
+                results.append({'identity': identity, 'error': error})
+                continue
+            node = node_mod.Node.load(context, node=db_node, fields=fields)
+            results.append({'identity': identity,
+                            'node': node.to_dict(fields)})
+        return results
 
     @request_context
     def node_update(self, context, identity, name, profile_id=None, role=None,
@@ -810,6 +1075,41 @@ class EngineService(service.Service):
 
         return action.to_dict()
 
+    @request_context
+    def node_delete_many(self, context, identities):
+        '''Delete a batch of nodes by ID, name or short ID.
+
+        The actions are stored in one transaction and sent to the dispatcher
+        in one notification.
+
+        :returns: a list with, for each identity in order, a dict with the
+                  'identity' and either the deletion 'action' or an 'error'.
+        '''
+        found = self._node_find_many(context, identities)
+        LOG.info(_LI('Deleting %d nodes'), len(found))
+
+        results = []
+        actions = []
+        with db_api.transaction(context):
+            for identity, db_node, error in found:
+                if error is not None:
+                    results.append({'identity': identity, 'error': error})
+                    continue
+                action = action_mod.Action(
+                    context, 'NODE_DELETE',
+                    name='node_delete_%s' % db_node.id[:8],
+                    target=db_node.id, cause=action_mod.CAUSE_RPC)
+                action.store(context)
+                actions.append(action)
+                results.append({'identity': identity,
+                                'action': action.to_dict()})
+
+        if actions:
+            dispatcher.notify(context, self.dispatcher.NEW_ACTION, None,
+                              action_ids=[a.id for a in actions])
+
+        return results
+
     @request_context
     def node_join(self, context, identity, cluster_id):
         db_node = self.node_find(context, identity)
@@ -985,15 +1285,18 @@ class EngineService(service.Service):
 
     @request_context
     def action_list(self, context, filters=None, limit=None, marker=None,
-                    sort_keys=None, sort_dir=None, show_deleted=False):
+                    sort_keys=None, sort_dir=None, show_deleted=False,
+                    use_slave=True):
 
         limit = utils.parse_int_param('limit', limit)
         show_deleted = utils.parse_bool_param('show_deleted', show_deleted)
+        use_slave = utils.parse_bool_param('use_slave', use_slave)
         all_actions = action_mod.Action.load_all(context, filters=filters,
                                                  limit=limit, marker=marker,
                                                  sort_keys=sort_keys,
                                                  sort_dir=sort_dir,
-                                                 show_deleted=show_deleted)
+                                                 show_deleted=show_deleted,
+                                                 use_slave=use_slave)
 
         results = []
         for action in all_actions:
@@ -1041,13 +1344,15 @@ class EngineService(service.Service):
     @request_context
     def event_list(self, context, filters=None, limit=None, marker=None,
                    sort_keys=None, sort_dir=None, tenant_safe=True,
-                   show_deleted=False):
+                   show_deleted=False, use_slave=True):
+        use_slave = utils.parse_bool_param('use_slave', use_slave)
         all_actions = event_mod.Event.load_all(context, filters=filters,
                                                limit=limit, marker=marker,
                                                sort_keys=sort_keys,
                                                sort_dir=sort_dir,
                                                tenant_safe=tenant_safe,
-                                               show_deleted=show_deleted)
+                                               show_deleted=show_deleted,
+                                               use_slave=use_slave)
 
         results = [action.to_dict() for action in all_actions]
         return results
@@ -0,0 +1,199 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+'''
+Lightweight tracing of action execution.
+
+Each action run by an engine is a trace span identified by the action ID.
+Phases of the action (acquiring, loading, locking, policy checks, ...) are
+child spans of it. A derived action has the action that created it as its
+parent, and all actions of one operation share the trace ID of the root
+action, so the spans of the whole operation can be put back together.
+
+Finished spans are stored in the action outputs and, when 'trace_file' is
+set, appended to that file in the Trace Event Format understood by
+chrome://tracing and similar viewers.
+'''
+
+import contextlib
+import os
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_serialization import jsonutils
+
+from senlin.common.i18n import _LW
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+CONF.import_opt('action_tracing', 'senlin.common.config')
+CONF.import_opt('trace_file', 'senlin.common.config')
+
+_local = threading.local()
+_file_lock = threading.Lock()
+
+
+class Span(object):
+    '''A timed phase of a trace.'''
+
+    def __init__(self, name, span_id, parent_id=None, **attrs):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attrs = attrs
+        self.start = time.time()
+        self.end = None
+
+    @property
+    def duration(self):
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+    def finish(self):
+        if self.end is None:
+            self.end = time.time()
+
+    def to_dict(self):
+        result = {
+            'name': self.name,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start': self.start,
+            'duration': self.duration,
+        }
+        if self.attrs:
+            result['attrs'] = self.attrs
+        return result
+
+
+class Trace(object):
+    '''Spans recorded for one action.'''
+
+    def __init__(self, name, span_id):
+        self.trace_id = span_id
+        self.root = Span(name, span_id)
+        self.spans = []
+        self._stack = [self.root]
+        self._next = 0
+
+    def link(self, trace_id, parent_id):
+        '''Attach this trace to the span of the action that caused it.'''
+        self.trace_id = trace_id
+        self.root.parent_id = parent_id
+
+    def child(self, name, **attrs):
+        self._next += 1
+        span = Span(name, '%s.%d' % (self.root.span_id, self._next),
+                    self._stack[-1].span_id, **attrs)
+        self._stack.append(span)
+        return span
+
+    def finish_child(self, span):
+        span.finish()
+        self._stack.remove(span)
+        self.spans.append(span)
+
+    def to_dict(self):
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.root.span_id,
+            'parent_id': self.root.parent_id,
+            'duration': self.root.duration,
+            'spans': [s.to_dict() for s in self.spans],
+        }
+
+
+def current():
+    '''Get the trace of the current thread, if any.'''
+    return getattr(_local, 'trace', None)
+
+
+@contextlib.contextmanager
+def trace(name, span_id):
+    '''Start a trace in the current thread.
+
+    Yields None when action tracing is disabled.
+    '''
+    if not CONF.action_tracing:
+        yield None
+        return
+
+    tr = Trace(name, span_id)
+    previous = current()
+    _local.trace = tr
+    try:
+        yield tr
+    finally:
+        tr.root.finish()
+        _local.trace = previous
+        if CONF.trace_file:
+            export(tr, CONF.trace_file)
+
+
+@contextlib.contextmanager
+def span(name, **attrs):
+    '''Record a child span of the current span, if a trace is active.'''
+    tr = current()
+    if tr is None:
+        yield None
+        return
+
+    sp = tr.child(name, **attrs)
+    try:
+        yield sp
+    finally:
+        tr.finish_child(sp)
+
+
+def _event(tr, sp, tid):
+    args = {'trace_id': tr.trace_id, 'span_id': sp.span_id,
+            'parent_id': sp.parent_id}
+    args.update(sp.attrs)
+    return {
+        'name': sp.name,
+        'cat': 'action',
+        'ph': 'X',
+        'ts': int(sp.start * 1000000),
+        'dur': int((sp.duration or 0) * 1000000),
+        'pid': os.getpid(),
+        'tid': tid,
+        'args': args,
+    }
+
+
+def export(tr, path):
+    '''Append the spans of a trace to a Trace Event Format file.
+
+    The file is a JSON array left open at the end, which trace viewers
+    accept, so that events can be appended without rewriting the file.
+    '''
+    # Spans of an action are shown on one row of the viewer
+    tid = hash(tr.root.span_id) & 0x7fffffff
+    events = [_event(tr, tr.root, tid)]
+    events.extend(_event(tr, sp, tid) for sp in tr.spans)
+    data = ''.join(jsonutils.dumps(e) + ',\n' for e in events)
+
+    try:
+        with _file_lock:
+            with open(path, 'a') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    f.write('[\n')
+                f.write(data)
+    except (IOError, OSError) as ex:
+        LOG.warning(_LW('Failed writing trace of %(span)s to %(path)s: '
+                        '%(ex)s'),
+                    {'span': tr.root.span_id, 'path': path, 'ex': ex})
@@ -106,8 +106,8 @@ class ScalingPolicy(base.Policy):
         # not specified
 
     def pre_op(self, cluster_id, action, policy_data):
-        nodes = db_api.node_get_all_by_cluster(action.context, cluster_id)
-        current_size = len(nodes)
+        current_size = db_api.node_count_by_cluster(action.context,
+                                                    cluster_id)
 
         if self.adjustment_type == self.EXACT_CAPACITY:
             count = self.adjustment_number - current_size
@@ -0,0 +1,129 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import six
+
+from oslo_log import log as logging
+
+from senlin.common import constraints
+from senlin.common import exception
+from senlin.common.i18n import _
+from senlin.common.i18n import _LE
+from senlin.common import schema
+from senlin.drivers import fake as fakecloud
+from senlin.profiles import base
+
+LOG = logging.getLogger(__name__)
+
+
+class FakeServerProfile(base.Profile):
+    '''Profile for a server of the in-memory fake cloud.
+
+    It is meant for testing and benchmarking the engine without a cloud,
+    so it is not registered as a profile type by default.
+    '''
+
+    KEYS = (
+        METADATA, LATENCY, FAILURE_RATE,
+    ) = (
+        'metadata', 'latency', 'failure_rate',
+    )
+
+    LATENCY_KEYS = (
+        DISTRIBUTION, MEAN, MAX,
+    ) = (
+        'distribution', 'mean', 'max',
+    )
+
+    spec_schema = {
+        METADATA: schema.Map(
+            _('Metadata of the server.'),
+            default={},
+        ),
+        LATENCY: schema.Map(
+            _('Latency of the calls to the fake cloud.'),
+            schema={
+                DISTRIBUTION: schema.String(
+                    _('Distribution of the latency.'),
+                    default=fakecloud.CONSTANT,
+                    constraints=[
+                        constraints.AllowedValues(
+                            fakecloud.LATENCY_DISTRIBUTIONS),
+                    ],
+                ),
+                MEAN: schema.Number(
+                    _('Mean latency in seconds.'),
+                    default=0,
+                ),
+                MAX: schema.Number(
+                    _('Maximum latency in seconds.'),
+                ),
+            },
+            default={},
+        ),
+        FAILURE_RATE: schema.Number(
+            _('Probability, from 0 to 1, of a call to the fake cloud to '
+              'fail.'),
+            default=0,
+        ),
+    }
+
+    def __init__(self, type_name, name, **kwargs):
+        super(FakeServerProfile, self).__init__(type_name, name, **kwargs)
+
+        self.fc = None
+
+    def cloud(self):
+        if self.fc is None:
+            self.fc = fakecloud.FakeCloudClient(
+                self.context, latency=self.spec_data[self.LATENCY],
+                failure_rate=self.spec_data[self.FAILURE_RATE])
+        return self.fc
+
+    def do_create(self, obj):
+        try:
+            server = self.cloud().server_create(
+                obj.name, metadata=self.spec_data[self.METADATA])
+        except exception.Error as ex:
+            LOG.error(_LE('Failed creating fake server: %s'),
+                      six.text_type(ex))
+            return None
+        return server.id
+
+    def do_delete(self, obj):
+        try:
+            self.cloud().server_delete(obj.physical_id)
+        except exception.Error as ex:
+            LOG.error(_LE('Failed deleting fake server: %s'),
+                      six.text_type(ex))
+            return False
+        return True
+
+    def do_update(self, obj, new_profile):
+        if not obj.physical_id:
+            return True
+        try:
+            self.cloud().server_update(
+                obj.physical_id,
+                metadata=new_profile.spec_data[new_profile.METADATA])
+        except exception.Error as ex:
+            LOG.error(_LE('Failed updating fake server: %s'),
+                      six.text_type(ex))
+            return False
+        return True
+
+    def do_check(self, obj):
+        try:
+            self.cloud().server_get(obj.physical_id)
+        except exception.Error:
+            return False
+        return True
@@ -41,10 +41,15 @@ class EngineClient(object):
     def make_msg(method, **kwargs):
         return method, kwargs
 
-    def call(self, ctxt, msg, version=None):
+    def call(self, ctxt, msg, version=None, server=None):
         method, kwargs = msg
+        options = {}
         if version is not None:
-            client = self._client.prepare(version=version)
+            options['version'] = version
+        if server is not None:
+            options['server'] = server
+        if options:
+            client = self._client.prepare(**options)
         else:
             client = self._client
         return client.call(ctxt, method, **kwargs)
@@ -75,6 +80,14 @@ class EngineClient(object):
         if self.local_error_name(error) != name:
             raise error
 
+    def object_version(self, ctxt, obj_type, identity=None, **params):
+        return self.call(ctxt, self.make_msg('object_version',
+                                             obj_type=obj_type,
+                                             identity=identity, **params))
+
+    def type_version(self, ctxt):
+        return self.call(ctxt, self.make_msg('type_version'))
+
     def profile_type_list(self, ctxt):
         return self.call(ctxt, self.make_msg('profile_type_list'))
 
@@ -163,7 +176,8 @@ class EngineClient(object):
 
     def cluster_list(self, ctxt, limit=None, marker=None, sort_keys=None,
                      sort_dir=None, filters=None, tenant_safe=True,
-                     show_deleted=False, show_nested=False):
+                     show_deleted=False, show_nested=False, fields=None,
+                     use_slave=True):
         # We keep the tenant_safe param here for the moment
         return self.call(ctxt,
                          self.make_msg('cluster_list',
@@ -172,11 +186,24 @@ class EngineClient(object):
                                        filters=filters,
                                        tenant_safe=tenant_safe,
                                        show_deleted=show_deleted,
-                                       show_nested=show_nested))
+                                       show_nested=show_nested,
+                                       fields=fields, use_slave=use_slave))
+
+    def cluster_get(self, ctxt, identity, fields=None):
+        return self.call(ctxt,
+                         self.make_msg('cluster_get', identity=identity,
+                                       fields=fields))
+
+    def cluster_summary(self, ctxt, identity, use_slave=True):
+        return self.call(ctxt,
+                         self.make_msg('cluster_summary', identity=identity,
+                                       use_slave=use_slave))
 
-    def cluster_get(self, ctxt, identity):
+    def cluster_summary_list(self, ctxt, identities=None, use_slave=True):
         return self.call(ctxt,
-                         self.make_msg('cluster_get', identity=identity))
+                         self.make_msg('cluster_summary_list',
+                                       identities=identities,
+                                       use_slave=use_slave))
 
     def cluster_create(self, ctxt, name, size, profile_id, parent=None,
                        tags=None, timeout=0):
@@ -225,7 +252,8 @@ class EngineClient(object):
     def node_list(self, ctxt, cluster_id=None, show_deleted=False,
                   limit=None, marker=None,
                   sort_keys=None, sort_dir=None,
-                  filters=None, tenant_safe=True):
+                  filters=None, tenant_safe=True, fields=None,
+                  use_slave=True):
         # We keep the tenant_safe param here for the moment
         return self.call(ctxt,
                          self.make_msg('node_list', cluster_id=cluster_id,
@@ -233,7 +261,8 @@ class EngineClient(object):
                                        limit=limit, marker=marker,
                                        sort_keys=sort_keys, sort_dir=sort_dir,
                                        filters=filters,
-                                       tenant_safe=tenant_safe))
+                                       tenant_safe=tenant_safe,
+                                       fields=fields, use_slave=use_slave))
 
     def node_create(self, ctxt, name, cluster_id, profile_id, role, tags):
         return self.call(ctxt,
@@ -242,9 +271,23 @@ class EngineClient(object):
                                        cluster_id=cluster_id,
                                        role=role, tags=tags))
 
-    def node_get(self, ctxt, identity):
+    def node_get(self, ctxt, identity, fields=None):
+        return self.call(ctxt,
+                         self.make_msg('node_get', identity=identity,
+                                       fields=fields))
+
+    def node_create_many(self, ctxt, names, profile_id, cluster_id=None,
+                         role=None, tags=None):
+        return self.call(ctxt,
+                         self.make_msg('node_create_many', names=names,
+                                       profile_id=profile_id,
+                                       cluster_id=cluster_id,
+                                       role=role, tags=tags))
+
+    def node_get_many(self, ctxt, identities, fields=None):
         return self.call(ctxt,
-                         self.make_msg('node_get', identity=identity))
+                         self.make_msg('node_get_many', identities=identities,
+                                       fields=fields))
 
     def node_update(self, ctxt, identity, name, profile_id, role, tags):
         return self.call(ctxt,
@@ -267,13 +310,20 @@ class EngineClient(object):
                           self.make_msg('node_delete', identity=identity,
                                         force=force))
 
+    def node_delete_many(self, ctxt, identities):
+        return self.call(ctxt,
+                         self.make_msg('node_delete_many',
+                                       identities=identities))
+
     def action_list(self, ctxt, filters=None, limit=None, marker=None,
-                    sort_keys=None, sort_dir=None, show_deleted=False):
+                    sort_keys=None, sort_dir=None, show_deleted=False,
+                    use_slave=True):
         return self.call(ctxt,
                          self.make_msg('action_list', filters=filters,
                                        limit=limit, marker=marker,
                                        sort_keys=sort_keys, sort_dir=sort_dir,
-                                       show_deleted=show_deleted))
+                                       show_deleted=show_deleted,
+                                       use_slave=use_slave))
 
     def cluster_policy_list(self, ctxt, cluster_id, filters=None,
                             limit=None, marker=None,
@@ -327,13 +377,14 @@ class EngineClient(object):
 
     def event_list(self, ctxt, filters=None, limit=None, marker=None,
                    sort_keys=None, sort_dir=None, tenant_safe=True,
-                   show_deleted=False):
+                   show_deleted=False, use_slave=True):
         return self.call(ctxt,
                          self.make_msg('event_list', filters=filters,
                                        limit=limit, marker=marker,
                                        sort_keys=sort_keys, sort_dir=sort_dir,
                                        tenant_safe=tenant_safe,
-                                       show_deleted=show_deleted))
+                                       show_deleted=show_deleted,
+                                       use_slave=use_slave))
 
     def event_get(self, ctxt, identity):
         return self.call(ctxt,
@@ -341,3 +392,14 @@ class EngineClient(object):
 
     def get_revision(self, ctxt):
         return self.call(ctxt, self.make_msg('get_revision'))
+
+    def engine_metrics(self, ctxt, server=None):
+        return self.call(ctxt, self.make_msg('engine_metrics'),
+                         server=server)
+
+    def profiling_set(self, ctxt, enabled=None, action_types=None,
+                      server=None):
+        return self.call(ctxt,
+                         self.make_msg('profiling_set', enabled=enabled,
+                                       action_types=action_types),
+                         server=server)
@@ -0,0 +1,246 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import eventlet
+import mock
+from webob import exc
+
+from oslo_config import cfg
+
+from senlin.api.openstack.v1 import actions
+from senlin.common import consts
+from senlin.common import exception as senlin_exc
+from senlin.common import messaging
+from senlin.common import policy
+from senlin.rpc import client as rpc_client
+from senlin.tests.apiv1 import shared
+from senlin.tests.common import base
+
+
+class ActionWaiterTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(ActionWaiterTest, self).setUp()
+        self.patchobject(actions, '_start_listener')
+        self.endpoint = actions.ActionDoneEndpoint()
+
+    def _action(self, action_id, status):
+        return {'id': action_id, 'status': status}
+
+    def test_wait_already_done(self):
+        get_action = mock.Mock(return_value=self._action('A1', 'CANCELLED'))
+        waiter = actions.ActionWaiter(get_action, ['A1'])
+
+        res = waiter.wait(10)
+
+        self.assertEqual([self._action('A1', 'CANCELLED')], res)
+        get_action.assert_called_once_with('A1')
+        self.assertEqual({}, dict(actions._waiters))
+
+    def test_wait_notified(self):
+        ctx = mock.Mock()
+        get_action = mock.Mock(side_effect=[
+            self._action('A1', 'RUNNING'),
+            self._action('A2', 'SUCCEEDED'),
+            self._action('A1', 'RUNNING'),
+            self._action('A1', 'FAILED'),
+        ])
+        waiter = actions.ActionWaiter(get_action, ['action1', 'A2'])
+        eventlet.spawn_after(0, self.endpoint.action_done, ctx, 'A1',
+                             'FAILED')
+
+        res = waiter.wait(10)
+
+        self.assertEqual([self._action('A1', 'FAILED'),
+                          self._action('A2', 'SUCCEEDED')], res)
+        # Read when the wait starts and ends, the others by ID
+        self.assertEqual([mock.call('action1'), mock.call('A2'),
+                          mock.call('A1'), mock.call('A1')],
+                         get_action.call_args_list)
+        self.assertTrue(waiter.event.ready())
+        self.assertEqual({}, dict(actions._waiters))
+
+    def test_wait_done_before_registered(self):
+        get_action = mock.Mock(side_effect=[
+            self._action('A1', 'RUNNING'),
+            self._action('A1', 'SUCCEEDED'),
+            self._action('A1', 'SUCCEEDED'),
+        ])
+        waiter = actions.ActionWaiter(get_action, ['A1'])
+
+        res = waiter.wait(10)
+
+        self.assertEqual([self._action('A1', 'SUCCEEDED')], res)
+        self.assertTrue(waiter.event.ready())
+        self.assertEqual(3, get_action.call_count)
+
+    def test_wait_timeout(self):
+        get_action = mock.Mock(return_value=self._action('A1', 'RUNNING'))
+        waiter = actions.ActionWaiter(get_action, ['A1'])
+
+        res = waiter.wait(0.01)
+
+        self.assertEqual([self._action('A1', 'RUNNING')], res)
+        # Read once more at the deadline
+        self.assertEqual(3, get_action.call_count)
+        self.assertFalse(waiter.event.ready())
+        self.assertEqual({}, dict(actions._waiters))
+
+    def test_done_partial(self):
+        waiter = actions.ActionWaiter(mock.Mock(), ['A1', 'A2'])
+        waiter.pending = set(['A1', 'A2'])
+        actions._waiters['A1'].add(waiter)
+        self.addCleanup(actions._waiters.clear)
+
+        self.endpoint.action_done(mock.Mock(), 'A1', 'SUCCEEDED')
+        self.assertEqual(set(['A2']), waiter.pending)
+        self.assertFalse(waiter.event.ready())
+
+        # Notifications of other actions are ignored
+        self.endpoint.action_done(mock.Mock(), 'A3', 'SUCCEEDED')
+        self.assertFalse(waiter.event.ready())
+
+        waiter.done('A2')
+        self.assertTrue(waiter.event.ready())
+
+
+class StartListenerTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(StartListenerTest, self).setUp()
+        self.patchobject(actions, '_listener', new=None)
+
+    @mock.patch.object(messaging, 'get_rpc_server')
+    def test_start_once(self, mock_server):
+        actions._start_listener()
+        actions._start_listener()
+
+        self.assertEqual(1, mock_server.call_count)
+        target, endpoint = mock_server.call_args[0]
+        self.assertEqual(consts.ACTION_DONE_TOPIC, target.topic)
+        self.assertIsInstance(endpoint, actions.ActionDoneEndpoint)
+        mock_server.return_value.start.assert_called_once_with()
+        self.assertIs(mock_server.return_value, actions._listener)
+
+    @mock.patch.object(messaging, 'get_rpc_server')
+    def test_start_error(self, mock_server):
+        mock_server.return_value.start.side_effect = ValueError('boom')
+
+        actions._start_listener()
+
+        self.assertIsNone(actions._listener)
+        self.assertIn('Failed listening for completed actions',
+                      self.LOG.output)
+
+
+@mock.patch.object(policy.Enforcer, 'enforce')
+class ActionControllerTest(shared.ControllerTest, base.SenlinTestCase):
+
+    def setUp(self):
+        super(ActionControllerTest, self).setUp()
+
+        class DummyConfig(object):
+            bind_port = 8778
+
+        cfgopts = DummyConfig()
+        self.controller = actions.ActionController(options=cfgopts)
+        self.patchobject(actions, '_start_listener')
+
+    def test_action_get(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'get', True)
+        req = self._get('/actions/A1')
+
+        engine_resp = {'id': 'A1', 'status': 'RUNNING'}
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     return_value=engine_resp)
+        mock_wait = self.patchobject(actions.ActionWaiter, 'wait')
+
+        res = self.controller.get(req, tenant_id=self.tenant, action_id='A1')
+
+        self.assertEqual(engine_resp, res)
+        mock_call.assert_called_once_with(
+            req.context, ('action_get', {'identity': 'A1'}))
+        self.assertFalse(mock_wait.called)
+
+    def test_action_get_wait(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'get', True)
+        req = self._get('/actions/A1', params={'wait': 30})
+
+        engine_resp = {'id': 'A1', 'status': 'SUCCEEDED'}
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     return_value=engine_resp)
+
+        res = self.controller.get(req, tenant_id=self.tenant, action_id='A1')
+
+        self.assertEqual(engine_resp, res)
+        # The action is read by the API, not waited for by the engine
+        mock_call.assert_called_once_with(
+            req.context, ('action_get', {'identity': 'A1'}))
+
+    def test_action_get_wait_capped(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'get', True)
+        cfg.CONF.set_override('max_action_wait', 20, group='senlin_api')
+        req = self._get('/actions/A1', params={'wait': 3600})
+
+        mock_wait = self.patchobject(actions.ActionWaiter, 'wait',
+                                     return_value=[{'id': 'A1'}])
+
+        res = self.controller.get(req, tenant_id=self.tenant, action_id='A1')
+
+        self.assertEqual({'id': 'A1'}, res)
+        mock_wait.assert_called_once_with(20)
+
+    def test_action_get_wait_invalid(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'get', True)
+        req = self._get('/actions/A1', params={'wait': 'soon'})
+
+        self.assertRaises(senlin_exc.InvalidParameter, self.controller.get,
+                          req, tenant_id=self.tenant, action_id='A1')
+
+    def test_action_wait(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'wait', True)
+        req = self._get('/actions/wait')
+        req.environ['QUERY_STRING'] = 'action_id=A1&action_id=A2&wait=10'
+
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call')
+        mock_call.side_effect = [{'id': 'A1', 'status': 'SUCCEEDED'},
+                                 {'id': 'A2', 'status': 'FAILED'}]
+
+        res = self.controller.wait(req, tenant_id=self.tenant)
+
+        self.assertEqual({'actions': [{'id': 'A1', 'status': 'SUCCEEDED'},
+                                      {'id': 'A2', 'status': 'FAILED'}]},
+                         res)
+        self.assertEqual(
+            [mock.call(req.context, ('action_get', {'identity': 'A1'})),
+             mock.call(req.context, ('action_get', {'identity': 'A2'}))],
+            mock_call.call_args_list)
+
+    def test_action_wait_no_wait(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'wait', True)
+        req = self._get('/actions/wait', params={'action_id': 'A1'})
+
+        mock_wait = self.patchobject(actions.ActionWaiter, 'wait',
+                                     return_value=[{'id': 'A1'}])
+
+        res = self.controller.wait(req, tenant_id=self.tenant)
+
+        self.assertEqual({'actions': [{'id': 'A1'}]}, res)
+        mock_wait.assert_called_once_with(0)
+
+    def test_action_wait_no_action(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'wait', True)
+        req = self._get('/actions/wait', params={'wait': 10})
+
+        ex = self.assertRaises(exc.HTTPBadRequest, self.controller.wait,
+                               req, tenant_id=self.tenant)
+        self.assertIn('No action specified', str(ex))
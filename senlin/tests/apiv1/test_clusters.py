@@ -23,6 +23,7 @@ from senlin.api.openstack.v1 import clusters
 from senlin.common import exception as senlin_exc
 from senlin.common.i18n import _
 from senlin.common import policy
+from senlin.common import wsgi
 from senlin.rpc import client as rpc_client
 from senlin.tests.apiv1 import shared
 from senlin.tests.common import base
@@ -105,7 +106,8 @@ class ClusterControllerTest(shared.ControllerTest, base.SenlinTestCase):
 
         default_args = {'limit': None, 'sort_keys': None, 'marker': None,
                         'sort_dir': None, 'filters': None, 'tenant_safe': True,
-                        'show_deleted': False, 'show_nested': False}
+                        'show_deleted': False, 'show_nested': False,
+                        'fields': None, 'use_slave': True}
         mock_call.assert_called_once_with(
             req.context, ('cluster_list', default_args))
 
@@ -126,7 +128,7 @@ class ClusterControllerTest(shared.ControllerTest, base.SenlinTestCase):
 
         rpc_call_args, w = mock_call.call_args
         engine_args = rpc_call_args[1][1]
-        self.assertEqual(8, len(engine_args))
+        self.assertEqual(10, len(engine_args))
         self.assertIn('limit', engine_args)
         self.assertIn('sort_keys', engine_args)
         self.assertIn('marker', engine_args)
@@ -135,6 +137,25 @@ class ClusterControllerTest(shared.ControllerTest, base.SenlinTestCase):
         self.assertIn('tenant_safe', engine_args)
         self.assertNotIn('balrog', engine_args)
 
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_index_with_fields(self, mock_call, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/clusters', params={'fields': 'name,status'})
+        mock_call.return_value = []
+
+        self.controller.index(req, tenant_id=self.tenant)
+
+        rpc_call_args, w = mock_call.call_args
+        engine_args = rpc_call_args[1][1]
+        self.assertEqual(['id', 'name', 'status'], engine_args['fields'])
+
+    def test_index_invalid_fields(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/clusters', params={'fields': 'name,secret'})
+
+        self.assertRaises(webob.exc.HTTPBadRequest, self.controller.index,
+                          req, tenant_id=self.tenant)
+
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_index_whitelist_filter_params(self, mock_call, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'index', True)
@@ -175,6 +196,7 @@ class ClusterControllerTest(shared.ControllerTest, base.SenlinTestCase):
         rpc_client.cluster_list.assert_called_once_with(mock.ANY,
                                                         filters=mock.ANY,
                                                         tenant_safe=True,
+                                                        fields=None,
                                                         show_deleted=False)
 
     def test_index_show_deleted_true(self, mock_enforce):
@@ -187,6 +209,7 @@ class ClusterControllerTest(shared.ControllerTest, base.SenlinTestCase):
         rpc_client.cluster_list.assert_called_once_with(mock.ANY,
                                                         filters=mock.ANY,
                                                         tenant_safe=True,
+                                                        fields=None,
                                                         show_deleted=True)
 
     def test_index_show_nested_false(self, mock_enforce):
@@ -199,6 +222,7 @@ class ClusterControllerTest(shared.ControllerTest, base.SenlinTestCase):
         rpc_client.cluster_list.assert_called_once_with(mock.ANY,
                                                         filters=mock.ANY,
                                                         tenant_safe=True,
+                                                        fields=None,
                                                         show_nested=False)
 
     def test_index_show_nested_true(self, mock_enforce):
@@ -211,8 +235,34 @@ class ClusterControllerTest(shared.ControllerTest, base.SenlinTestCase):
         rpc_client.cluster_list.assert_called_once_with(mock.ANY,
                                                         filters=mock.ANY,
                                                         tenant_safe=True,
+                                                        fields=None,
                                                         show_nested=True)
 
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_index_consistent(self, mock_call, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/clusters', params={'consistent': 'true'})
+        mock_call.return_value = []
+
+        self.controller.index(req, tenant_id=self.tenant)
+
+        rpc_call_args, kwargs = mock_call.call_args
+        engine_args = rpc_call_args[1][1]
+        self.assertFalse(engine_args['use_slave'])
+        self.assertNotIn('consistent', engine_args)
+
+    @mock.patch.object(rpc_client.EngineClient, 'call')
+    def test_index_consistent_invalid(self, mock_call, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True)
+        req = self._get('/clusters', params={'consistent': 'yes'})
+
+        ex = self.assertRaises(senlin_exc.InvalidParameter,
+                               self.controller.index, req,
+                               tenant_id=self.tenant)
+        self.assertIn("Invalid value 'yes' specified for 'consistent'",
+                      six.text_type(ex))
+        self.assertFalse(mock_call.called)
+
     @mock.patch.object(rpc_client.EngineClient, 'call')
     def test_index_remote_attribute_error(self, mock_call, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'index', True)
@@ -432,11 +482,35 @@ class ClusterControllerTest(shared.ControllerTest, base.SenlinTestCase):
                                        cluster_id=cid)
 
         mock_call.assert_called_once_with(
-            req.context, ('cluster_get', {'identity': cid}))
+            req.context, ('cluster_get', {'identity': cid, 'fields': None}))
 
         expected = {'cluster': engine_resp}
         self.assertEqual(expected, response)
 
+    def test_cluster_get_not_modified(self, mock_enforce):
+        cfg.CONF.set_override('enable_etags', True, group='senlin_api')
+        self._mock_enforce_setup(mock_enforce, 'get', True,
+                                 expected_request_count=2)
+        cid = 'aaaa-bbbb-cccc'
+        req = self._get('/clusters/%(cluster_id)s' % {'cluster_id': cid})
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     side_effect=['v1', {'id': cid}])
+
+        response = self.controller.get(req, tenant_id=self.tenant,
+                                       cluster_id=cid)
+        self.assertEqual({'cluster': {'id': cid}}, response)
+        etag = req.environ[wsgi.ETAG_ENVIRON]
+
+        req = self._get('/clusters/%(cluster_id)s' % {'cluster_id': cid})
+        req.headers['If-None-Match'] = 'W/"%s"' % etag
+        mock_call.reset_mock()
+        mock_call.side_effect = ['v1']
+        self.assertRaises(exc.HTTPNotModified, self.controller.get,
+                          req, tenant_id=self.tenant, cluster_id=cid)
+        mock_call.assert_called_once_with(
+            req.context, ('object_version', {'obj_type': 'cluster',
+                                             'identity': cid}))
+
     def test_cluster_get_notfound(self, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'get', True)
         cid = 'non-existent-cluster'
@@ -467,6 +541,105 @@ class ClusterControllerTest(shared.ControllerTest, base.SenlinTestCase):
         self.assertEqual(403, resp.status_int)
         self.assertIn('403 Forbidden', six.text_type(resp))
 
+    def test_cluster_summary(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'summary', True)
+        cid = 'aaaa-bbbb-cccc'
+        req = self._get('/clusters/%(cluster_id)s/summary' % {
+            'cluster_id': cid})
+
+        engine_resp = {
+            u'id': u'aaaa-bbbb-cccc',
+            u'name': u'test_cluster',
+            u'status': u'ACTIVE',
+            u'desired_size': 3,
+            u'actual_size': 3,
+            u'nodes': {u'ACTIVE': 2, u'ERROR': 1},
+            u'oldest_node_created_time': u'2015-01-09T09:16:45Z',
+            u'newest_node_created_time': u'2015-01-09T09:18:45Z',
+        }
+
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     return_value=engine_resp)
+        response = self.controller.summary(req, tenant_id=self.tenant,
+                                           cluster_id=cid)
+
+        mock_call.assert_called_once_with(
+            req.context,
+            ('cluster_summary', {'identity': cid, 'use_slave': True}))
+        self.assertEqual({'summary': engine_resp}, response)
+
+    def test_cluster_summary_notfound(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'summary', True)
+        cid = 'non-existent-cluster'
+        req = self._get('/clusters/%(cluster_id)s/summary' % {
+            'cluster_id': cid})
+
+        error = senlin_exc.ClusterNotFound(cluster=cid)
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call')
+        mock_call.side_effect = shared.to_remote_error(error)
+
+        resp = shared.request_with_middleware(fault.FaultWrapper,
+                                              self.controller.summary,
+                                              req, tenant_id=self.tenant,
+                                              cluster_id=cid)
+
+        self.assertEqual(404, resp.json['code'])
+        self.assertEqual('ClusterNotFound', resp.json['error']['type'])
+
+    def test_cluster_summary_index(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'summary_index', True)
+        req = self._get('/clusters/summary', params={'cluster_id': 'c1'})
+
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     return_value=[])
+        response = self.controller.summary_index(req, tenant_id=self.tenant)
+
+        mock_call.assert_called_once_with(
+            req.context,
+            ('cluster_summary_list', {'identities': ['c1'],
+                                      'use_slave': True}))
+        self.assertEqual({'summaries': []}, response)
+
+    def test_cluster_summary_index_consistent(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'summary_index', True)
+        req = self._get('/clusters/summary', params={'consistent': 'true'})
+
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     return_value=[])
+        self.controller.summary_index(req, tenant_id=self.tenant)
+
+        mock_call.assert_called_once_with(
+            req.context,
+            ('cluster_summary_list', {'identities': None,
+                                      'use_slave': False}))
+
+    def test_cluster_summary_index_all(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'summary_index', True)
+        req = self._get('/clusters/summary')
+
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     return_value=[])
+        self.controller.summary_index(req, tenant_id=self.tenant)
+
+        mock_call.assert_called_once_with(
+            req.context,
+            ('cluster_summary_list', {'identities': None,
+                                      'use_slave': True}))
+
+    def test_cluster_summary_denied_policy(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'summary', False)
+        cid = 'aaaa-bbbb-cccc'
+        req = self._get('/clusters/%(cluster_id)s/summary' % {
+            'cluster_id': cid})
+
+        resp = shared.request_with_middleware(fault.FaultWrapper,
+                                              self.controller.summary,
+                                              req, tenant_id=self.tenant,
+                                              cluster_id=cid)
+
+        self.assertEqual(403, resp.status_int)
+        self.assertIn('403 Forbidden', six.text_type(resp))
+
     def test_cluster_delete(self, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'delete', True)
         cid = 'aaaa-bbbb-cccc'
@@ -97,9 +97,12 @@ class NodeControllerTest(shared.ControllerTest, base.SenlinTestCase):
 
         result = self.controller.index(req, tenant_id=self.tenant)
 
-        default_args = {'cluster_id': None, 'limit': None, 'marker': None,
-                        'sort_keys': None, 'sort_dir': None, 'filters': None,
-                        'tenant_safe': True, 'show_deleted': False}
+        page_size = cfg.CONF.senlin_api.list_page_size
+        default_args = {'cluster_id': None, 'limit': page_size,
+                        'marker': None, 'sort_keys': None, 'sort_dir': None,
+                        'filters': None,
+                        'tenant_safe': True, 'show_deleted': False,
+                        'fields': None, 'use_slave': True}
 
         mock_call.assert_called_with(req.context, ('node_list', default_args))
 
@@ -125,7 +128,7 @@ class NodeControllerTest(shared.ControllerTest, base.SenlinTestCase):
         rpc_call_args, _ = mock_call.call_args
         engine_args = rpc_call_args[1][1]
 
-        self.assertEqual(8, len(engine_args))
+        self.assertEqual(10, len(engine_args))
         self.assertIn('cluster_id', engine_args)
         self.assertIn('limit', engine_args)
         self.assertIn('sort_keys', engine_args)
@@ -168,6 +171,8 @@ class NodeControllerTest(shared.ControllerTest, base.SenlinTestCase):
         self.controller.index(req, tenant_id=self.tenant)
         rpc_client.node_list.assert_called_once_with(mock.ANY,
                                                      filters=mock.ANY,
+                                                     fields=None,
+                                                     limit=mock.ANY,
                                                      show_deleted=False)
 
     def test_node_index_show_deleted_true(self, mock_enforce):
@@ -179,6 +184,8 @@ class NodeControllerTest(shared.ControllerTest, base.SenlinTestCase):
         self.controller.index(req, tenant_id=self.tenant)
         rpc_client.node_list.assert_called_once_with(mock.ANY,
                                                      filters=mock.ANY,
+                                                     fields=None,
+                                                     limit=mock.ANY,
                                                      show_deleted=True)
 
     def test_node_index_cluster_not_found(self, mock_enforce):
@@ -334,11 +341,29 @@ class NodeControllerTest(shared.ControllerTest, base.SenlinTestCase):
                                        node_id=node_id)
 
         mock_call.assert_called_once_with(
-            req.context, ('node_get', {'identity': node_id}))
+            req.context, ('node_get', {'identity': node_id,
+                                       'fields': None}))
 
         expected = {'node': engine_resp}
         self.assertEqual(expected, response)
 
+    def test_node_get_with_fields(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'get', True)
+        node_id = 'aaaa-bbbb-cccc'
+        req = self._get('/nodes/%(node_id)s' % {'node_id': node_id},
+                        params={'fields': 'status'})
+
+        engine_resp = {u'id': node_id, u'status': u'ACTIVE'}
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     return_value=engine_resp)
+        response = self.controller.get(req, tenant_id=self.tenant,
+                                       node_id=node_id)
+
+        mock_call.assert_called_once_with(
+            req.context, ('node_get', {'identity': node_id,
+                                       'fields': ['id', 'status']}))
+        self.assertEqual({'node': engine_resp}, response)
+
     def test_node_get_not_found(self, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'get', True)
         node_id = 'non-existent-node'
@@ -761,3 +786,105 @@ class NodeControllerTest(shared.ControllerTest, base.SenlinTestCase):
 
         self.assertEqual(404, resp.json['code'])
         self.assertEqual('NodeNotFound', resp.json['error']['type'])
+
+    def test_node_get_many(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'get_many', True)
+        req = self._get('/nodes/batch')
+        req.environ['QUERY_STRING'] = 'node_id=n1&node_id=n2&fields=status'
+
+        engine_resp = [
+            {'identity': 'n1', 'node': {'id': 'n1', 'status': 'ACTIVE'}},
+            {'identity': 'n2',
+             'error': {'type': 'NodeNotFound', 'message': 'not found'}},
+        ]
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     return_value=engine_resp)
+
+        result = self.controller.get_many(req, tenant_id=self.tenant)
+
+        mock_call.assert_called_once_with(
+            req.context, ('node_get_many', {'identities': ['n1', 'n2'],
+                                            'fields': ['id', 'status']}))
+        self.assertEqual({'nodes': engine_resp}, result)
+
+    def test_node_get_many_no_node(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'get_many', True)
+        req = self._get('/nodes/batch')
+
+        self.assertRaises(webob.exc.HTTPBadRequest,
+                          self.controller.get_many,
+                          req, tenant_id=self.tenant)
+
+    def test_node_create_many(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'create_many', True)
+        body = {
+            'nodes': {
+                'names': ['node1', 'node2'],
+                'profile_id': 'xxxx-yyyy',
+                'role': 'worker',
+            }
+        }
+        req = self._post('/nodes/batch', json.dumps(body))
+
+        engine_resp = [{'id': 'n1', 'name': 'node1', 'action': 'a1'},
+                       {'id': 'n2', 'name': 'node2', 'action': 'a2'}]
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     return_value=engine_resp)
+
+        result = self.controller.create_many(req, tenant_id=self.tenant,
+                                             body=body)
+
+        mock_call.assert_called_once_with(
+            req.context, ('node_create_many', {
+                'names': ['node1', 'node2'],
+                'profile_id': 'xxxx-yyyy',
+                'cluster_id': None,
+                'role': 'worker',
+                'tags': {},
+            }))
+        self.assertEqual({'nodes': engine_resp}, result)
+
+    def test_node_create_many_no_names(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'create_many', True)
+        body = {'nodes': {'profile_id': 'xxxx-yyyy'}}
+        req = self._post('/nodes/batch', json.dumps(body))
+
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call')
+        self.assertRaises(webob.exc.HTTPBadRequest,
+                          self.controller.create_many,
+                          req, tenant_id=self.tenant, body=body)
+        self.assertEqual(0, mock_call.call_count)
+
+    def test_node_delete_many(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'delete_many', True)
+        req = self._simple_request('/nodes/batch', method='DELETE')
+        req.environ['QUERY_STRING'] = 'node_id=n1'
+        body = {'nodes': ['n2']}
+
+        engine_resp = [
+            {'identity': 'n1', 'action': {'id': 'a1', 'target': 'n1'}},
+            {'identity': 'n2',
+             'error': {'type': 'NodeNotFound', 'message': 'not found'}},
+        ]
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     return_value=engine_resp)
+
+        result = self.controller.delete_many(req, tenant_id=self.tenant,
+                                             body=body)
+
+        mock_call.assert_called_once_with(
+            req.context, ('node_delete_many', {'identities': ['n1', 'n2']}))
+        expected = [
+            {'identity': 'n1', 'id': 'n1', 'action_id': 'a1'},
+            {'identity': 'n2',
+             'error': {'type': 'NodeNotFound', 'message': 'not found'}},
+        ]
+        self.assertEqual({'nodes': expected}, result)
+
+    def test_node_delete_many_bad_body(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'delete_many', True)
+        req = self._simple_request('/nodes/batch', method='DELETE')
+
+        self.assertRaises(webob.exc.HTTPBadRequest,
+                          self.controller.delete_many,
+                          req, tenant_id=self.tenant, body={'nodes': 'n1'})
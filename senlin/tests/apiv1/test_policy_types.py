@@ -11,10 +11,12 @@
 # under the License.
 
 import mock
+from oslo_config import cfg
 import six
 
 from senlin.api.middleware import fault
 from senlin.api.openstack.v1 import policy_types
+from senlin.api.openstack.v1 import util
 from senlin.common import exception as senlin_exc
 from senlin.common import policy
 from senlin.rpc import client as rpc_client
@@ -32,6 +34,9 @@ class PolicyTypeControllerTest(shared.ControllerTest, base.SenlinTestCase):
 
         cfgopts = DummyConfig()
         self.controller = policy_types.PolicyTypeController(options=cfgopts)
+        # The type cache is covered by test_util and test_*_cached below
+        cfg.CONF.set_override('type_cache_ttl', 0, group='senlin_api')
+        self.addCleanup(util.type_cache.clear)
 
     def test_policy_type_list(self, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'index', True)
@@ -49,6 +54,25 @@ class PolicyTypeControllerTest(shared.ControllerTest, base.SenlinTestCase):
         mock_call.assert_called_once_with(req.context,
                                           ('policy_type_list', {}))
 
+    def test_policy_type_list_cached(self, mock_enforce):
+        self._mock_enforce_setup(mock_enforce, 'index', True,
+                                 expected_request_count=2)
+        cfg.CONF.set_override('type_cache_ttl', 60, group='senlin_api')
+        engine_response = [{'name': 'Test'}]
+        mock_call = self.patchobject(rpc_client.EngineClient, 'call',
+                                     side_effect=['v1', engine_response])
+
+        req = self._get('/policy_types')
+        response = self.controller.index(req, tenant_id=self.tenant)
+        self.assertEqual({'policy_types': engine_response}, response)
+        cached = self.controller.index(self._get('/policy_types'),
+                                       tenant_id=self.tenant)
+        self.assertIs(response, cached)
+
+        self.assertEqual([mock.call(mock.ANY, ('type_version', {})),
+                          mock.call(mock.ANY, ('policy_type_list', {}))],
+                         mock_call.call_args_list)
+
     def test_policy_type_list_err_denied_policy(self, mock_enforce):
         self._mock_enforce_setup(mock_enforce, 'index', False)
         req = self._get('/policy_types')
@@ -250,6 +250,28 @@ class RoutesTest(base.SenlinTestCase):
                 'cluster_id': 'bbbb'
             })
 
+    def test_cluster_summary(self):
+        self.assertRoute(
+            self.m,
+            '/aaaa/clusters/summary',
+            'GET',
+            'summary_index',
+            'ClusterController',
+            {
+                'tenant_id': 'aaaa'
+            })
+
+        self.assertRoute(
+            self.m,
+            '/aaaa/clusters/bbbb/summary',
+            'GET',
+            'summary',
+            'ClusterController',
+            {
+                'tenant_id': 'aaaa',
+                'cluster_id': 'bbbb'
+            })
+
     def test_node_collection(self):
         self.assertRoute(
             self.m,
@@ -271,6 +293,19 @@ class RoutesTest(base.SenlinTestCase):
                 'tenant_id': 'aaaa',
             })
 
+        for method, action in (('GET', 'get_many'),
+                               ('POST', 'create_many'),
+                               ('DELETE', 'delete_many')):
+            self.assertRoute(
+                self.m,
+                '/aaaa/nodes/batch',
+                method,
+                action,
+                'NodeController',
+                {
+                    'tenant_id': 'aaaa',
+                })
+
         self.assertRoute(
             self.m,
             '/aaaa/nodes/bbbb',
@@ -360,6 +395,16 @@ class RoutesTest(base.SenlinTestCase):
                 'tenant_id': 'aaaa',
             })
 
+        self.assertRoute(
+            self.m,
+            '/aaaa/actions/wait',
+            'GET',
+            'wait',
+            'ActionController',
+            {
+                'tenant_id': 'aaaa',
+            })
+
         self.assertRoute(
             self.m,
             '/aaaa/actions/bbbb',
@@ -10,12 +10,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import time
+
 import mock
+from oslo_config import cfg
+import six
 from webob import exc
 
 from senlin.api.openstack.v1 import util
 from senlin.common import context
 from senlin.common import policy
+from senlin.common import serializers
 from senlin.common import wsgi
 from senlin.tests.common import base
 
@@ -82,6 +87,35 @@ class TestGetAllowedParams(base.SenlinTestCase):
         self.assertNotIn('foo', result)
 
 
+class TestGetFields(base.SenlinTestCase):
+    def setUp(self):
+        super(TestGetFields, self).setUp()
+        self.allowed = ('id', 'name', 'status', 'data')
+
+    def _params(self, *values):
+        params = wsgi.Request({}).params.copy()
+        for value in values:
+            params.add('fields', value)
+        return params
+
+    def test_no_fields(self):
+        self.assertIsNone(util.get_fields(self._params(), self.allowed))
+
+    def test_comma_separated(self):
+        result = util.get_fields(self._params('status, name'), self.allowed)
+        self.assertEqual(['id', 'name', 'status'], result)
+
+    def test_repeated(self):
+        result = util.get_fields(self._params('status', 'name,'),
+                                 self.allowed)
+        self.assertEqual(['id', 'name', 'status'], result)
+
+    def test_invalid_field(self):
+        ex = self.assertRaises(exc.HTTPBadRequest, util.get_fields,
+                               self._params('name,password'), self.allowed)
+        self.assertIn('password', six.text_type(ex))
+
+
 class TestPolicyEnforce(base.SenlinTestCase):
     def setUp(self):
         super(TestPolicyEnforce, self).setUp()
@@ -116,3 +150,206 @@ class TestPolicyEnforce(base.SenlinTestCase):
         self.assertRaises(exc.HTTPForbidden,
                           self.controller.an_action,
                           self.req, tenant_id='foo')
+
+
+class TestEtagCheck(base.SenlinTestCase):
+    def setUp(self):
+        super(TestEtagCheck, self).setUp()
+        cfg.CONF.set_override('enable_etags', True, group='senlin_api')
+        self.get_version = mock.Mock(return_value='v1')
+
+    def _req(self, path='/clusters', etag=None):
+        req = wsgi.Request.blank(path)
+        req.context = context.RequestContext(tenant_id='foo',
+                                             is_admin=False)
+        if etag:
+            req.headers['If-None-Match'] = 'W/"%s"' % etag
+        return req
+
+    def test_disabled(self):
+        cfg.CONF.set_override('enable_etags', False, group='senlin_api')
+        req = self._req()
+        self.assertIsNone(util.etag_check(req, self.get_version))
+        self.assertEqual(0, self.get_version.call_count)
+        self.assertNotIn(wsgi.ETAG_ENVIRON, req.environ)
+
+    def test_not_modified(self):
+        req = self._req()
+        util.etag_check(req, self.get_version)
+        etag = req.environ[wsgi.ETAG_ENVIRON]
+
+        ex = self.assertRaises(exc.HTTPNotModified, util.etag_check,
+                               self._req(etag=etag), self.get_version)
+        self.assertEqual('W/"%s"' % etag, ex.headers['ETag'])
+
+    def test_modified(self):
+        req = self._req()
+        util.etag_check(req, self.get_version)
+        etag = req.environ[wsgi.ETAG_ENVIRON]
+
+        self.get_version.return_value = 'v2'
+        req = self._req(etag=etag)
+        util.etag_check(req, self.get_version)
+        self.assertNotEqual(etag, req.environ[wsgi.ETAG_ENVIRON])
+
+    def test_query_string(self):
+        req = self._req('/clusters?limit=1')
+        util.etag_check(req, self.get_version)
+        etag = req.environ[wsgi.ETAG_ENVIRON]
+
+        req = self._req('/clusters?limit=2', etag=etag)
+        util.etag_check(req, self.get_version)
+        self.assertNotEqual(etag, req.environ[wsgi.ETAG_ENVIRON])
+
+    def test_empty_listing(self):
+        self.get_version.return_value = None
+        req = self._req()
+        util.etag_check(req, self.get_version)
+        self.assertNotIn(wsgi.ETAG_ENVIRON, req.environ)
+
+
+class TestTypeCache(base.SenlinTestCase):
+    def setUp(self):
+        super(TestTypeCache, self).setUp()
+        self.cache = util.TypeCache()
+        self.get_version = mock.Mock(return_value='v1')
+        self.fetch = mock.Mock(return_value={'profile_types': []})
+
+    def _req(self, etag=None):
+        req = wsgi.Request.blank('/profile_types')
+        if etag:
+            req.headers['If-None-Match'] = 'W/"%s"' % etag
+        return req
+
+    def test_cached(self):
+        req = self._req()
+        body = self.cache.get(req, 'key', self.fetch, self.get_version)
+        self.assertEqual({'profile_types': []}, body)
+        self.assertIsInstance(body, serializers.CachedBody)
+        self.assertIn(wsgi.ETAG_ENVIRON, req.environ)
+
+        again = self.cache.get(self._req(), 'key', self.fetch,
+                               self.get_version)
+        self.assertIs(body, again)
+        self.assertEqual(1, self.fetch.call_count)
+        self.assertEqual(1, self.get_version.call_count)
+
+    def test_disabled(self):
+        cfg.CONF.set_override('type_cache_ttl', 0, group='senlin_api')
+        req = self._req()
+        self.cache.get(req, 'key', self.fetch, self.get_version)
+        self.cache.get(req, 'key', self.fetch, self.get_version)
+        self.assertEqual(2, self.fetch.call_count)
+        self.assertEqual(0, self.get_version.call_count)
+        self.assertNotIn(wsgi.ETAG_ENVIRON, req.environ)
+
+    def test_not_modified(self):
+        req = self._req()
+        self.cache.get(req, 'key', self.fetch, self.get_version)
+        etag = req.environ[wsgi.ETAG_ENVIRON]
+
+        ex = self.assertRaises(exc.HTTPNotModified, self.cache.get,
+                               self._req(etag=etag), 'key', self.fetch,
+                               self.get_version)
+        self.assertEqual('W/"%s"' % etag, ex.headers['ETag'])
+
+    @mock.patch.object(time, 'time')
+    def test_version_changed(self, mock_time):
+        mock_time.return_value = 100
+        req = self._req()
+        self.cache.get(req, 'key', self.fetch, self.get_version)
+        etag = req.environ[wsgi.ETAG_ENVIRON]
+
+        # The version is not checked again before the TTL expires
+        self.get_version.return_value = 'v2'
+        mock_time.return_value = 159
+        self.cache.get(self._req(), 'key', self.fetch, self.get_version)
+        self.assertEqual(1, self.get_version.call_count)
+        self.assertEqual(1, self.fetch.call_count)
+
+        mock_time.return_value = 160
+        req = self._req(etag=etag)
+        self.cache.get(req, 'key', self.fetch, self.get_version)
+        self.assertEqual(2, self.get_version.call_count)
+        self.assertEqual(2, self.fetch.call_count)
+        self.assertNotEqual(etag, req.environ[wsgi.ETAG_ENVIRON])
+
+    def test_keys(self):
+        self.cache.get(self._req(), 'key1', self.fetch, self.get_version)
+        self.cache.get(self._req(), 'key2', self.fetch, self.get_version)
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_fetch_error_not_cached(self):
+        self.fetch.side_effect = exc.HTTPInternalServerError()
+        self.assertRaises(exc.HTTPInternalServerError, self.cache.get,
+                          self._req(), 'key', self.fetch, self.get_version)
+        self.assertEqual({}, self.cache.entries)
+
+
+class TestPagedList(base.SenlinTestCase):
+    def setUp(self):
+        super(TestPagedList, self).setUp()
+        cfg.CONF.set_override('list_page_size', 2, group='senlin_api')
+        self.records = [{'id': 'id-%d' % i} for i in range(5)]
+        self.fetch = mock.Mock(side_effect=self._fetch)
+
+    def _fetch(self, limit=None, marker=None, **kwargs):
+        if limit == 'big':
+            return self.records
+        start = 0
+        if marker is not None:
+            start = [r['id'] for r in self.records].index(marker) + 1
+        end = None if limit is None else start + int(limit)
+        return self.records[start:end]
+
+    def test_small_limit(self):
+        res = util.paged_list(self.fetch, {'limit': '2', 'sort_dir': 'asc'})
+
+        self.assertEqual(self.records[:2], res)
+        self.fetch.assert_called_once_with(limit='2', sort_dir='asc')
+
+    def test_single_page(self):
+        self.records = self.records[:1]
+        res = util.paged_list(self.fetch, {})
+
+        self.assertEqual(self.records, res)
+        self.fetch.assert_called_once_with(limit=2)
+
+    def test_streamed(self):
+        res = util.paged_list(self.fetch, {'sort_dir': 'asc'})
+
+        self.assertIsInstance(res, serializers.StreamedList)
+        self.assertEqual(1, self.fetch.call_count)
+        self.assertEqual(self.records, list(res))
+        self.assertEqual([
+            mock.call(limit=2, sort_dir='asc'),
+            mock.call(limit=2, marker='id-1', sort_dir='asc'),
+            mock.call(limit=2, marker='id-3', sort_dir='asc'),
+        ], self.fetch.call_args_list)
+
+    def test_first_page_error(self):
+        # The first page is fetched before the response starts, so its
+        # errors get an error status
+        self.fetch.side_effect = exc.HTTPInternalServerError()
+        self.assertRaises(exc.HTTPInternalServerError, util.paged_list,
+                          self.fetch, {})
+
+    def test_streamed_with_limit(self):
+        res = util.paged_list(self.fetch, {'limit': 3})
+
+        self.assertEqual(self.records[:3], list(res))
+        self.assertEqual([
+            mock.call(limit=2),
+            mock.call(limit=1, marker='id-1'),
+        ], self.fetch.call_args_list)
+
+    def test_disabled(self):
+        cfg.CONF.set_override('list_page_size', 0, group='senlin_api')
+        res = util.paged_list(self.fetch, {})
+
+        self.assertEqual(self.records, res)
+        self.fetch.assert_called_once_with()
+
+    def test_invalid_limit(self):
+        util.paged_list(self.fetch, {'limit': 'big'})
+        self.fetch.assert_called_once_with(limit='big')
@@ -62,6 +62,22 @@ class DBAPIActionTest(base.SenlinTestCase):
         self.assertEqual(10, retobj.inputs['max_size'])
         self.assertIsNone(retobj.outputs)
 
+    def test_action_update(self):
+        action = _create_action(self.ctx)
+        db_api.action_update(self.ctx, action.id, {'status': 'READY'})
+
+        retobj = db_api.action_get(self.ctx, action.id)
+        self.assertEqual('READY', retobj.status)
+        self.assertEqual(2, retobj.version)
+
+        version = db_api.action_update(self.ctx, action.id,
+                                       {'status': 'RUNNING'}, version=2)
+        self.assertEqual(3, version)
+        self.assertRaises(exception.VersionConflict, db_api.action_update,
+                          self.ctx, action.id, {'status': 'READY'}, version=2)
+        self.assertRaises(exception.NotFound, db_api.action_update,
+                          self.ctx, 'BogusId', {'status': 'READY'})
+
     def test_action_get_1st_ready(self):
         specs = [
             {'name': 'action_001', 'status': 'INIT'},
@@ -95,6 +111,24 @@ class DBAPIActionTest(base.SenlinTestCase):
         for spec in ['action_002', 'action_004']:
             self.assertIn(spec, names)
 
+    def test_action_count_by_status(self):
+        self.assertEqual({}, db_api.action_count_by_status(self.ctx))
+
+        specs = [
+            {'name': 'action_001', 'status': 'INIT'},
+            {'name': 'action_002', 'status': 'READY'},
+            {'name': 'action_003', 'status': 'RUNNING'},
+            {'name': 'action_004', 'status': 'READY'}
+        ]
+
+        for spec in specs:
+            _create_action(self.ctx,
+                           action=shared.sample_action,
+                           **spec)
+
+        res = db_api.action_count_by_status(self.ctx)
+        self.assertEqual({'INIT': 1, 'READY': 2, 'RUNNING': 1}, res)
+
     def test_action_get_all_by_owner(self):
         specs = [
             {'name': 'action_001', 'owner': 'work1'},
@@ -13,6 +13,9 @@
 import datetime
 import mock
 
+from oslo_config import cfg
+import sqlalchemy
+
 from senlin.common import exception
 from senlin.db.sqlalchemy import api as db_api
 from senlin.tests.common import base
@@ -179,6 +182,55 @@ class DBAPIClusterTest(base.SenlinTestCase):
         index = db_api.cluster_get_next_index(self.ctx, 'bad-id')
         self.assertIsNone(index)
 
+    def test_cluster_reserve_indexes(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+
+        first = db_api.cluster_reserve_indexes(self.ctx, cluster.id, 10)
+        self.assertEqual(1, first)
+        first = db_api.cluster_reserve_indexes(self.ctx, cluster.id, 5)
+        self.assertEqual(11, first)
+        index = db_api.cluster_get_next_index(self.ctx, cluster.id)
+        self.assertEqual(16, index)
+
+        cluster = db_api.cluster_get(self.ctx, cluster.id)
+        self.assertEqual(17, cluster.next_index)
+
+        first = db_api.cluster_reserve_indexes(self.ctx, 'bad-id', 10)
+        self.assertIsNone(first)
+
+    def test_cluster_get_next_index_in_transaction(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+
+        with db_api.transaction(self.ctx):
+            self.assertIsNone(db_api.cluster_get_next_index(self.ctx,
+                                                            'bad-id'))
+            index = db_api.cluster_get_next_index(self.ctx, cluster.id)
+            self.assertEqual(1, index)
+
+        cluster = db_api.cluster_get(self.ctx, cluster.id)
+        self.assertEqual(2, cluster.next_index)
+
+    def test_transaction_commits_nested_writes(self):
+        with db_api.transaction(self.ctx):
+            cluster = shared.create_cluster(self.ctx, self.profile)
+            with db_api.transaction(self.ctx):
+                db_api.cluster_update(self.ctx, cluster.id, {'size': 3})
+
+        ctx = utils.dummy_context()
+        cluster = db_api.cluster_get(ctx, cluster.id)
+        self.assertEqual(3, cluster.size)
+
+    def test_transaction_rolls_back_on_error(self):
+        def _create():
+            with db_api.transaction(self.ctx):
+                cluster = shared.create_cluster(self.ctx, self.profile)
+                self.cluster_id = cluster.id
+                raise exception.Error("boom")
+
+        self.assertRaises(exception.Error, _create)
+        ctx = utils.dummy_context()
+        self.assertIsNone(db_api.cluster_get(ctx, self.cluster_id))
+
     def test_cluster_get_by_name_and_parent(self):
         cluster1 = shared.create_cluster(self.ctx, self.profile,
                                          name='cluster1')
@@ -212,6 +264,19 @@ class DBAPIClusterTest(base.SenlinTestCase):
         names = [ret_cluster.name for ret_cluster in ret_clusters]
         [self.assertIn(val['name'], names) for val in values]
 
+    def test_cluster_get_all_with_columns(self):
+        shared.create_cluster(self.ctx, self.profile, name='cluster1')
+        self.ctx.session.expunge_all()
+
+        ret_clusters = db_api.cluster_get_all(self.ctx,
+                                              columns=['id', 'name'])
+        self.assertEqual(1, len(ret_clusters))
+        unloaded = sqlalchemy.inspect(ret_clusters[0]).unloaded
+        self.assertNotIn('name', unloaded)
+        self.assertIn('data', unloaded)
+        self.assertIn('tags', unloaded)
+        self.assertEqual('cluster1', ret_clusters[0].name)
+
     def test_cluster_get_all_with_regular_tenant(self):
         values = [
             {'tenant_id': UUID1},
@@ -444,6 +509,41 @@ class DBAPIClusterTest(base.SenlinTestCase):
         cl_db = db_api.cluster_count_all(self.ctx, filters=filters)
         self.assertEqual(2, cl_db)
 
+    def test_cluster_version(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+        v1 = db_api.cluster_version(self.ctx, cluster.id)
+        self.assertIsNotNone(v1)
+        self.assertEqual(v1, db_api.cluster_version(self.ctx, cluster.id))
+
+        db_api.cluster_update(self.ctx, cluster.id, {'status': 'ACTIVE'})
+        v2 = db_api.cluster_version(self.ctx, cluster.id)
+        self.assertNotEqual(v1, v2)
+
+        # Members joining the cluster change its version too
+        shared.create_node(self.ctx, cluster, self.profile)
+        self.assertNotEqual(v2, db_api.cluster_version(self.ctx, cluster.id))
+
+        self.assertIsNone(db_api.cluster_version(self.ctx, 'non-existent'))
+
+    def test_cluster_version_all(self):
+        self.assertIsNone(db_api.cluster_version_all(self.ctx))
+
+        clusters = [shared.create_cluster(self.ctx, self.profile, name=n)
+                    for n in ('foo', 'bar')]
+        v1 = db_api.cluster_version_all(self.ctx)
+        self.assertIsNotNone(v1)
+        v_foo = db_api.cluster_version_all(self.ctx, filters={'name': 'foo'})
+        self.assertNotEqual(v1, v_foo)
+
+        db_api.cluster_update(self.ctx, clusters[1].id, {'status': 'ACTIVE'})
+        v2 = db_api.cluster_version_all(self.ctx)
+        self.assertNotEqual(v1, v2)
+        self.assertEqual(v_foo, db_api.cluster_version_all(
+            self.ctx, filters={'name': 'foo'}))
+
+        db_api.cluster_delete(self.ctx, clusters[1].id)
+        self.assertNotEqual(v2, db_api.cluster_version_all(self.ctx))
+
     def test_cluster_update(self):
         cluster = shared.create_cluster(self.ctx, self.profile)
         values = {
@@ -462,6 +562,35 @@ class DBAPIClusterTest(base.SenlinTestCase):
         self.assertRaises(exception.NotFound, db_api.cluster_update, self.ctx,
                           UUID2, values)
 
+    def test_cluster_update_with_version(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+
+        version = db_api.cluster_update(self.ctx, cluster.id,
+                                        {'status': 'ACTIVE'}, version=1)
+        self.assertEqual(2, version)
+        self.assertRaises(exception.VersionConflict, db_api.cluster_update,
+                          self.ctx, cluster.id, {'status': 'ERROR'},
+                          version=1)
+
+        cluster = db_api.cluster_get(self.ctx, cluster.id)
+        self.assertEqual('ACTIVE', cluster.status)
+        self.assertEqual(2, cluster.version)
+
+    def test_cluster_update_with_version_after_membership_change(self):
+        cluster = shared.create_cluster(self.ctx, self.profile)
+        v1 = db_api.cluster_version(self.ctx, cluster.id)
+
+        # Node bookkeeping changes the ETag of the cluster, but not the
+        # version used by conditional updates
+        shared.create_node(self.ctx, cluster, self.profile)
+        self.assertNotEqual(v1, db_api.cluster_version(self.ctx, cluster.id))
+
+        cluster = db_api.cluster_get(self.ctx, cluster.id)
+        self.assertEqual(1, cluster.version)
+        version = db_api.cluster_update(self.ctx, cluster.id,
+                                        {'status': 'ACTIVE'}, version=1)
+        self.assertEqual(2, version)
+
     def test_get_sort_keys_returns_empty_list_if_no_keys(self):
         sort_keys = None
         mapping = {}
@@ -529,6 +658,49 @@ class DBAPIClusterTest(base.SenlinTestCase):
         args, _ = mock_paginate_query.call_args
         self.assertIn(['name', 'id'], args)
 
+    @mock.patch.object(db_api.utils, 'paginate_query')
+    @mock.patch.object(db_api, 'model_query')
+    def test_paginate_query_marker_use_slave(self, mock_query,
+                                             mock_paginate_query):
+        query = mock.Mock()
+        model = mock.Mock()
+        marker = mock.Mock()
+
+        db_api._paginate_query(self.ctx, query, model, marker=marker,
+                               use_slave=True)
+        mock_query.assert_called_once_with(self.ctx, model, use_slave=True)
+
+    @mock.patch.object(db_api, 'get_session')
+    def test_model_query_use_slave(self, mock_session):
+        cfg.CONF.set_override('slave_connection', 'sqlite://',
+                              group='database')
+        db_api.model_query(self.ctx, db_api.models.Cluster, use_slave=True)
+        mock_session.assert_called_once_with(use_slave=True)
+
+    @mock.patch.object(db_api, 'get_session')
+    def test_model_query_use_slave_not_configured(self, mock_session):
+        query = db_api.model_query(self.ctx, db_api.models.Cluster,
+                                   use_slave=True)
+        self.assertEqual(0, mock_session.call_count)
+        self.assertEqual(self.ctx.session, query.session)
+
+    @mock.patch.object(db_api, 'get_session')
+    def test_model_query_no_slave(self, mock_session):
+        cfg.CONF.set_override('slave_connection', 'sqlite://',
+                              group='database')
+        query = db_api.model_query(self.ctx, db_api.models.Cluster)
+        self.assertEqual(0, mock_session.call_count)
+        self.assertEqual(self.ctx.session, query.session)
+
+    def test_cluster_get_all_use_slave(self):
+        shared.create_cluster(self.ctx, self.profile)
+        with mock.patch.object(db_api, 'model_query',
+                               wraps=db_api.model_query) as mock_query:
+            clusters = db_api.cluster_get_all(self.ctx, use_slave=True)
+            mock_query.assert_called_once_with(self.ctx, db_api.models.Cluster,
+                                               use_slave=True)
+        self.assertEqual(1, len(clusters))
+
     def test_nested_cluster_get_by_name(self):
         cluster1 = shared.create_cluster(self.ctx, self.profile,
                                          name='cluster1')
@@ -62,6 +62,23 @@ class DBAPIClusterPolicyTest(base.SenlinTestCase):
         res = db_api.cluster_policy_detach(self.ctx, self.cluster.id, 'BOGUS')
         self.assertIsNone(res)
 
+    def test_policy_attach_detach_cluster_version(self):
+        policy = self.create_policy()
+        v1 = db_api.cluster_version(self.ctx, self.cluster.id)
+
+        db_api.cluster_policy_attach(self.ctx, self.cluster.id, policy.id,
+                                     {'enabled': True})
+        v2 = db_api.cluster_version(self.ctx, self.cluster.id)
+        self.assertNotEqual(v1, v2)
+
+        db_api.cluster_policy_detach(self.ctx, self.cluster.id, policy.id)
+        self.assertNotEqual(v2, db_api.cluster_version(self.ctx,
+                                                       self.cluster.id))
+
+        # The row version used by conditional updates is left alone
+        cluster = db_api.cluster_get(self.ctx, self.cluster.id)
+        self.assertEqual(1, cluster.version)
+
     def test_policy_enable_disable(self):
         policy = self.create_policy()
 
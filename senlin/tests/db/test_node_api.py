@@ -13,6 +13,7 @@
 import datetime
 import json
 import six
+import sqlalchemy
 
 from senlin.common import exception
 from senlin.db.sqlalchemy import api as db_api
@@ -55,6 +56,147 @@ class DBAPINodeTest(base.SenlinTestCase):
         cluster = db_api.cluster_get(self.ctx, self.cluster.id)
         self.assertEqual(1, cluster.size)
 
+    def test_node_create_with_stale_cluster(self):
+        # Size accounting must not depend on the cluster object loaded
+        # into another session being up to date.
+        ctx = utils.dummy_context()
+        db_api.cluster_get(ctx, self.cluster.id)
+        shared.create_node(self.ctx, self.cluster, self.profile)
+        shared.create_node(ctx, self.cluster, self.profile)
+
+        cluster = db_api.cluster_get(utils.dummy_context(), self.cluster.id)
+        self.assertEqual(2, cluster.size)
+
+    def test_node_count_by_cluster(self):
+        self.assertEqual(0, db_api.node_count_by_cluster(self.ctx,
+                                                         self.cluster.id))
+        node = shared.create_node(self.ctx, self.cluster, self.profile)
+        shared.create_node(self.ctx, self.cluster, self.profile)
+        shared.create_node(self.ctx, None, self.profile)
+        self.assertEqual(2, db_api.node_count_by_cluster(self.ctx,
+                                                         self.cluster.id))
+
+        db_api.node_delete(self.ctx, node.id)
+        self.assertEqual(1, db_api.node_count_by_cluster(self.ctx,
+                                                         self.cluster.id))
+        cluster = db_api.cluster_get(self.ctx, self.cluster.id)
+        self.assertEqual(1, cluster.size)
+
+    def test_node_create_many(self):
+        values = [{'name': 'node-%s' % i, 'cluster_id': self.cluster.id,
+                   'profile_id': self.profile.id, 'status': 'INIT',
+                   'status_reason': 'a' * 1024, 'data': {'index': i}}
+                  for i in range(3)]
+        values.append({'name': 'orphan', 'profile_id': self.profile.id})
+
+        node_ids = db_api.node_create_many(self.ctx, values)
+
+        self.assertEqual(4, len(node_ids))
+        for i in range(3):
+            node = db_api.node_get(self.ctx, node_ids[i])
+            self.assertEqual('node-%s' % i, node.name)
+            self.assertEqual(self.cluster.id, node.cluster_id)
+            self.assertEqual('a' * 255, node.status_reason)
+            self.assertEqual({'index': i}, node.data)
+            self.assertEqual(1, node.version)
+        node = db_api.node_get(self.ctx, node_ids[3])
+        self.assertIsNone(node.cluster_id)
+
+        cluster = db_api.cluster_get(self.ctx, self.cluster.id)
+        self.assertEqual(3, cluster.size)
+        self.assertEqual([], db_api.node_create_many(self.ctx, []))
+
+    def test_node_create_many_different_keys(self):
+        values = [
+            {'name': 'node-1', 'profile_id': self.profile.id,
+             'data': {'foo': 'bar'}},
+            {'name': 'node-2', 'profile_id': self.profile.id,
+             'tags': {'k': 'v'}},
+            {'name': 'node-3', 'profile_id': self.profile.id,
+             'data': {'baz': 1}},
+        ]
+
+        node_ids = db_api.node_create_many(self.ctx, values)
+
+        self.assertEqual(3, len(node_ids))
+        nodes = [db_api.node_get(self.ctx, node_id) for node_id in node_ids]
+        self.assertEqual(['node-1', 'node-2', 'node-3'],
+                         [n.name for n in nodes])
+        self.assertEqual({'foo': 'bar'}, nodes[0].data)
+        self.assertEqual({'k': 'v'}, nodes[1].tags)
+        self.assertEqual({'baz': 1}, nodes[2].data)
+
+        # Columns a row does not set are left out of its INSERT, they are
+        # not written as explicit JSON nulls. The text is read without the
+        # Dict type, which would decode a stored 'null' to None.
+        query = sqlalchemy.text('SELECT id, data, tags FROM node')
+        raw = dict((r[0], (r[1], r[2]))
+                   for r in db_api.get_engine().execute(query))
+        self.assertEqual({'foo': 'bar'}, json.loads(raw[node_ids[0]][0]))
+        self.assertIsNone(raw[node_ids[0]][1])
+        self.assertIsNone(raw[node_ids[1]][0])
+        self.assertEqual({'k': 'v'}, json.loads(raw[node_ids[1]][1]))
+        self.assertEqual({'baz': 1}, json.loads(raw[node_ids[2]][0]))
+        self.assertIsNone(raw[node_ids[2]][1])
+
+    def test_node_delete_many(self):
+        node1 = shared.create_node(self.ctx, self.cluster, self.profile)
+        node2 = shared.create_node(self.ctx, self.cluster, self.profile)
+        node3 = shared.create_node(self.ctx, self.cluster, self.profile)
+        orphan = shared.create_node(self.ctx, None, self.profile)
+
+        res = db_api.node_delete_many(self.ctx,
+                                      [node1.id, node2.id, orphan.id])
+        self.assertEqual(3, res)
+        self.assertIsNone(db_api.node_get(self.ctx, node1.id))
+        self.assertIsNone(db_api.node_get(self.ctx, orphan.id))
+        self.assertIsNotNone(db_api.node_get(self.ctx, node3.id))
+        cluster = db_api.cluster_get(self.ctx, self.cluster.id)
+        self.assertEqual(1, cluster.size)
+
+        # Deleted nodes are not counted again
+        res = db_api.node_delete_many(self.ctx, [node1.id, node3.id])
+        self.assertEqual(1, res)
+        cluster = db_api.cluster_get(self.ctx, self.cluster.id)
+        self.assertEqual(0, cluster.size)
+        self.assertEqual(0, db_api.node_delete_many(self.ctx, []))
+
+    def test_node_soft_delete_by_cluster(self):
+        for i in range(3):
+            shared.create_node(self.ctx, self.cluster, self.profile)
+        orphan = shared.create_node(self.ctx, None, self.profile)
+
+        res = db_api.node_soft_delete_by_cluster(self.ctx, self.cluster.id)
+        self.assertEqual(3, res)
+        self.assertEqual(0, db_api.node_count_by_cluster(self.ctx,
+                                                         self.cluster.id))
+        self.assertIsNotNone(db_api.node_get(self.ctx, orphan.id))
+        cluster = db_api.cluster_get(self.ctx, self.cluster.id)
+        self.assertEqual(0, cluster.size)
+
+    def test_node_summary_by_cluster(self):
+        cluster2 = shared.create_cluster(self.ctx, self.profile)
+        t1 = datetime.datetime(2015, 1, 1, 0, 0, 0)
+        t2 = datetime.datetime(2015, 1, 2, 0, 0, 0)
+        shared.create_node(self.ctx, self.cluster, self.profile,
+                           created_time=t1)
+        shared.create_node(self.ctx, self.cluster, self.profile,
+                           created_time=t2)
+        shared.create_node(self.ctx, self.cluster, self.profile,
+                           status='ERROR')
+        node = shared.create_node(self.ctx, cluster2, self.profile)
+        db_api.node_delete(self.ctx, node.id)
+        shared.create_node(self.ctx, None, self.profile)
+
+        rows = db_api.node_summary_by_cluster(
+            self.ctx, [self.cluster.id, cluster2.id])
+
+        self.assertEqual(
+            sorted([(self.cluster.id, 'ACTIVE', 2, t1, t2),
+                    (self.cluster.id, 'ERROR', 1, None, None)]),
+            sorted(tuple(r) for r in rows))
+        self.assertEqual([], db_api.node_summary_by_cluster(self.ctx, []))
+
     def test_node_status_reason_truncate(self):
         node = shared.create_node(self.ctx, self.cluster, self.profile,
                                   status_reason='a' * 1024)
@@ -165,6 +307,28 @@ class DBAPINodeTest(base.SenlinTestCase):
         names = [node.name for node in nodes]
         [self.assertIn(val['name'], names) for val in values]
 
+    def test_node_get_many(self):
+        node1 = shared.create_node(self.ctx, None, self.profile, name='n1')
+        node2 = shared.create_node(self.ctx, None, self.profile, name='n2')
+        shared.create_node(self.ctx, None, self.profile, name='n3')
+
+        nodes = db_api.node_get_many(self.ctx, [node1.id, node2.id, UUID1])
+        self.assertEqual(set([node1.id, node2.id]),
+                         set(node.id for node in nodes))
+
+        self.assertEqual([], db_api.node_get_many(self.ctx, []))
+
+    def test_node_get_all_with_columns(self):
+        shared.create_node(self.ctx, None, self.profile, name='node1')
+        self.ctx.session.expunge_all()
+
+        nodes = db_api.node_get_all(self.ctx, columns=['id', 'status'])
+        self.assertEqual(1, len(nodes))
+        unloaded = sqlalchemy.inspect(nodes[0]).unloaded
+        self.assertNotIn('status', unloaded)
+        self.assertIn('data', unloaded)
+        self.assertIn('name', unloaded)
+
     def test_node_get_all_with_cluster_id(self):
         values = [{'name': 'node1'}, {'name': 'node2'}, {'name': 'node3'}]
         for v in values:
@@ -321,6 +485,35 @@ class DBAPINodeTest(base.SenlinTestCase):
         results = db_api.node_get_all(self.ctx, tenant_safe=True)
         self.assertEqual(0, len(results))
 
+    def test_node_version(self):
+        node = shared.create_node(self.ctx, self.cluster, self.profile)
+        v1 = db_api.node_version(self.ctx, node.id)
+        self.assertIsNotNone(v1)
+
+        db_api.node_update(self.ctx, node.id, {'status': 'ERROR'})
+        self.assertNotEqual(v1, db_api.node_version(self.ctx, node.id))
+        self.assertIsNone(db_api.node_version(self.ctx, 'non-existent'))
+
+    def test_node_version_all(self):
+        self.assertIsNone(db_api.node_version_all(self.ctx))
+
+        node = shared.create_node(self.ctx, self.cluster, self.profile)
+        shared.create_node(self.ctx, None, self.profile)
+        v1 = db_api.node_version_all(self.ctx)
+        v_cluster = db_api.node_version_all(self.ctx,
+                                            cluster_id=self.cluster.id)
+        self.assertNotEqual(v1, v_cluster)
+
+        db_api.node_update(self.ctx, node.id, {'status': 'ERROR'})
+        self.assertNotEqual(v1, db_api.node_version_all(self.ctx))
+        self.assertNotEqual(v_cluster, db_api.node_version_all(
+            self.ctx, cluster_id=self.cluster.id))
+
+        self.ctx.tenant_id = 'a-different-tenant'
+        self.assertIsNone(db_api.node_version_all(self.ctx))
+        self.assertIsNotNone(db_api.node_version_all(self.ctx,
+                                                     tenant_safe=False))
+
     def test_node_get_by_cluster(self):
         cluster1 = shared.create_cluster(self.ctx, self.profile)
 
@@ -393,6 +586,38 @@ class DBAPINodeTest(base.SenlinTestCase):
         self.assertEqual('Attempt to update a node with id "BogusId" that '
                          'does not exists failed.', six.text_type(ex))
 
+    def test_node_update_with_version(self):
+        node = shared.create_node(self.ctx, self.cluster, self.profile)
+        self.assertEqual(1, node.version)
+
+        version = db_api.node_update(self.ctx, node.id, {'status': 'OK'},
+                                     version=1)
+        self.assertEqual(2, version)
+        node = db_api.node_get(self.ctx, node.id)
+        self.assertEqual('OK', node.status)
+        self.assertEqual(2, node.version)
+
+        ex = self.assertRaises(exception.VersionConflict,
+                               db_api.node_update,
+                               self.ctx, node.id, {'status': 'BAD'},
+                               version=1)
+        self.assertEqual({'type': 'node', 'id': node.id, 'expected': 1,
+                          'actual': 2}, ex.kwargs)
+        node = db_api.node_get(self.ctx, node.id)
+        self.assertEqual('OK', node.status)
+
+        self.assertRaises(exception.NotFound, db_api.node_update,
+                          self.ctx, 'BogusId', {'status': 'BAD'}, version=1)
+
+    def test_node_update_bumps_version(self):
+        node = shared.create_node(self.ctx, self.cluster, self.profile)
+        db_api.node_update(self.ctx, node.id, {'role': 'new role'})
+
+        node = db_api.node_get(self.ctx, node.id)
+        self.assertEqual(2, node.version)
+        self.assertRaises(exception.VersionConflict, db_api.node_update,
+                          self.ctx, node.id, {'status': 'BAD'}, version=1)
+
     def test_node_migrate_from_none(self):
         node_orphan = shared.create_node(self.ctx, None, self.profile)
         timestamp = datetime.datetime.utcnow()
@@ -402,6 +627,7 @@ class DBAPINodeTest(base.SenlinTestCase):
         cluster = db_api.cluster_get(self.ctx, self.cluster.id)
         self.assertEqual(timestamp, node.updated_time)
         self.assertEqual(self.cluster.id, node.cluster_id)
+        self.assertEqual(1, node.index)
         self.assertEqual(2, cluster.next_index)
         self.assertEqual(1, cluster.size)
 
@@ -423,7 +649,7 @@ class DBAPINodeTest(base.SenlinTestCase):
 
         self.assertEqual(1, cluster1.size)
         self.assertEqual(0, cluster2.size)
-        self.assertEqual(2, cluster1.next_index)
+        self.assertEqual(1, cluster1.next_index)
         self.assertEqual(1, cluster2.next_index)
 
         timestamp = datetime.datetime.utcnow()
@@ -436,7 +662,8 @@ class DBAPINodeTest(base.SenlinTestCase):
         self.assertEqual(cluster2.id, node_new.cluster_id)
         self.assertEqual(0, cluster1.size)
         self.assertEqual(1, cluster2.size)
-        self.assertEqual(2, cluster1.next_index)
+        self.assertEqual(1, node_new.index)
+        self.assertEqual(1, cluster1.next_index)
         self.assertEqual(2, cluster2.next_index)
 
         # Migrate it back!
@@ -450,7 +677,8 @@ class DBAPINodeTest(base.SenlinTestCase):
         self.assertEqual(cluster1.id, node_new.cluster_id)
         self.assertEqual(1, cluster1.size)
         self.assertEqual(0, cluster2.size)
-        self.assertEqual(3, cluster1.next_index)
+        self.assertEqual(1, node_new.index)
+        self.assertEqual(2, cluster1.next_index)
         self.assertEqual(2, cluster2.next_index)
 
     def test_node_delete(self):
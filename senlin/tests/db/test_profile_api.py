@@ -314,6 +314,19 @@ class DBAPIProfileTest(base.SenlinTestCase):
         self.assertEqual(new_fields['name'], new_profile.name)
         self.assertEqual('test_profile_name_2', new_profile.name)
 
+    def test_profile_version(self):
+        profile = shared.create_profile(self.ctx, updated_time=None)
+        v1 = db_api.profile_version(self.ctx, profile.id)
+        v1_all = db_api.profile_version_all(self.ctx)
+        self.assertIsNotNone(v1)
+
+        db_api.profile_update(self.ctx, profile.id,
+                              {'updated_time': datetime.datetime.utcnow()})
+        self.assertNotEqual(v1, db_api.profile_version(self.ctx, profile.id))
+        self.assertNotEqual(v1_all, db_api.profile_version_all(self.ctx))
+        self.assertIsNone(db_api.profile_version_all(
+            self.ctx, filters={'name': 'non-existent'}))
+
     def test_profile_update_not_found(self):
         self.assertRaises(exception.ProfileNotFound,
                           db_api.profile_update,
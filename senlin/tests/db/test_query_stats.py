@@ -0,0 +1,116 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_config import cfg
+
+from senlin.db.sqlalchemy import api as db_api
+from senlin.db.sqlalchemy import query_stats
+from senlin.tests.common import base
+from senlin.tests.common import utils
+from senlin.tests.db import shared
+
+
+class DBAPIQueryStatsTest(base.SenlinTestCase):
+    def setUp(self):
+        super(DBAPIQueryStatsTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        self.profile = shared.create_profile(self.ctx)
+        self.cluster = shared.create_cluster(self.ctx, self.profile)
+
+        engine = db_api.get_engine()
+        query_stats.install(engine)
+        self.addCleanup(query_stats.uninstall, engine)
+
+    def test_query_stats(self):
+        # Use a new context so that reads are not served by the session
+        ctx = utils.dummy_context()
+        with db_api.query_stats('ACTION_ID') as stats:
+            db_api.cluster_get(ctx, self.cluster.id)
+            db_api.profile_get(ctx, self.profile.id)
+
+        self.assertEqual('ACTION_ID', stats.owner)
+        self.assertTrue(stats.statements >= 2)
+        self.assertTrue(stats.time > 0)
+        self.assertEqual([], stats.slow)
+
+        # Statements outside the scope are not attributed to it
+        count = stats.statements
+        db_api.cluster_get(utils.dummy_context(), self.cluster.id)
+        self.assertEqual(count, stats.statements)
+
+    def test_query_stats_nested(self):
+        ctx = utils.dummy_context()
+        with db_api.query_stats('REQUEST_ID') as outer:
+            db_api.cluster_get(ctx, self.cluster.id)
+            with db_api.query_stats('ACTION_ID') as inner:
+                db_api.profile_get(ctx, self.profile.id)
+
+        self.assertTrue(inner.statements >= 1)
+        self.assertTrue(outer.statements > inner.statements)
+
+    def test_query_stats_slow_statement(self):
+        cfg.CONF.set_override('db_slow_query_threshold', 1e-9)
+        with db_api.query_stats('ACTION_ID') as stats:
+            db_api.cluster_get_by_name(utils.dummy_context(),
+                                       self.cluster.name)
+
+        self.assertEqual(stats.statements, len(stats.slow))
+        statements = [s['statement'] for s in stats.slow]
+        self.assertTrue(any('cluster.name' in s for s in statements))
+        for slow in stats.slow:
+            self.assertNotIn(self.cluster.name, slow['statement'])
+            self.assertNotIn(self.cluster.name, slow['parameters'])
+
+        res = stats.to_dict()
+        self.assertEqual(stats.statements, res['statements'])
+        self.assertEqual(stats.slow, res['slow_statements'])
+
+    def test_query_stats_slow_limit(self):
+        cfg.CONF.set_override('db_slow_query_threshold', 1e-9)
+        ctx = utils.dummy_context()
+        with db_api.query_stats('ACTION_ID') as stats:
+            for i in range(query_stats.MAX_SLOW_STATEMENTS + 1):
+                db_api.cluster_get(ctx, self.cluster.id)
+
+        self.assertEqual(query_stats.MAX_SLOW_STATEMENTS, len(stats.slow))
+        self.assertTrue(stats.statements > len(stats.slow))
+
+    def test_query_stats_slow_disabled(self):
+        cfg.CONF.set_override('db_slow_query_threshold', 0)
+        with db_api.query_stats('ACTION_ID') as stats:
+            db_api.cluster_get(utils.dummy_context(), self.cluster.id)
+
+        self.assertTrue(stats.statements >= 1)
+        self.assertEqual([], stats.slow)
+
+    def test_redact(self):
+        self.assertEqual('', query_stats._redact(()))
+        self.assertEqual('<2 parameters redacted>',
+                         query_stats._redact(('secret', 1)))
+        self.assertEqual('<2 parameter sets redacted>',
+                         query_stats._redact([('a', 1), ('b', 2)]))
+
+    def test_get_query_counters(self):
+        before = db_api.get_query_counters()
+        db_api.cluster_get(utils.dummy_context(), self.cluster.id)
+        after = db_api.get_query_counters()
+
+        self.assertTrue(after['statements'] > before['statements'])
+        self.assertTrue(after['time'] > before['time'])
+
+    def test_uninstall(self):
+        query_stats.uninstall(db_api.get_engine())
+        with db_api.query_stats('ACTION_ID') as stats:
+            db_api.cluster_get(utils.dummy_context(), self.cluster.id)
+
+        self.assertEqual(0, stats.statements)
@@ -11,6 +11,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
+import mock
+import six
 from sqlalchemy.dialects.mysql import base as mysql_base
 from sqlalchemy.dialects.sqlite import base as sqlite_base
 from sqlalchemy import types
@@ -37,7 +41,7 @@ class DictTest(testtools.TestCase):
         dialect = None
         value = {'foo': 'bar'}
         result = self.sqltype.process_bind_param(value, dialect)
-        self.assertEqual('{"foo": "bar"}', result)
+        self.assertEqual('{"foo":"bar"}', result)
 
     def test_process_bind_param_null(self):
         dialect = None
@@ -57,6 +61,14 @@ class DictTest(testtools.TestCase):
         result = self.sqltype.process_result_value(value, dialect)
         self.assertIsNone(result)
 
+    def test_process_result_value_not_shared(self):
+        dialect = None
+        value = '{"foo": "bar"}'
+        result1 = self.sqltype.process_result_value(value, dialect)
+        result1['foo'] = 'baz'
+        result2 = self.sqltype.process_result_value(value, dialect)
+        self.assertEqual({'foo': 'bar'}, result2)
+
 
 class ListTest(testtools.TestCase):
 
@@ -76,7 +88,7 @@ class ListTest(testtools.TestCase):
         dialect = None
         value = ['foo', 'bar']
         result = self.sqltype.process_bind_param(value, dialect)
-        self.assertEqual('["foo", "bar"]', result)
+        self.assertEqual('["foo","bar"]', result)
 
     def test_process_bind_param_null(self):
         dialect = None
@@ -95,3 +107,74 @@ class ListTest(testtools.TestCase):
         value = None
         result = self.sqltype.process_result_value(value, dialect)
         self.assertIsNone(result)
+
+
+class JSONCodecTest(testtools.TestCase):
+
+    def setUp(self):
+        super(JSONCodecTest, self).setUp()
+        self.codec = db_types.JSONCodec(decoder_module=json, cache_size=2)
+
+    def test_encode_compact(self):
+        result = self.codec.encode({'foo': ['bar', 1]})
+        self.assertEqual('{"foo":["bar",1]}', result)
+
+    def test_decode_flat_cached(self):
+        text = '{"foo": "bar"}'
+        result = self.codec.decode(text)
+        self.assertEqual({'foo': 'bar'}, result)
+        self.assertIn(text, self.codec._cache)
+        self.assertIsNot(result, self.codec._cache[text])
+
+        with mock.patch.object(self.codec, '_decode') as mock_decode:
+            result = self.codec.decode(text)
+            self.assertEqual(0, mock_decode.call_count)
+        self.assertEqual({'foo': 'bar'}, result)
+
+    def test_decode_list_values_cached(self):
+        text = '{"user": "u1", "roles": ["admin", "member"]}'
+        result = self.codec.decode(text)
+        self.assertIn(text, self.codec._cache)
+
+        # The lists are copied too, changes don't reach the cache
+        result['roles'].append('other')
+        self.assertEqual({'user': 'u1', 'roles': ['admin', 'member']},
+                         self.codec.decode(text))
+
+    def test_decode_nested_list_not_cached(self):
+        text = '{"roles": [{"name": "admin"}]}'
+        self.codec.decode(text)
+        self.assertNotIn(text, self.codec._cache)
+
+    def test_decode_nested_not_cached(self):
+        text = '{"foo": {"bar": "baz"}}'
+        result = self.codec.decode(text)
+        self.assertEqual({'foo': {'bar': 'baz'}}, result)
+        self.assertNotIn(text, self.codec._cache)
+
+    def test_decode_large_not_cached(self):
+        codec = db_types.JSONCodec(decoder_module=json, max_text_size=8)
+        text = '["foo", "bar"]'
+        self.assertEqual(['foo', 'bar'], codec.decode(text))
+        self.assertNotIn(text, codec._cache)
+
+    def test_decode_cache_bounded(self):
+        for text in ('[1]', '[2]', '[3]'):
+            self.codec.decode(text)
+        self.assertEqual(1, len(self.codec._cache))
+        self.assertIn('[3]', self.codec._cache)
+
+    def test_decode_null(self):
+        self.assertIsNone(self.codec.decode(None))
+        self.assertIsNone(self.codec.decode('null'))
+
+    @testtools.skipIf(six.PY3, 'simplejson returns text on py3')
+    def test_decoder_stdlib_on_py2(self):
+        # simplejson returns str for ASCII strings on py2
+        self.assertIs(json, db_types.JSONCodec().decoder_module)
+
+    def test_decode_stdlib_returns_text(self):
+        result = self.codec.decode('{"foo": ["bar"]}')
+        key = list(result.keys())[0]
+        self.assertIsInstance(key, six.text_type)
+        self.assertIsInstance(result[key][0], six.text_type)
@@ -0,0 +1,137 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import gzip
+import zlib
+
+from oslo_config import cfg
+import six
+import webob
+import webob.dec
+
+from senlin.api.middleware import compress
+from senlin.api.middleware import fault
+from senlin.tests.common import base
+
+BODY = b'{"clusters": [%s]}' % b', '.join([b'{"name": "c1"}'] * 200)
+
+
+def _gunzip(data):
+    return gzip.GzipFile(fileobj=six.BytesIO(data)).read()
+
+
+class CompressMiddlewareTest(base.SenlinTestCase):
+
+    def _app(self, body=BODY, app_iter=None, status=200):
+        @webob.dec.wsgify
+        def app(req):
+            resp = webob.Response(status=status,
+                                  content_type='application/json')
+            if app_iter is not None:
+                resp.app_iter = app_iter
+            else:
+                resp.body = body
+            return resp
+        return compress.CompressMiddleware(app)
+
+    def _get(self, app, encoding='gzip', method='GET'):
+        headers = {}
+        if encoding is not None:
+            headers['Accept-Encoding'] = encoding
+        req = webob.Request.blank('/clusters', method=method,
+                                  headers=headers)
+        return req.get_response(app)
+
+    def test_gzip(self):
+        resp = self._get(self._app())
+
+        self.assertEqual('gzip', resp.content_encoding)
+        self.assertIn('Accept-Encoding', resp.vary)
+        self.assertEqual(len(resp.body), resp.content_length)
+        self.assertEqual(BODY, _gunzip(resp.body))
+
+    def test_deflate(self):
+        resp = self._get(self._app(), encoding='gzip;q=0.5, deflate')
+
+        self.assertEqual('deflate', resp.content_encoding)
+        self.assertEqual(BODY, zlib.decompress(resp.body))
+
+    def test_no_accept_encoding(self):
+        resp = self._get(self._app(), encoding=None)
+
+        self.assertIsNone(resp.content_encoding)
+        self.assertIn('Accept-Encoding', resp.vary)
+        self.assertEqual(BODY, resp.body)
+
+    def test_unsupported_encoding(self):
+        resp = self._get(self._app(), encoding='identity, br')
+
+        self.assertIsNone(resp.content_encoding)
+        self.assertEqual(BODY, resp.body)
+
+    def test_below_min_size(self):
+        cfg.CONF.set_override('compress_min_size', len(BODY) + 1,
+                              group='senlin_api')
+        resp = self._get(self._app())
+
+        self.assertIsNone(resp.content_encoding)
+        self.assertEqual(BODY, resp.body)
+
+    def test_disabled(self):
+        cfg.CONF.set_override('compress_level', 0, group='senlin_api')
+        resp = self._get(self._app())
+
+        self.assertIsNone(resp.content_encoding)
+        self.assertIsNone(resp.vary)
+        self.assertEqual(BODY, resp.body)
+
+    def test_head_request(self):
+        resp = self._get(self._app(), method='HEAD')
+
+        self.assertIsNone(resp.content_encoding)
+
+    def test_streamed_response(self):
+        chunks = [b'{"nodes": [', b'{"name": "n1"}', b']}']
+        resp = self._get(self._app(app_iter=iter(chunks)))
+
+        self.assertEqual('gzip', resp.content_encoding)
+        self.assertIsNone(resp.content_length)
+        self.assertEqual(b''.join(chunks), _gunzip(resp.body))
+
+    def test_streamed_response_ignores_min_size(self):
+        cfg.CONF.set_override('compress_min_size', 1024 * 1024,
+                              group='senlin_api')
+        resp = self._get(self._app(app_iter=iter([b'{}'])),
+                         encoding='deflate')
+
+        self.assertEqual('deflate', resp.content_encoding)
+        self.assertEqual(b'{}', zlib.decompress(resp.body))
+
+    def test_error_response(self):
+        error = {'code': 404, 'title': 'Not Found',
+                 'explanation': 'x' * 2048,
+                 'error': {'type': 'ClusterNotFound'}}
+
+        @webob.dec.wsgify
+        def app(req):
+            return fault.Fault(error)
+
+        resp = self._get(compress.CompressMiddleware(app))
+
+        self.assertEqual(404, resp.status_int)
+        self.assertEqual('gzip', resp.content_encoding)
+        self.assertIn(b'ClusterNotFound', _gunzip(resp.body))
+
+    def test_no_content(self):
+        resp = self._get(self._app(body=b'', status=204))
+
+        self.assertIsNone(resp.content_encoding)
@@ -0,0 +1,203 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+from keystoneclient import access
+from keystoneclient import exceptions as keystone_exc
+from keystoneclient import fixture
+import mock
+import webob
+
+from senlin.common import auth_password
+from senlin.tests.common import base
+
+
+def _token_info(tenant_id='tenant_id1', expires_in=3600):
+    expires = (datetime.datetime.utcnow() +
+               datetime.timedelta(seconds=expires_in))
+    token = fixture.V2Token(token_id='token_id1', expires=expires,
+                            tenant_id=tenant_id, tenant_name='tenant_name1',
+                            user_id='user_id1', user_name='user_name1')
+    token.add_role(name='role1')
+    token.add_service('clustering').add_endpoint('http://senlin:8778')
+    return access.AccessInfo.factory(body=token)
+
+
+class FakeApp(object):
+    """This represents a WSGI app protected by our auth middleware."""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.environ = None
+
+    def __call__(self, environ, start_response):
+        self.environ = environ
+        resp = webob.Response(status=self.status)
+        resp.body = 'SUCCESS'
+        return resp(environ, start_response)
+
+
+@mock.patch.object(auth_password.keystone_client, 'Client')
+class KeystonePasswordAuthProtocolTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(KeystonePasswordAuthProtocolTest, self).setUp()
+        self.app = FakeApp()
+        self.middleware = auth_password.KeystonePasswordAuthProtocol(
+            self.app, {})
+
+    def _request(self, password='goodpassword', tenant='tenant_id1'):
+        req = webob.Request.blank('/%s/clusters' % tenant)
+        req.headers['X_AUTH_USER'] = 'user_name1'
+        req.headers['X_AUTH_KEY'] = password
+        req.headers['X_AUTH_URL'] = 'http://keystone:5000/v2.0'
+        return req.get_response(self.middleware)
+
+    def test_valid_request(self, mock_client):
+        mock_client.return_value.auth_ref = _token_info()
+        resp = self._request()
+
+        self.assertEqual(200, resp.status_int)
+        self.assertEqual('SUCCESS', resp.body)
+        self.assertEqual('token_id1', self.app.environ['HTTP_X_AUTH_TOKEN'])
+        self.assertEqual('tenant_id1', self.app.environ['HTTP_X_TENANT_ID'])
+        self.assertEqual('role1', self.app.environ['HTTP_X_ROLES'])
+        mock_client.assert_called_once_with(
+            username='user_name1', password='goodpassword',
+            tenant_id='tenant_id1', auth_url='http://keystone:5000/v2.0')
+
+    def test_request_with_bad_credentials(self, mock_client):
+        mock_client.side_effect = keystone_exc.Unauthorized
+        resp = self._request(password='badpassword')
+
+        self.assertEqual(401, resp.status_int)
+        self.assertIsNone(self.app.environ)
+
+        # Failures are not cached
+        self._request(password='badpassword')
+        self.assertEqual(2, mock_client.call_count)
+
+    def test_request_with_non_ascii_credentials(self, mock_client):
+        mock_client.side_effect = keystone_exc.Unauthorized
+        resp = self._request(password=u'p\xe4ssw\xf6rd'.encode('utf-8'))
+
+        self.assertEqual(401, resp.status_int)
+        self.assertEqual(1, mock_client.call_count)
+
+    def test_request_with_no_tenant_in_url(self, mock_client):
+        resp = self._request(tenant='')
+        self.assertEqual(401, resp.status_int)
+        self.assertEqual(0, mock_client.call_count)
+
+    def test_cached(self, mock_client):
+        mock_client.return_value.auth_ref = _token_info()
+        self._request()
+        self.app.environ = None
+        resp = self._request()
+
+        self.assertEqual(200, resp.status_int)
+        self.assertEqual('token_id1', self.app.environ['HTTP_X_AUTH_TOKEN'])
+        self.assertEqual(1, mock_client.call_count)
+
+    def test_cache_keyed_by_credentials(self, mock_client):
+        mock_client.return_value.auth_ref = _token_info()
+        self._request()
+        self._request(password='otherpassword')
+        self.assertEqual(2, mock_client.call_count)
+
+    def test_cache_token_expiring(self, mock_client):
+        mock_client.return_value.auth_ref = _token_info(expires_in=10)
+        self._request()
+        self._request()
+        self.assertEqual(2, mock_client.call_count)
+
+    def test_cache_invalidated_on_unauthorized(self, mock_client):
+        mock_client.return_value.auth_ref = _token_info()
+        self.app.status = 401
+        self._request()
+        self.app.status = 200
+        self._request()
+        self.assertEqual(2, mock_client.call_count)
+
+    def test_cache_disabled(self, mock_client):
+        self.middleware = auth_password.KeystonePasswordAuthProtocol(
+            self.app, {'token_cache_time': '0'})
+        mock_client.return_value.auth_ref = _token_info()
+        self._request()
+        self._request()
+        self.assertEqual(2, mock_client.call_count)
+
+
+class TokenCacheTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TokenCacheTest, self).setUp()
+        self.cache = auth_password.TokenCache(size=2, ttl=60)
+        self.token_info = _token_info()
+
+    def test_key(self):
+        key = self.cache.key('user', 'password', 'tenant', 'url')
+        self.assertNotIn('password', key)
+        self.assertEqual(key,
+                         self.cache.key('user', 'password', 'tenant', 'url'))
+        self.assertNotEqual(key,
+                            self.cache.key('user', 'other', 'tenant', 'url'))
+        # The salt differs between caches
+        other = auth_password.TokenCache()
+        self.assertNotEqual(key,
+                            other.key('user', 'password', 'tenant', 'url'))
+
+    def test_key_non_ascii(self):
+        password = u'p\xe4ssw\xf6rd'
+        key = self.cache.key(u'\u7528\u6237', password, 'tenant', None)
+        # Byte strings, as header values are on py2, give the same key
+        self.assertEqual(key,
+                         self.cache.key(u'\u7528\u6237'.encode('utf-8'),
+                                        password.encode('utf-8'),
+                                        b'tenant', None))
+        self.assertNotEqual(key,
+                            self.cache.key(u'\u7528\u6237', u'password',
+                                           'tenant', None))
+
+    @mock.patch.object(auth_password.time, 'time')
+    def test_ttl(self, mock_time):
+        mock_time.return_value = 100
+        self.cache.set('key', self.token_info, {'h': 'v'})
+        mock_time.return_value = 159
+        self.assertEqual((self.token_info, {'h': 'v'}),
+                         self.cache.get('key'))
+        mock_time.return_value = 160
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_size(self):
+        self.cache.set('key1', self.token_info, {})
+        self.cache.set('key2', self.token_info, {})
+        # key1 becomes the most recently used entry
+        self.assertIsNotNone(self.cache.get('key1'))
+        self.cache.set('key3', self.token_info, {})
+
+        self.assertIsNotNone(self.cache.get('key1'))
+        self.assertIsNone(self.cache.get('key2'))
+        self.assertIsNotNone(self.cache.get('key3'))
+
+    def test_invalidate(self):
+        self.cache.set('key1', self.token_info, {})
+        self.cache.set('key2', self.token_info, {})
+        self.cache.invalidate('key1')
+        self.assertIsNone(self.cache.get('key1'))
+        self.assertIsNotNone(self.cache.get('key2'))
+
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('key2'))
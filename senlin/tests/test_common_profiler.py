@@ -0,0 +1,133 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+
+import fixtures
+import mock
+from oslo_config import cfg
+import webob
+
+from senlin.common import profiler
+from senlin.tests.common import base
+
+
+class ProfilerTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(ProfilerTest, self).setUp()
+        self.dir = self.useFixture(fixtures.TempDir()).path
+        cfg.CONF.set_override('profile_dir', self.dir, group='profiling')
+        self.addCleanup(profiler.set_runtime, enabled=False, action_types=[])
+
+    def test_action_enabled(self):
+        self.assertFalse(profiler.action_enabled('CLUSTER_CREATE'))
+
+        cfg.CONF.set_override('action_types', ['CLUSTER_CREATE'],
+                              group='profiling')
+        self.assertTrue(profiler.action_enabled('CLUSTER_CREATE'))
+        self.assertFalse(profiler.action_enabled('CLUSTER_DELETE'))
+
+        cfg.CONF.set_override('enabled', True, group='profiling')
+        self.assertTrue(profiler.action_enabled('CLUSTER_DELETE'))
+
+    def test_set_runtime(self):
+        res = profiler.set_runtime(action_types=['NODE_CREATE'])
+        self.assertEqual({'enabled': False, 'action_types': ['NODE_CREATE'],
+                          'dir': self.dir}, res)
+        self.assertTrue(profiler.action_enabled('NODE_CREATE'))
+        self.assertFalse(profiler.action_enabled('NODE_DELETE'))
+
+        res = profiler.set_runtime(enabled=True)
+        self.assertTrue(res['enabled'])
+        self.assertEqual(['NODE_CREATE'], res['action_types'])
+        self.assertTrue(profiler.action_enabled('NODE_DELETE'))
+
+        res = profiler.set_runtime(enabled=False, action_types=[])
+        self.assertEqual({'enabled': False, 'action_types': [],
+                          'dir': self.dir}, res)
+        self.assertFalse(profiler.action_enabled('NODE_CREATE'))
+
+    def test_request_enabled(self):
+        req = webob.Request.blank('/clusters')
+        self.assertFalse(profiler.request_enabled(req))
+
+        # The header is only honoured for admin users
+        req.headers[profiler.PROFILE_HEADER] = '1'
+        self.assertFalse(profiler.request_enabled(req))
+        req.context = mock.Mock(is_admin=False)
+        self.assertFalse(profiler.request_enabled(req))
+        req.context = mock.Mock(is_admin=True)
+        self.assertTrue(profiler.request_enabled(req))
+
+        req = webob.Request.blank('/clusters')
+        profiler.set_runtime(enabled=True)
+        self.assertTrue(profiler.request_enabled(req))
+
+    def test_profile(self):
+        with profiler.profile('action-NODE_CREATE/1'):
+            sum(range(10))
+
+        files = os.listdir(self.dir)
+        self.assertEqual(1, len(files))
+        self.assertTrue(files[0].endswith('-action-NODE_CREATE_1.prof'))
+
+    def test_profile_disabled(self):
+        with profiler.profile('action-NODE_CREATE', enabled=False):
+            sum(range(10))
+
+        self.assertEqual([], os.listdir(self.dir))
+
+    def test_profile_overlapping_skipped(self):
+        with profiler.profile('outer'):
+            with profiler.profile('inner'):
+                sum(range(10))
+
+        files = os.listdir(self.dir)
+        self.assertEqual(1, len(files))
+        self.assertTrue(files[0].endswith('-outer.prof'))
+
+        # The next profile is taken again
+        with profiler.profile('next'):
+            pass
+        self.assertEqual(2, len(os.listdir(self.dir)))
+
+    def test_profile_released_on_error(self):
+        def run():
+            with profiler.profile('failed'):
+                raise ValueError('boom')
+
+        self.assertRaises(ValueError, run)
+        self.assertFalse(profiler._active.locked())
+        self.assertEqual(1, len(os.listdir(self.dir)))
+
+    def test_profile_retention(self):
+        cfg.CONF.set_override('max_files', 2, group='profiling')
+        for i in range(3):
+            path = os.path.join(self.dir, 'old-%d.prof' % i)
+            open(path, 'w').close()
+            os.utime(path, (i, i))
+
+        with profiler.profile('new'):
+            pass
+
+        files = sorted(os.listdir(self.dir))
+        self.assertEqual(2, len(files))
+        self.assertIn('old-2.prof', files)
+        self.assertTrue(files[0].endswith('-new.prof'))
+
+    def test_save_failure(self):
+        cfg.CONF.set_override('profile_dir', '/dev/null/profiles',
+                              group='profiling')
+        prof = mock.Mock()
+        self.assertIsNone(profiler.save(prof, 'new'))
+        self.assertEqual(0, prof.dump_stats.call_count)
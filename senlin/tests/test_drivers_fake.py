@@ -0,0 +1,78 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import random
+
+import eventlet
+import mock
+
+from senlin.common import exception
+from senlin.drivers import fake as fakecloud
+from senlin.tests.common import base
+
+
+class FakeCloudClientTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(FakeCloudClientTest, self).setUp()
+        self.patchobject(fakecloud, '_servers', new={})
+        self.mock_sleep = self.patchobject(eventlet, 'sleep')
+
+    def test_server_lifecycle(self):
+        fc = fakecloud.FakeCloudClient(mock.Mock())
+
+        server = fc.server_create('s1', metadata={'k': 'v'})
+        self.assertEqual('s1', server.name)
+        self.assertEqual('ACTIVE', server.status)
+        self.assertEqual(1, fakecloud.FakeCloudClient.server_count())
+        self.assertIs(server, fc.server_get(server.id))
+
+        fc.server_update(server.id, metadata={'k': 'w'})
+        self.assertEqual({'k': 'w'}, fc.server_get(server.id).metadata)
+
+        fc.server_delete(server.id)
+        self.assertEqual(0, fakecloud.FakeCloudClient.server_count())
+        self.assertRaises(exception.Error, fc.server_get, server.id)
+        self.assertFalse(self.mock_sleep.called)
+
+    def test_latency(self):
+        fc = fakecloud.FakeCloudClient(mock.Mock(),
+                                       latency={'mean': 0.5})
+        fc.server_create('s1')
+        self.mock_sleep.assert_called_once_with(0.5)
+
+    def test_latency_capped(self):
+        latency = {'distribution': fakecloud.EXPONENTIAL, 'mean': 1,
+                   'max': 0.2}
+        fc = fakecloud.FakeCloudClient(mock.Mock(), latency=latency,
+                                       rand=random.Random(1))
+        for i in range(20):
+            self.assertLessEqual(fc._latency(), 0.2)
+
+    def test_latency_uniform(self):
+        latency = {'distribution': fakecloud.UNIFORM, 'mean': 1}
+        fc = fakecloud.FakeCloudClient(mock.Mock(), latency=latency,
+                                       rand=random.Random(1))
+        for i in range(20):
+            value = fc._latency()
+            self.assertTrue(0 <= value <= 2)
+
+    def test_failure(self):
+        rand = mock.Mock()
+        rand.random.return_value = 0.1
+        fc = fakecloud.FakeCloudClient(mock.Mock(), failure_rate=0.5,
+                                       rand=rand)
+
+        ex = self.assertRaises(exception.Error, fc.server_create, 's1')
+        self.assertIn('Injected failure of fake server_create',
+                      str(ex))
+        self.assertEqual(0, fakecloud.FakeCloudClient.server_count())
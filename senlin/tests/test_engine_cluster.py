@@ -0,0 +1,87 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from senlin.engine import cluster as cluster_mod
+from senlin.engine import node as node_mod
+from senlin.profiles import base as profiles_base
+from senlin.tests.common import base
+
+
+@mock.patch.object(node_mod.Node, 'load_all')
+@mock.patch.object(profiles_base.Profile, 'load')
+class ClusterFromDBRecordTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(ClusterFromDBRecordTest, self).setUp()
+        self.ctx = mock.Mock()
+        self.record = mock.Mock(id='C1', profile_id='P1', status='ACTIVE')
+        self.record.name = 'c1'
+
+    def _from_db_record(self, fields):
+        cluster = cluster_mod.Cluster._from_db_record(self.ctx, self.record,
+                                                      fields=fields)
+        return cluster.to_dict(fields=fields)
+
+    def test_db_columns(self, mock_profile, mock_nodes):
+        cls = cluster_mod.Cluster
+        self.assertIsNone(cls.db_columns(None))
+        self.assertEqual(['id', 'status'], cls.db_columns(['status']))
+        self.assertEqual(['id', 'profile_id'],
+                         cls.db_columns(['profile_name']))
+        self.assertEqual(['id'], cls.db_columns(['nodes', 'policies']))
+
+    def test_no_runtime_field(self, mock_profile, mock_nodes):
+        res = self._from_db_record(['name', 'status'])
+
+        self.assertEqual({'name': 'c1', 'status': 'ACTIVE'}, res)
+        self.assertFalse(mock_profile.called)
+        self.assertFalse(mock_nodes.called)
+
+    def test_nodes(self, mock_profile, mock_nodes):
+        mock_nodes.return_value = iter([mock.Mock(id='N1'),
+                                        mock.Mock(id='N2')])
+
+        res = self._from_db_record(['nodes'])
+
+        self.assertEqual({'nodes': ['N1', 'N2']}, res)
+        mock_nodes.assert_called_once_with(self.ctx, cluster_id='C1')
+        self.assertFalse(mock_profile.called)
+
+    def test_policies(self, mock_profile, mock_nodes):
+        res = self._from_db_record(['policies'])
+
+        self.assertEqual({'policies': []}, res)
+        self.assertFalse(mock_profile.called)
+        self.assertFalse(mock_nodes.called)
+
+    def test_profile_name(self, mock_profile, mock_nodes):
+        mock_profile.return_value = mock.Mock()
+        mock_profile.return_value.name = 'p1'
+
+        res = self._from_db_record(['profile_name'])
+
+        self.assertEqual({'profile_name': 'p1'}, res)
+        mock_profile.assert_called_once_with(self.ctx, 'P1')
+        self.assertFalse(mock_nodes.called)
+
+    def test_all_runtime_fields(self, mock_profile, mock_nodes):
+        mock_profile.return_value = mock.Mock()
+        mock_profile.return_value.name = 'p1'
+        mock_nodes.return_value = iter([mock.Mock(id='N1')])
+
+        res = self._from_db_record(['id', 'nodes', 'policies',
+                                    'profile_name'])
+
+        self.assertEqual({'id': 'C1', 'nodes': ['N1'], 'policies': [],
+                          'profile_name': 'p1'}, res)
@@ -0,0 +1,59 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from senlin.common import consts
+from senlin.db import api as db_api
+from senlin.engine.actions import base as action_base
+from senlin.engine.actions import cluster_action
+from senlin.engine import node as node_mod
+from senlin.tests.common import base
+from senlin.tests.common import utils
+
+
+class ClusterDeleteTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(ClusterDeleteTest, self).setUp()
+        self.ctx = utils.dummy_context()
+        self.action = action_base.Action(self.ctx, consts.CLUSTER_DELETE,
+                                         target='C1')
+        self.cluster = mock.Mock()
+        self.cluster.do_delete.return_value = True
+
+    def _node(self, node_id, status, physical_id=None):
+        return mock.Mock(id=node_id, status=status, physical_id=physical_id,
+                         INIT=node_mod.Node.INIT, ERROR=node_mod.Node.ERROR)
+
+    @mock.patch.object(cluster_action.ClusterAction, '_delete_nodes')
+    @mock.patch.object(db_api, 'node_delete_many')
+    def test_do_delete_orphans(self, mock_delete_many, mock_delete_nodes):
+        self.cluster.get_nodes.return_value = [
+            self._node('N1', 'INIT'),
+            self._node('N2', 'ERROR'),
+            # A creation may still be running for this one
+            self._node('N3', 'CREATING'),
+            self._node('N4', 'ACTIVE', physical_id='S4'),
+            self._node('N5', 'ERROR', physical_id='S5'),
+        ]
+        mock_delete_nodes.return_value = (self.action.RES_OK, '')
+
+        res = self.action.do_delete(self.cluster, {})
+
+        self.assertEqual((self.action.RES_OK, ''), res)
+        mock_delete_many.assert_called_once_with(self.action.context,
+                                                 ['N1', 'N2'])
+        mock_delete_nodes.assert_called_once_with(
+            self.cluster, ['N3', 'N4', 'N5'],
+            {'deletion': {'destroy_after_delete': True}})
+        self.cluster.do_delete.assert_called_once_with(self.action.context)
@@ -0,0 +1,76 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from senlin.db import api as db_api
+from senlin.engine import index_allocator
+from senlin.tests.common import base
+
+
+class IndexAllocatorTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(IndexAllocatorTest, self).setUp()
+        self.allocator = index_allocator.IndexAllocator(block_size=3)
+        self.ctx = mock.Mock()
+
+    @mock.patch.object(db_api, 'cluster_reserve_indexes')
+    def test_allocate_from_block(self, mock_reserve):
+        mock_reserve.side_effect = [1, 4]
+
+        res = [self.allocator.allocate(self.ctx, 'C1') for i in range(4)]
+
+        self.assertEqual([1, 2, 3, 4], res)
+        self.assertEqual([mock.call(self.ctx, 'C1', 3),
+                          mock.call(self.ctx, 'C1', 3)],
+                         mock_reserve.call_args_list)
+
+    @mock.patch.object(db_api, 'cluster_reserve_indexes')
+    def test_allocate_per_cluster(self, mock_reserve):
+        mock_reserve.side_effect = [1, 7]
+
+        self.assertEqual(1, self.allocator.allocate(self.ctx, 'C1'))
+        self.assertEqual(7, self.allocator.allocate(self.ctx, 'C2'))
+        self.assertEqual(2, self.allocator.allocate(self.ctx, 'C1'))
+        self.assertEqual(8, self.allocator.allocate(self.ctx, 'C2'))
+        self.assertEqual(2, mock_reserve.call_count)
+
+    @mock.patch.object(db_api, 'cluster_reserve_indexes')
+    def test_allocate_reserve_outside_global_lock(self, mock_reserve):
+        def reserve(context, cluster_id, count):
+            # Other clusters can still be served during a reservation
+            self.assertFalse(self.allocator._lock.locked())
+            self.assertTrue(self.allocator._locks[cluster_id].locked())
+            return 1
+
+        mock_reserve.side_effect = reserve
+
+        self.assertEqual(1, self.allocator.allocate(self.ctx, 'C1'))
+
+    @mock.patch.object(db_api, 'cluster_reserve_indexes')
+    def test_allocate_cluster_not_found(self, mock_reserve):
+        mock_reserve.return_value = None
+
+        self.assertIsNone(self.allocator.allocate(self.ctx, 'C1'))
+        self.assertNotIn('C1', self.allocator._blocks)
+        self.assertNotIn('C1', self.allocator._locks)
+
+    @mock.patch.object(db_api, 'cluster_reserve_indexes')
+    def test_discard(self, mock_reserve):
+        mock_reserve.side_effect = [1, 10]
+        self.assertEqual(1, self.allocator.allocate(self.ctx, 'C1'))
+
+        self.allocator.discard('C1')
+
+        self.assertEqual(10, self.allocator.allocate(self.ctx, 'C1'))
+        self.assertEqual(2, mock_reserve.call_count)
@@ -0,0 +1,151 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from senlin.engine import metrics
+from senlin.tests.common import base
+
+
+class CounterTest(base.SenlinTestCase):
+
+    def test_inc(self):
+        c = metrics.Counter()
+        self.assertEqual(0, c.to_dict())
+
+        c.inc()
+        c.inc(5)
+        self.assertEqual(6, c.to_dict())
+
+
+class HistogramTest(base.SenlinTestCase):
+
+    def test_observe(self):
+        h = metrics.Histogram(buckets=[1, 0.1, 10])
+        self.assertEqual((0.1, 1, 10), h.buckets)
+
+        for value in (0.05, 0.1, 0.5, 20):
+            h.observe(value)
+
+        res = h.to_dict()
+        self.assertEqual(4, res['count'])
+        self.assertAlmostEqual(20.65, res['sum'])
+        self.assertEqual(20, res['max'])
+        self.assertEqual({'0.1': 2, '1': 1, '10': 0, 'inf': 1},
+                         res['buckets'])
+
+    def test_empty(self):
+        res = metrics.Histogram().to_dict()
+        self.assertEqual(0, res['count'])
+        self.assertEqual(0.0, res['sum'])
+        self.assertIsNone(res['max'])
+        self.assertEqual(len(metrics.DEFAULT_BUCKETS) + 1,
+                         len(res['buckets']))
+
+
+class RegistryTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(RegistryTest, self).setUp()
+        self.registry = metrics.Registry()
+
+    def test_counter_reused(self):
+        c = self.registry.counter('actions')
+        self.assertIs(c, self.registry.counter('actions'))
+        self.assertIsNot(c, self.registry.counter('other'))
+
+    def test_histogram_reused(self):
+        h = self.registry.histogram('lock_wait', buckets=[1, 2])
+        self.assertIs(h, self.registry.histogram('lock_wait'))
+        self.assertEqual((1, 2), h.buckets)
+
+    def test_snapshot(self):
+        self.registry.counter('actions').inc(3)
+        self.registry.histogram('lock_wait', buckets=[1]).observe(0.5)
+        self.registry.gauge('queue_depth', lambda: 7)
+
+        res = self.registry.snapshot()
+
+        self.assertEqual({'actions': 3}, res['counters'])
+        self.assertEqual({'queue_depth': 7}, res['gauges'])
+        self.assertEqual(1, res['histograms']['lock_wait']['count'])
+        self.assertEqual({'1': 1, 'inf': 0},
+                         res['histograms']['lock_wait']['buckets'])
+
+    def test_snapshot_gauge_error(self):
+        def broken():
+            raise ValueError('boom')
+
+        self.registry.gauge('broken', broken)
+        self.registry.gauge('fine', lambda: 1)
+
+        res = self.registry.snapshot()
+
+        self.assertEqual({'broken': None, 'fine': 1}, res['gauges'])
+        self.assertIn('Failed reading gauge broken', self.LOG.output)
+
+    def test_gauge_replaced(self):
+        self.registry.gauge('workers', lambda: 1)
+        self.registry.gauge('workers', lambda: 2)
+        self.assertEqual({'workers': 2}, self.registry.snapshot()['gauges'])
+
+    def test_reset(self):
+        self.registry.counter('actions').inc()
+        self.registry.histogram('lock_wait').observe(1)
+        self.registry.gauge('workers', lambda: 1)
+
+        self.registry.reset()
+
+        self.assertEqual({'counters': {}, 'histograms': {}, 'gauges': {}},
+                         self.registry.snapshot())
+
+
+class ModuleTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(ModuleTest, self).setUp()
+        self.registry = metrics.Registry()
+        self.patchobject(metrics, 'REGISTRY', new=self.registry)
+
+    def test_helpers(self):
+        metrics.counter('actions').inc()
+        metrics.histogram('lock_wait').observe(1)
+        metrics.gauge('workers', lambda: 4)
+
+        res = metrics.snapshot()
+        self.assertEqual({'actions': 1}, res['counters'])
+        self.assertEqual(1, res['histograms']['lock_wait']['count'])
+        self.assertEqual({'workers': 4}, res['gauges'])
+
+    @mock.patch('time.time')
+    def test_timer(self, mock_time):
+        mock_time.side_effect = [10.0, 12.5]
+
+        with metrics.timer('action_time'):
+            pass
+
+        res = self.registry.histogram('action_time').to_dict()
+        self.assertEqual(1, res['count'])
+        self.assertEqual(2.5, res['sum'])
+
+    @mock.patch('time.time')
+    def test_timer_exception(self, mock_time):
+        mock_time.side_effect = [10.0, 11.0]
+
+        def run():
+            with metrics.timer('action_time'):
+                raise ValueError('boom')
+
+        self.assertRaises(ValueError, run)
+        res = self.registry.histogram('action_time').to_dict()
+        self.assertEqual(1, res['count'])
+        self.assertEqual(1.0, res['sum'])
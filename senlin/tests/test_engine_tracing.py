@@ -0,0 +1,219 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import json
+import os
+
+import fixtures
+import mock
+from oslo_config import cfg
+
+from senlin.db import api as db_api
+from senlin.engine.actions import base as action_base
+from senlin.engine import tracing
+from senlin.tests.common import base
+
+
+class SpanTest(base.SenlinTestCase):
+
+    @mock.patch('time.time')
+    def test_span(self, mock_time):
+        mock_time.side_effect = [10.0, 12.0, 13.0]
+        sp = tracing.Span('load', 'A1.1', 'A1', target='C1')
+        self.assertIsNone(sp.duration)
+
+        sp.finish()
+        self.assertEqual(2.0, sp.duration)
+        # Finishing again keeps the first end time
+        sp.finish()
+        self.assertEqual(2.0, sp.duration)
+
+        self.assertEqual({'name': 'load', 'span_id': 'A1.1',
+                          'parent_id': 'A1', 'start': 10.0, 'duration': 2.0,
+                          'attrs': {'target': 'C1'}}, sp.to_dict())
+
+    def test_to_dict_no_attrs(self):
+        sp = tracing.Span('load', 'A1.1')
+        self.assertNotIn('attrs', sp.to_dict())
+
+
+class TraceTest(base.SenlinTestCase):
+
+    def test_child_spans(self):
+        tr = tracing.Trace('CLUSTER_CREATE', 'A1')
+
+        outer = tr.child('execute')
+        inner = tr.child('lock.cluster')
+        self.assertEqual('A1.1', outer.span_id)
+        self.assertEqual('A1', outer.parent_id)
+        self.assertEqual('A1.2', inner.span_id)
+        self.assertEqual('A1.1', inner.parent_id)
+
+        tr.finish_child(inner)
+        after = tr.child('policy_check')
+        self.assertEqual('A1.3', after.span_id)
+        self.assertEqual('A1.1', after.parent_id)
+        tr.finish_child(after)
+        tr.finish_child(outer)
+
+        self.assertEqual([inner, after, outer], tr.spans)
+        self.assertIsNotNone(inner.duration)
+        self.assertEqual([tr.root], tr._stack)
+
+    def test_link(self):
+        tr = tracing.Trace('NODE_CREATE', 'A2')
+        self.assertEqual('A2', tr.trace_id)
+
+        tr.link('A0', 'A1')
+
+        res = tr.to_dict()
+        self.assertEqual('A0', res['trace_id'])
+        self.assertEqual('A2', res['span_id'])
+        self.assertEqual('A1', res['parent_id'])
+        self.assertEqual([], res['spans'])
+
+
+class TracingTest(base.SenlinTestCase):
+
+    def test_trace_disabled(self):
+        with tracing.trace('ActionProc', 'A1') as tr:
+            self.assertIsNone(tr)
+            self.assertIsNone(tracing.current())
+            with tracing.span('load') as sp:
+                self.assertIsNone(sp)
+
+    def test_trace_enabled(self):
+        cfg.CONF.set_override('action_tracing', True)
+
+        with tracing.trace('ActionProc', 'A1') as tr:
+            self.assertIs(tr, tracing.current())
+            with tracing.span('load', target='C1') as sp:
+                self.assertEqual('A1.1', sp.span_id)
+
+        self.assertIsNone(tracing.current())
+        self.assertIsNotNone(tr.root.duration)
+        self.assertEqual([sp], tr.spans)
+        self.assertEqual({'target': 'C1'}, sp.attrs)
+
+    def test_trace_nested_restores_previous(self):
+        cfg.CONF.set_override('action_tracing', True)
+
+        with tracing.trace('ActionProc', 'A1') as outer:
+            with tracing.trace('ActionProc', 'A2') as inner:
+                self.assertIs(inner, tracing.current())
+            self.assertIs(outer, tracing.current())
+
+    def test_span_finished_on_error(self):
+        cfg.CONF.set_override('action_tracing', True)
+
+        def run():
+            with tracing.span('execute'):
+                raise ValueError('boom')
+
+        with tracing.trace('ActionProc', 'A1') as tr:
+            self.assertRaises(ValueError, run)
+
+        self.assertEqual(1, len(tr.spans))
+        self.assertIsNotNone(tr.spans[0].duration)
+
+    def test_trace_exported(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'trace.json')
+        cfg.CONF.set_override('action_tracing', True)
+        cfg.CONF.set_override('trace_file', path)
+
+        with tracing.trace('ActionProc', 'A1'):
+            with tracing.span('load'):
+                pass
+        with tracing.trace('ActionProc', 'A2'):
+            pass
+
+        with open(path) as f:
+            data = f.read()
+        self.assertTrue(data.startswith('[\n'))
+        # The array is left open so that events can be appended
+        events = json.loads(data.rstrip(',\n') + ']')
+        self.assertEqual(['ActionProc', 'load', 'ActionProc'],
+                         [e['name'] for e in events])
+        self.assertEqual('A1.1', events[1]['args']['span_id'])
+        self.assertEqual('A1', events[1]['args']['parent_id'])
+        self.assertEqual('X', events[0]['ph'])
+
+    def test_export_error(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'missing', 'trace.json')
+        tr = tracing.Trace('ActionProc', 'A1')
+        tr.root.finish()
+
+        tracing.export(tr, path)
+
+        self.assertIn('Failed writing trace of A1', self.LOG.output)
+
+
+class TraceLinkTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(TraceLinkTest, self).setUp()
+        self.ctx = mock.Mock()
+        self.trace = tracing.Trace('NODE_CREATE', 'A9')
+
+    def _action(self, cause, depended_by):
+        return mock.Mock(cause=cause, depended_by=depended_by)
+
+    @mock.patch.object(db_api, 'action_get')
+    def test_not_derived(self, mock_get):
+        action = self._action(action_base.CAUSE_RPC, ['A1'])
+
+        action_base._trace_link(self.ctx, action, self.trace)
+
+        self.assertEqual('A9', self.trace.trace_id)
+        self.assertIsNone(self.trace.root.parent_id)
+        self.assertFalse(mock_get.called)
+
+    @mock.patch.object(db_api, 'action_get')
+    def test_link_to_root(self, mock_get):
+        action = self._action(action_base.CAUSE_DERIVED, ['A2'])
+        mock_get.side_effect = [
+            self._action(action_base.CAUSE_DERIVED, ['A1']),
+            self._action(action_base.CAUSE_RPC, []),
+        ]
+
+        action_base._trace_link(self.ctx, action, self.trace)
+
+        self.assertEqual('A1', self.trace.trace_id)
+        self.assertEqual('A2', self.trace.root.parent_id)
+        self.assertEqual([mock.call(self.ctx, 'A2'),
+                          mock.call(self.ctx, 'A1')],
+                         mock_get.call_args_list)
+
+    @mock.patch.object(db_api, 'action_get')
+    def test_parent_missing(self, mock_get):
+        action = self._action(action_base.CAUSE_DERIVED, ['A2'])
+        mock_get.return_value = None
+
+        action_base._trace_link(self.ctx, action, self.trace)
+
+        self.assertEqual('A2', self.trace.trace_id)
+        self.assertEqual('A2', self.trace.root.parent_id)
+
+    @mock.patch.object(db_api, 'action_get')
+    def test_depth_limit(self, mock_get):
+        action = self._action(action_base.CAUSE_DERIVED, ['A0'])
+        # A cycle of derived actions must not be followed forever
+        mock_get.return_value = self._action(action_base.CAUSE_DERIVED,
+                                             ['A0'])
+
+        action_base._trace_link(self.ctx, action, self.trace)
+
+        self.assertEqual(action_base.MAX_TRACE_DEPTH, mock_get.call_count)
+        self.assertEqual('A0', self.trace.trace_id)
+        self.assertEqual('A0', self.trace.root.parent_id)
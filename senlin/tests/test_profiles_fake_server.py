@@ -0,0 +1,62 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+
+from senlin.drivers import fake as fakecloud
+from senlin.profiles.fake import server
+from senlin.tests.common import base
+from senlin.tests.common import utils
+
+
+class FakeServerProfileTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(FakeServerProfileTest, self).setUp()
+        self.patchobject(fakecloud, '_servers', new={})
+        self.ctx = utils.dummy_context()
+
+    def _profile(self, **spec):
+        return server.FakeServerProfile('fake.server', 'p1',
+                                        context=self.ctx, spec=spec)
+
+    def test_create_update_delete(self):
+        profile = self._profile(metadata={'k': 'v'})
+        node = mock.Mock()
+        node.name = 'node1'
+
+        node.physical_id = profile.do_create(node)
+        self.assertIsNotNone(node.physical_id)
+        self.assertTrue(profile.do_check(node))
+        fc = profile.cloud()
+        self.assertEqual({'k': 'v'}, fc.server_get(node.physical_id).metadata)
+
+        new_profile = self._profile(metadata={'k': 'w'})
+        self.assertTrue(profile.do_update(node, new_profile))
+        self.assertEqual({'k': 'w'}, fc.server_get(node.physical_id).metadata)
+
+        self.assertTrue(profile.do_delete(node))
+        self.assertFalse(profile.do_check(node))
+
+    def test_create_failure(self):
+        profile = self._profile(failure_rate=1)
+        node = mock.Mock()
+        node.name = 'node1'
+
+        self.assertIsNone(profile.do_create(node))
+        self.assertIn('Failed creating fake server', self.LOG.output)
+        self.assertEqual(0, fakecloud.FakeCloudClient.server_count())
+
+    def test_update_no_physical_id(self):
+        profile = self._profile()
+        node = mock.Mock(physical_id=None)
+        self.assertTrue(profile.do_update(node, self._profile()))
@@ -11,7 +11,10 @@
 # under the License.
 
 import datetime
+import json
 
+import fixtures
+import mock
 import webob
 
 from senlin.common import serializers
@@ -48,3 +51,143 @@ class JSONResponseSerializerTest(base.SenlinTestCase):
         self.assertEqual(1, len(content_types))
         self.assertEqual('application/json', response.content_type)
         self.assertEqual('{"key": "value"}', response.body)
+
+    def test_default_streamed(self):
+        pages = iter([[{'id': 1}, {'id': 2}], [], [{'id': 3}]])
+        fixture = {'nodes': serializers.StreamedList(pages)}
+        response = webob.Response()
+        serializers.JSONResponseSerializer().default(response, fixture)
+
+        self.assertEqual('application/json', response.content_type)
+        self.assertIsNone(response.content_length)
+        self.assertEqual('{"nodes": [{"id": 1}, {"id": 2}, {"id": 3}]}',
+                         ''.join(response.app_iter))
+
+    def test_default_cached(self):
+        fixture = serializers.CachedBody({"key": "value"})
+        serializer = serializers.JSONResponseSerializer()
+        with mock.patch.object(serializers, '_encoder') as mock_encoder:
+            mock_encoder.encode.return_value = '{"key": "value"}'
+            for i in range(2):
+                response = webob.Response()
+                serializer.default(response, fixture)
+                self.assertEqual('application/json', response.content_type)
+                self.assertEqual('{"key": "value"}', response.body)
+
+        mock_encoder.encode.assert_called_once_with(fixture)
+
+    def test_iter_json(self):
+        fixture = {
+            'nodes': serializers.StreamedList(
+                [[{'id': 1}, {'id': 2}], [{'id': 3}]]),
+        }
+        chunks = list(serializers.JSONResponseSerializer().iter_json(fixture))
+
+        self.assertEqual(['{"nodes": ', '[{"id": 1}, {"id": 2}', ', {"id": 3}',
+                          ']', '}'], chunks)
+
+    def test_iter_json_page_error(self):
+        def pages():
+            yield [{'id': 1}]
+            raise ValueError('engine gone')
+
+        fixture = {'nodes': serializers.StreamedList(pages())}
+        body = ''.join(serializers.JSONResponseSerializer().iter_json(fixture))
+
+        self.assertEqual({'nodes': [{'id': 1}],
+                          'error': {'code': 500, 'type': 'ValueError',
+                                    'message': 'engine gone',
+                                    'truncated': 'nodes'}},
+                         json.loads(body))
+        self.assertIn('Failed streaming the nodes of a response',
+                      self.LOG.output)
+
+    def test_iter_json_first_page_error(self):
+        def pages():
+            raise ValueError('engine gone')
+            yield
+
+        fixture = {'nodes': serializers.StreamedList(pages())}
+        body = ''.join(serializers.JSONResponseSerializer().iter_json(fixture))
+
+        res = json.loads(body)
+        self.assertEqual([], res['nodes'])
+        self.assertEqual('ValueError', res['error']['type'])
+
+    def test_iter_json_empty(self):
+        fixture = {'nodes': serializers.StreamedList([[]])}
+        body = ''.join(serializers.JSONResponseSerializer().iter_json(fixture))
+        self.assertEqual('{"nodes": []}', body)
+
+    @mock.patch.object(serializers.LOG, 'debug')
+    @mock.patch.object(serializers.LOG, 'isEnabledFor', return_value=True)
+    def test_to_json_debug_log_capped(self, mock_enabled, mock_debug):
+        fixture = {"key": "x" * (serializers.MAX_LOG_LENGTH * 2)}
+        serializers.JSONResponseSerializer().to_json(fixture)
+
+        args = mock_debug.call_args[0][1]
+        self.assertEqual('JSON', args['kind'])
+        self.assertTrue(args['response'].startswith('{"key": "xxx'))
+        self.assertTrue(args['response'].endswith(
+            '... (%d characters)' % (serializers.MAX_LOG_LENGTH * 2 + 11)))
+
+    @mock.patch.object(serializers.LOG, 'debug')
+    @mock.patch.object(serializers.LOG, 'isEnabledFor', return_value=False)
+    def test_to_json_no_debug_log(self, mock_enabled, mock_debug):
+        serializers.JSONResponseSerializer().to_json({"key": "value"})
+        self.assertEqual(0, mock_debug.call_count)
+
+
+class NegotiateTest(base.SenlinTestCase):
+
+    def test_json_by_default(self):
+        serializer = serializers.JSONResponseSerializer()
+        for accept in (None, '*/*', 'application/json'):
+            req = webob.Request.blank('/')
+            if accept:
+                req.accept = accept
+            self.assertIs(serializer,
+                          serializers.negotiate(req, serializer))
+
+    def test_msgpack(self):
+        self.patchobject(serializers, 'msgpack')
+        req = webob.Request.blank('/')
+        req.accept = 'application/x-msgpack, application/json;q=0.5'
+        res = serializers.negotiate(req,
+                                    serializers.JSONResponseSerializer())
+        self.assertIsInstance(res, serializers.MsgPackResponseSerializer)
+
+    def test_msgpack_not_installed(self):
+        self.useFixture(fixtures.MonkeyPatch(
+            'senlin.common.serializers.msgpack', None))
+        req = webob.Request.blank('/')
+        req.accept = 'application/x-msgpack'
+        serializer = serializers.JSONResponseSerializer()
+        self.assertIs(serializer, serializers.negotiate(req, serializer))
+
+    def test_other_serializer(self):
+        req = webob.Request.blank('/')
+        req.accept = 'application/x-msgpack'
+        serializer = mock.Mock()
+        self.assertIs(serializer, serializers.negotiate(req, serializer))
+
+
+class MsgPackResponseSerializerTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(MsgPackResponseSerializerTest, self).setUp()
+        if serializers.msgpack is None:
+            self.skipTest('msgpack is not installed')
+
+    def test_default(self):
+        fixture = {
+            'date': datetime.datetime(1, 3, 8, 2),
+            'nodes': serializers.StreamedList([[{'id': 1}], [{'id': 2}]]),
+        }
+        response = webob.Response()
+        serializers.MsgPackResponseSerializer().default(response, fixture)
+
+        self.assertEqual('application/x-msgpack', response.content_type)
+        self.assertEqual({'date': '0001-03-08T02:00:00',
+                          'nodes': [{'id': 1}, {'id': 2}]},
+                         serializers.msgpack.unpackb(response.body))
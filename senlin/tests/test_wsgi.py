@@ -12,11 +12,15 @@
 
 
 import json
+
+import mock
 import six
 
 from oslo_config import cfg
+import routes
 import stubout
 import webob
+import webob.dec
 
 from senlin.common import exception
 from senlin.common import wsgi
@@ -255,6 +259,123 @@ class ResourceExceptionHandlingTest(base.SenlinTestCase):
         self.assertNotIn(six.text_type(e), self.LOG.output)
 
 
+def _app(name):
+    @webob.dec.wsgify
+    def app(req):
+        args = req.environ['wsgiorg.routing_args'][1]
+        return '%s %s' % (name, args['action'])
+    return app
+
+
+class RouteTableTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(RouteTableTest, self).setUp()
+        self.mapper = routes.Mapper()
+        with self.mapper.submapper(controller=_app('things'),
+                                   path_prefix='/{tenant_id}') as sub:
+            sub.connect('/things', action='index',
+                        conditions={'method': 'GET'})
+            sub.connect('/things', action='create',
+                        conditions={'method': 'POST'})
+            sub.connect('/things/batch', action='batch',
+                        conditions={'method': 'GET'})
+            sub.connect('/things/{thing_id}', action='get',
+                        conditions={'method': ['GET', 'HEAD']})
+            sub.connect('/things/{thing_id}/action', action='action')
+            sub.connect('/things/{thing_id}/other', action='other',
+                        conditions={'method': 'PUT'})
+            sub.connect('/things/other/{other_id}', action='shadowed',
+                        conditions={'method': 'PUT'})
+
+    def _assertSameMatch(self, method, path):
+        expected = self.mapper.routematch(
+            environ={'REQUEST_METHOD': method, 'PATH_INFO': path})
+        actual = wsgi.RouteTable.compile(self.mapper).match(method, path)
+        if not expected:
+            self.assertIsNone(actual)
+        else:
+            self.assertIs(expected[1], actual[0])
+            self.assertEqual(expected[0], actual[1])
+        return actual
+
+    def test_match(self):
+        route, args = self._assertSameMatch('GET', '/aaaa/things/bbbb')
+        self.assertEqual('get', args['action'])
+        self.assertEqual(u'aaaa', args['tenant_id'])
+        self.assertEqual(u'bbbb', args['thing_id'])
+        self.assertIsInstance(args['thing_id'], six.text_type)
+
+        for method in ('GET', 'POST', 'HEAD', 'DELETE'):
+            self._assertSameMatch(method, '/aaaa/things')
+            self._assertSameMatch(method, '/aaaa/things/bbbb')
+            self._assertSameMatch(method, '/aaaa/things/bbbb/action')
+            self._assertSameMatch(method, '/aaaa/things/batch')
+
+    def test_declaration_order(self):
+        # A static segment declared first wins over a variable one
+        route, args = self._assertSameMatch('GET', '/aaaa/things/batch')
+        self.assertEqual('batch', args['action'])
+        # A variable segment declared first wins over a static one
+        route, args = self._assertSameMatch('PUT', '/aaaa/things/other/other')
+        self.assertEqual('other', args['action'])
+        route, args = self._assertSameMatch('PUT', '/aaaa/things/other/cccc')
+        self.assertEqual('shadowed', args['action'])
+
+    def test_no_match(self):
+        for path in ('', '/', '/aaaa', '/aaaa/things/', '/aaaa//things',
+                     '/aaaa/things/bbbb/action/cccc', '/aaaa/others'):
+            self.assertIsNone(self._assertSameMatch('GET', path))
+        self.assertIsNone(self._assertSameMatch('DELETE', '/aaaa/things'))
+
+    def test_not_compilable(self):
+        self.mapper.connect('/{tenant_id}/things/{thing_id}.{format}',
+                            controller=_app('things'), action='get')
+        self.assertIsNone(wsgi.RouteTable.compile(self.mapper))
+
+    def test_requirements_not_compilable(self):
+        self.mapper.connect('/{tenant_id}/numbers/{number}',
+                            controller=_app('things'), action='get',
+                            requirements={'number': r'\d+'})
+        self.assertIsNone(wsgi.RouteTable.compile(self.mapper))
+
+
+class RouterTest(base.SenlinTestCase):
+
+    def setUp(self):
+        super(RouterTest, self).setUp()
+        mapper = routes.Mapper()
+        mapper.connect('/things/{thing_id}', controller=_app('things'),
+                       action='get', conditions={'method': 'GET'})
+        mapper.connect('/things/{thing_id}', controller=_app('things'),
+                       action='delete', conditions={'method': 'DELETE'})
+        self.router = wsgi.Router(mapper)
+
+    def test_compiled(self):
+        self.assertIsNotNone(self.router._table)
+        request = wsgi.Request.blank('/things/aaaa')
+        response = request.get_response(self.router)
+        self.assertEqual(200, response.status_int)
+        self.assertEqual('things get', response.body)
+        args = request.environ['wsgiorg.routing_args'][1]
+        self.assertEqual(u'aaaa', args['thing_id'])
+
+    def test_not_found(self):
+        response = wsgi.Request.blank('/others').get_response(self.router)
+        self.assertEqual(404, response.status_int)
+
+    def test_method_override(self):
+        self.router._table = None
+        request = wsgi.Request.blank('/things/aaaa?_method=DELETE')
+        response = request.get_response(self.router)
+        self.assertEqual('things delete', response.body)
+
+        self.router._table = mock.Mock()
+        response = request.get_response(self.router)
+        self.assertEqual('things delete', response.body)
+        self.assertEqual(0, self.router._table.match.call_count)
+
+
 class JSONRequestDeserializerTest(base.SenlinTestCase):
 
     def test_has_body_no_content_length(self):
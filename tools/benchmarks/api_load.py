@@ -0,0 +1,375 @@
+#!/usr/bin/env python
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+'''
+Load test of the Senlin API running in-process.
+
+The WSGI application is built from the senlin-api pipeline of
+etc/senlin/api-paste.ini, without the keystone middlewares, and the
+identity of the caller is given by the headers keystone would have set.
+The engine RPC client is replaced by a stub returning canned responses of
+realistic size, so that only the cost of the API service is measured.
+
+A weighted mix of requests (listings with filters and pagination, gets,
+creates and cluster actions) is sent to the application and the report
+gives:
+
+- the p50/p99 latency of each type of request;
+- the mean self time spent in each middleware of the pipeline;
+- the mean time spent deserializing the request, in the controller
+  (excluding the RPC stub) and serializing the response.
+
+Usage: python tools/benchmarks/api_load.py [--requests N] [--page-size N]
+'''
+
+import argparse
+import collections
+import json
+import os
+import random
+import timeit
+import uuid
+
+from oslo_config import cfg
+from paste import deploy
+from six.moves import configparser
+import webob
+
+from senlin.common import messaging
+from senlin.common import wsgi
+from senlin.rpc import client as rpc_client
+
+CONF = cfg.CONF
+
+TOP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+PASTE_CONFIG = os.path.join(TOP_DIR, 'etc', 'senlin', 'api-paste.ini')
+POLICY_FILE = os.path.join(TOP_DIR, 'etc', 'senlin', 'policy.json')
+
+PIPELINE = 'senlin-api'
+
+# Middlewares needing a keystone server, replaced by the identity headers
+SKIPPED_FILTERS = ('authurl', 'authtoken')
+
+TENANT = 'bench'
+
+HEADERS = {
+    'X-Tenant-Id': TENANT,
+    'X-Project-Id': TENANT,
+    'X-Tenant-Name': 'bench',
+    'X-User-Id': 'bench-user',
+    'X-User-Name': 'bench',
+    'X-Roles': 'admin',
+    'X-Auth-Token': 'bench-token',
+}
+
+
+class Timings(object):
+    '''Self time of nested, named blocks of code.
+
+    The time of a block excludes the time of the blocks nested in it, so
+    that the time of a middleware does not include the layers below it.
+    '''
+
+    def __init__(self):
+        self.totals = collections.defaultdict(float)
+        self.counts = collections.defaultdict(int)
+        self._children = []
+
+    def measure(self, name, func, *args, **kwargs):
+        self._children.append(0.0)
+        start = timeit.default_timer()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = timeit.default_timer() - start
+            self.totals[name] += elapsed - self._children.pop()
+            self.counts[name] += 1
+            if self._children:
+                self._children[-1] += elapsed
+
+    def reset(self):
+        self.totals.clear()
+        self.counts.clear()
+
+
+TIMINGS = Timings()
+
+
+class TimedApp(object):
+    '''WSGI wrapper timing the layer it wraps.'''
+
+    def __init__(self, name, app):
+        self.name = name
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        # The response is consumed here so that lazily produced bodies are
+        # charged to the layer that produces them
+        return TIMINGS.measure(
+            self.name, lambda: list(self.app(environ, start_response)))
+
+
+def pipeline_filters():
+    parser = configparser.RawConfigParser()
+    parser.read(PASTE_CONFIG)
+    names = parser.get('pipeline:%s' % PIPELINE, 'pipeline').split()
+    return [n for n in names[:-1] if n not in SKIPPED_FILTERS], names[-1]
+
+
+def load_app():
+    '''Build the API pipeline, with each of its layers timed.'''
+    filters, app_name = pipeline_filters()
+    config = 'config:%s' % PASTE_CONFIG
+
+    wsgi.setup_paste_factories(CONF)
+    try:
+        app = TimedApp(app_name, deploy.loadapp(config, name=app_name))
+        for name in reversed(filters):
+            app = TimedApp(name, deploy.loadfilter(config, name=name)(app))
+    finally:
+        wsgi.teardown_paste_factories()
+    return app, filters + [app_name]
+
+
+# Stages of the request processing in wsgi.Resource, and the engine stub
+STAGES = ('deserialize', 'controller', 'serialize', 'rpc_stub')
+
+_dispatch = wsgi.Resource.dispatch
+
+
+def _timed_dispatch(self, obj, action, *args, **kwargs):
+    if obj is self.controller:
+        name = 'controller'
+    elif obj is self.deserializer:
+        name = 'deserialize'
+    else:
+        name = 'serialize'
+    return TIMINGS.measure(name, _dispatch, self, obj, action,
+                           *args, **kwargs)
+
+
+class FakeEngine(object):
+    '''Canned responses to the engine RPC calls.'''
+
+    def __init__(self, page_size):
+        self.page_size = page_size
+        self.ids = [str(uuid.uuid4()) for i in range(page_size)]
+
+    def _timestamp(self):
+        return '2015-06-01T12:00:00'
+
+    def cluster(self, i=0):
+        return {
+            'id': self.ids[i], 'name': 'cluster-%d' % i,
+            'profile_id': self.ids[0], 'profile_name': 'bench-profile',
+            'user': 'bench-user', 'project': TENANT, 'domain': None,
+            'parent': None, 'init_time': self._timestamp(),
+            'created_time': self._timestamp(), 'updated_time': None,
+            'deleted_time': None, 'min_size': 0, 'max_size': -1,
+            'desired_capacity': 10, 'timeout': 3600, 'status': 'ACTIVE',
+            'status_reason': 'Cluster creation succeeded.',
+            'tags': {'group': 'bench'}, 'data': {},
+            'nodes': self.ids[:10], 'policies': [],
+        }
+
+    def node(self, i=0):
+        return {
+            'id': self.ids[i], 'name': 'node-%d' % i,
+            'physical_id': self.ids[-1 - i], 'cluster_id': self.ids[0],
+            'profile_id': self.ids[0], 'profile_name': 'bench-profile',
+            'user': 'bench-user', 'project': TENANT, 'domain': None,
+            'index': i, 'role': None, 'init_time': self._timestamp(),
+            'created_time': self._timestamp(), 'updated_time': None,
+            'deleted_time': None, 'status': 'ACTIVE',
+            'status_reason': 'Creation succeeded', 'tags': {},
+            'data': {}, 'details': {},
+        }
+
+    def profile(self, i=0):
+        return {
+            'id': self.ids[i], 'name': 'profile-%d' % i,
+            'type': 'os.nova.server', 'context': {},
+            'spec': {'flavor': 'm1.small', 'image': 'cirros',
+                     'name': 'server', 'networks': [{'network': 'net'}],
+                     'metadata': {'group': 'bench'}},
+            'permission': '', 'tags': {}, 'created_time': self._timestamp(),
+            'updated_time': None, 'deleted_time': None,
+        }
+
+    def event(self, i=0):
+        return {
+            'id': self.ids[i], 'timestamp': self._timestamp(),
+            'obj_id': self.ids[0], 'obj_name': 'node-%d' % i,
+            'obj_type': 'NODE', 'cluster_id': self.ids[0],
+            'level': '20', 'user': 'bench-user', 'project': TENANT,
+            'action': 'NODE_CREATE', 'status': 'ACTIVE',
+            'status_reason': 'Creation succeeded', 'deleted_time': None,
+        }
+
+    def action(self, i=0):
+        return {
+            'id': self.ids[i], 'name': 'node_create_%d' % i,
+            'action': 'NODE_CREATE', 'context': {}, 'target': self.ids[0],
+            'cause': 'Derived Action', 'owner': None,
+            'interval': -1, 'start_time': 1433160000.0,
+            'end_time': 1433160003.5, 'timeout': 3600,
+            'status': 'SUCCEEDED', 'status_reason': 'Action completed',
+            'inputs': {}, 'outputs': {}, 'depends_on': [],
+            'depended_by': [self.ids[-1]], 'created_time': self._timestamp(),
+            'updated_time': None, 'deleted_time': None, 'data': {},
+        }
+
+    def _page(self, maker, kwargs):
+        limit = kwargs.get('limit')
+        count = min(int(limit), self.page_size) if limit else self.page_size
+        return [maker(i) for i in range(count)]
+
+    def respond(self, method, kwargs):
+        for kind in ('cluster', 'node', 'profile', 'event', 'action'):
+            if method == '%s_list' % kind:
+                return self._page(getattr(self, kind), kwargs)
+            if method in ('%s_get' % kind, '%s_create' % kind):
+                return getattr(self, kind)()
+        if method in ('cluster_scale_out', 'cluster_scale_in',
+                      'cluster_add_nodes', 'cluster_del_nodes'):
+            return {'action': self.ids[0]}
+        if method == 'cluster_delete':
+            return self.action()
+        raise NotImplementedError(method)
+
+
+def stub_engine(engine):
+    def call(client, ctxt, msg, version=None):
+        method, kwargs = msg
+        return TIMINGS.measure('rpc_stub', engine.respond, method, kwargs)
+
+    rpc_client.EngineClient.call = call
+    rpc_client.EngineClient.cast = call
+
+
+def request_mix(engine):
+    '''Requests of the mix, as (name, weight, method, path, body).'''
+    cid = engine.ids[0]
+    marker = engine.ids[1]
+    create = {'cluster': {'name': 'new', 'profile_id': cid,
+                          'size': 3, 'tags': {'group': 'bench'}}}
+    node = {'node': {'name': 'new', 'profile_id': cid,
+                     'cluster_id': cid, 'role': None, 'tags': {}}}
+    return [
+        ('cluster_list', 20, 'GET', '/clusters', None),
+        ('cluster_list_filtered', 10, 'GET',
+         '/clusters?status=ACTIVE&name=cluster-1&sort_keys=name'
+         '&sort_dir=asc&limit=10&marker=%s' % marker, None),
+        ('cluster_get', 20, 'GET', '/clusters/%s' % cid, None),
+        ('cluster_create', 5, 'POST', '/clusters', create),
+        ('cluster_scale_out', 5, 'PUT', '/clusters/%s/action' % cid,
+         {'scale_out': {'count': 2}}),
+        ('cluster_delete', 2, 'DELETE', '/clusters/%s' % cid, None),
+        ('node_list', 15, 'GET', '/nodes?cluster_id=%s&limit=20' % cid,
+         None),
+        ('node_get', 10, 'GET', '/nodes/%s' % cid, None),
+        ('node_create', 3, 'POST', '/nodes', node),
+        ('profile_list', 3, 'GET', '/profiles', None),
+        ('event_list', 4, 'GET', '/events?obj_type=NODE&limit=20', None),
+        ('action_list', 3, 'GET', '/actions?limit=20', None),
+    ]
+
+
+def make_request(method, path, body):
+    req = webob.Request.blank('/v1/%s%s' % (TENANT, path),
+                              method=method, headers=HEADERS)
+    if body is not None:
+        req.body = json.dumps(body)
+        req.content_type = 'application/json'
+    return req
+
+
+def run(app, mix, number, warmup):
+    names = [m[0] for m in mix]
+    weights = [m[1] for m in mix]
+    total = float(sum(weights))
+    choices = []
+    for entry in mix:
+        choices.extend([entry] * int(round(entry[1] / total * 100)))
+
+    rand = random.Random(42)
+    samples = collections.defaultdict(list)
+    statuses = collections.defaultdict(collections.Counter)
+
+    for i in range(warmup + number):
+        if i == warmup:
+            TIMINGS.reset()
+        name, weight, method, path, body = rand.choice(choices)
+        req = make_request(method, path, body)
+        start = timeit.default_timer()
+        resp = req.get_response(app)
+        elapsed = timeit.default_timer() - start
+        if i >= warmup:
+            samples[name].append(elapsed)
+            statuses[name][resp.status_int] += 1
+
+    return [(n, sorted(samples[n]), statuses[n]) for n in names
+            if samples[n]]
+
+
+def _percentile(samples, percent):
+    index = int(round((len(samples) - 1) * percent / 100.0))
+    return samples[index]
+
+
+def report(results, layers):
+    print('%-24s %8s %10s %10s %10s' % ('request', 'count', 'p50(ms)',
+                                        'p99(ms)', 'status'))
+    for name, samples, statuses in results:
+        print('%-24s %8d %10.3f %10.3f %10s' % (
+            name, len(samples), _percentile(samples, 50) * 1000,
+            _percentile(samples, 99) * 1000,
+            ','.join('%s' % s for s in sorted(statuses))))
+
+    print('')
+    print('%-24s %8s %12s' % ('layer', 'calls', 'mean(ms)'))
+    for name in layers + list(STAGES):
+        count = TIMINGS.counts.get(name, 0)
+        if not count:
+            continue
+        print('%-24s %8d %12.4f' % (
+            name, count, TIMINGS.totals[name] / count * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='Number of requests to send.')
+    parser.add_argument('--warmup', type=int, default=100,
+                        help='Number of requests sent before measuring.')
+    parser.add_argument('--page-size', type=int, default=50,
+                        help='Number of items in the listings returned by '
+                             'the engine stub.')
+    args = parser.parse_args()
+
+    CONF([], project='senlin', default_config_files=[])
+    CONF.set_override('policy_file', POLICY_FILE)
+    messaging.setup('fake://')
+
+    engine = FakeEngine(max(args.page_size, 2))
+    stub_engine(engine)
+    wsgi.Resource.dispatch = _timed_dispatch
+
+    app, layers = load_app()
+    results = run(app, request_mix(engine), args.requests, args.warmup)
+    report(results, layers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+'''
+Micro-benchmark for the routing of v1 API requests.
+
+Compares the routes middleware, which tries the regular expression of each
+route in turn, with the compiled route table used by the Router of
+senlin.common.wsgi, over requests for routes declared early and late in the
+v1 router and for paths matching no route.
+
+Usage: python tools/benchmarks/api_router.py [--number N]
+'''
+
+import argparse
+import timeit
+import uuid
+
+import routes.middleware
+
+from senlin.api.openstack import v1
+from senlin.common import messaging
+
+TENANT = uuid.uuid4().hex
+ID = str(uuid.uuid4())
+
+REQUESTS = [
+    ('GET', '/%s/profile_types' % TENANT),
+    ('GET', '/%s/profiles/%s' % (TENANT, ID)),
+    ('GET', '/%s/clusters' % TENANT),
+    ('PUT', '/%s/clusters/%s/action' % (TENANT, ID)),
+    ('GET', '/%s/nodes/%s' % (TENANT, ID)),
+    ('DELETE', '/%s/nodes/batch' % TENANT),
+    ('GET', '/%s/actions/%s' % (TENANT, ID)),
+    ('GET', '/%s/events/%s' % (TENANT, ID)),
+    ('GET', '/%s/build_info' % TENANT),
+    ('GET', '/%s/unknown/%s' % (TENANT, ID)),
+]
+
+
+def _noop(environ, start_response):
+    return []
+
+
+def _start_response(status, headers):
+    pass
+
+
+def _bench(func, number):
+    return min(timeit.repeat(func, repeat=3, number=number)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=10000,
+                        help='Iterations per measurement.')
+    args = parser.parse_args()
+
+    messaging.setup('fake://')
+    api = v1.API({})
+    middleware = routes.middleware.RoutesMiddleware(_noop, api.map)
+
+    print('routes: %d' % len(api.map.matchlist))
+    print('%-8s %-30s %12s %12s' % ('method', 'path', 'routes(us)',
+                                    'compiled(us)'))
+
+    for method, path in REQUESTS:
+        environ = {'REQUEST_METHOD': method, 'PATH_INFO': path,
+                   'QUERY_STRING': '', 'SCRIPT_NAME': '',
+                   'SERVER_NAME': 'localhost', 'SERVER_PORT': '8778',
+                   'wsgi.url_scheme': 'http'}
+        old = _bench(lambda: middleware(dict(environ), _start_response),
+                     args.number)
+        new = _bench(lambda: api._route(dict(environ)), args.number)
+        short = path.replace(TENANT, '{t}').replace(ID, '{id}')
+        print('%-8s %-30s %12.2f %12.2f' % (method, short, old, new))
+
+
+if __name__ == '__main__':
+    main()
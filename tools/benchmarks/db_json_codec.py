@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+'''
+Micro-benchmark for the JSON codec used by the Dict/List column types.
+
+Compares the plain standard library encoding with the codec in
+senlin.db.sqlalchemy.types over documents shaped like those stored in the
+action, profile and cluster tables.
+
+Usage: python tools/benchmarks/db_json_codec.py [--number N]
+'''
+
+import argparse
+import json
+import timeit
+import uuid
+
+from senlin.db.sqlalchemy import types
+
+
+def _action_context():
+    return {
+        'auth_url': 'http://192.168.1.10:5000/v3',
+        'auth_token': uuid.uuid4().hex * 4,
+        'auth_token_info': None,
+        'username': 'demo',
+        'user_id': uuid.uuid4().hex,
+        'password': None,
+        'tenant': 'demo',
+        'tenant_id': uuid.uuid4().hex,
+        'domain_id': None,
+        'project_id': uuid.uuid4().hex,
+        'project_domain_id': 'default',
+        'user_domain_id': 'default',
+        'region_name': 'RegionOne',
+        'roles': ['admin', 'heat_stack_owner'],
+        'show_deleted': False,
+        'is_admin': False,
+        'request_id': 'req-%s' % uuid.uuid4(),
+    }
+
+
+def _profile_spec():
+    resources = {}
+    for i in range(10):
+        resources['server%s' % i] = {
+            'type': 'OS::Nova::Server',
+            'properties': {
+                'image': 'cirros-0.3.2-x86_64-uec',
+                'flavor': 'm1.small',
+                'key_name': 'oskey',
+                'networks': [{'network': 'private'}],
+                'metadata': {'index': i, 'group': 'web'},
+            },
+        }
+    return {
+        'template': {
+            'heat_template_version': '2014-10-16',
+            'parameters': {'name': {'type': 'string', 'default': 'web'}},
+            'resources': resources,
+        },
+        'context': {'region_name': 'RegionOne'},
+        'disable_rollback': True,
+        'timeout': 60,
+    }
+
+
+def _cluster_data():
+    return {
+        'placement': {'zones': ['az-1', 'az-2', 'az-3']},
+        'lb': {'pool': uuid.uuid4().hex, 'vip': '10.0.0.10'},
+    }
+
+
+DOCUMENTS = {
+    'action.context': _action_context(),
+    'action.inputs': {'count': 5, 'nodes': [],
+                      'policy_id': str(uuid.uuid4())},
+    'action.depended_by': [str(uuid.uuid4()) for i in range(20)],
+    'profile.spec': _profile_spec(),
+    'cluster.tags': {'env': 'prod', 'owner': 'ops', 'tier': 'web'},
+    'cluster.data': _cluster_data(),
+}
+
+
+def _bench(func, number):
+    return min(timeit.repeat(func, repeat=3, number=number)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=10000,
+                        help='Iterations per measurement.')
+    args = parser.parse_args()
+
+    codec = types.CODEC
+    print('decoder: %s' % codec.decoder_module.__name__)
+    print('%-20s %8s %8s %10s %10s %10s %10s' % (
+        'document', 'bytes', 'compact', 'enc(us)', 'enc_new',
+        'dec(us)', 'dec_new'))
+
+    for name in sorted(DOCUMENTS):
+        doc = DOCUMENTS[name]
+        raw = json.dumps(doc)
+        compact = codec.encode(doc)
+
+        enc_old = _bench(lambda: json.dumps(doc), args.number)
+        enc_new = _bench(lambda: codec.encode(doc), args.number)
+        dec_old = _bench(lambda: json.loads(raw), args.number)
+        dec_new = _bench(lambda: codec.decode(compact), args.number)
+
+        print('%-20s %8d %8d %10.2f %10.2f %10.2f %10.2f' % (
+            name, len(raw), len(compact), enc_old, enc_new,
+            dec_old, dec_new))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+'''
+Benchmark of the action throughput of a single engine.
+
+An engine service is started in-process with the fake oslo.messaging
+transport and a SQLite database. Its clusters are made of servers of the
+in-memory fake cloud (see senlin/drivers/fake.py), whose call latency and
+failure rate can be set on the command line. For each cluster size, the
+benchmark creates a cluster, scales it out by half its size and deletes
+it, all through the engine RPC API, and reports for each operation:
+
+- the end-to-end latency, from the RPC call to the action completion;
+- the throughput, as actions (including derived node actions) per second;
+- the DB statements issued per node.
+
+Usage: python tools/benchmarks/engine_throughput.py [--sizes 10,100] ...
+'''
+
+import eventlet
+eventlet.monkey_patch()
+
+import argparse
+import os
+import shutil
+import tempfile
+import timeit
+
+from oslo_config import cfg
+from oslo_db import options
+
+from senlin.common import consts
+from senlin.common import context
+from senlin.common import messaging
+from senlin.db import api as db_api
+from senlin.drivers import fake as fakecloud
+from senlin.engine import environment
+from senlin.engine import service
+from senlin.profiles.fake import server as fake_server
+from senlin.rpc import client as rpc_client
+
+CONF = cfg.CONF
+
+FAKE_PROFILE_TYPE = 'fake.server'
+
+DONE_STATUSES = ('SUCCEEDED', 'FAILED', 'CANCELLED')
+
+
+def start_engine(args, workdir):
+    options.set_defaults(CONF, connection='sqlite:///%s' %
+                         os.path.join(workdir, 'senlin.db'))
+    CONF.set_override('db_query_stats', True)
+    CONF.set_override('db_slow_query_threshold', 0)
+    CONF.set_override('max_members_per_cluster', max(args.sizes) * 2)
+    CONF.set_override('periodic_interval', 3600)
+    CONF.set_override('periodic_enable', False)
+    CONF.set_override('environment_dir', os.path.join(workdir, 'env'))
+
+    db_api.db_sync(db_api.get_engine())
+    messaging.setup('fake://')
+
+    environment.initialize()
+    environment.global_env().register_profile(FAKE_PROFILE_TYPE,
+                                              fake_server.FakeServerProfile)
+
+    engine = service.EngineService(CONF.host, consts.ENGINE_TOPIC)
+    engine.start()
+    return engine
+
+
+def wait_action(action_id, poll):
+    while True:
+        # A new context each time, so that the action is not read from the
+        # identity map of an old session
+        action = db_api.action_get(context.get_admin_context(), action_id)
+        if action.status in DONE_STATUSES:
+            return action.status
+        eventlet.sleep(poll)
+
+
+def done_actions(ctx):
+    counts = db_api.action_count_by_status(ctx)
+    return sum(counts.get(s, 0) for s in DONE_STATUSES)
+
+
+def measure(ctx, nodes, call, poll):
+    '''Run an operation and wait for its action to complete.'''
+    actions = done_actions(ctx)
+    statements = db_api.get_query_counters()['statements']
+    start = timeit.default_timer()
+
+    action_id = call()
+    status = wait_action(action_id, poll)
+
+    elapsed = timeit.default_timer() - start
+    actions = done_actions(ctx) - actions
+    statements = db_api.get_query_counters()['statements'] - statements
+    return {
+        'status': status,
+        'latency': elapsed,
+        'actions_per_sec': actions / elapsed,
+        'statements_per_node': statements / float(max(nodes, 1)),
+    }
+
+
+def run(client, ctx, profile_id, size, poll):
+    results = []
+
+    def create():
+        cluster = client.cluster_create(ctx, 'bench-%d' % size, size,
+                                        profile_id)
+        results.append(cluster['id'])
+        return cluster['action']
+
+    yield 'create', measure(ctx, size, create, poll)
+    cluster_id = results[0]
+
+    count = max(size // 2, 1)
+    yield 'scale_out', measure(
+        ctx, count,
+        lambda: client.cluster_scale_out(ctx, cluster_id, count)['action'],
+        poll)
+
+    yield 'delete', measure(
+        ctx, size + count,
+        lambda: client.cluster_delete(ctx, cluster_id, cast=False)['id'],
+        poll)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='10,100',
+                        help='Comma separated cluster sizes, e.g. '
+                             '10,100,1000,10000.')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Mean latency of fake cloud calls in seconds.')
+    parser.add_argument('--distribution', default=fakecloud.CONSTANT,
+                        choices=fakecloud.LATENCY_DISTRIBUTIONS,
+                        help='Distribution of the fake cloud latency.')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='Probability of a fake cloud call to fail.')
+    parser.add_argument('--poll', type=float, default=0.05,
+                        help='Seconds between action status checks.')
+    args = parser.parse_args()
+    args.sizes = [int(s) for s in args.sizes.split(',')]
+
+    CONF([], project='senlin', default_config_files=[])
+    workdir = tempfile.mkdtemp(prefix='senlin-bench-')
+    os.mkdir(os.path.join(workdir, 'env'))
+    try:
+        engine = start_engine(args, workdir)
+        client = rpc_client.EngineClient()
+        ctx = context.RequestContext(user='bench', tenant_id='bench',
+                                     is_admin=True)
+
+        spec = {
+            'latency': {'distribution': args.distribution,
+                        'mean': args.latency},
+            'failure_rate': args.failure_rate,
+        }
+        profile = client.profile_create(ctx, 'bench', FAKE_PROFILE_TYPE,
+                                        spec, None, None)
+
+        print('%-8s %-10s %-10s %12s %12s %14s' % (
+            'size', 'operation', 'status', 'latency(s)', 'actions/s',
+            'stmts/node'))
+        for size in args.sizes:
+            for name, res in run(client, ctx, profile['id'], size,
+                                 args.poll):
+                print('%-8d %-10s %-10s %12.3f %12.1f %14.1f' % (
+                    size, name, res['status'], res['latency'],
+                    res['actions_per_sec'], res['statements_per_node']))
+
+        engine.stop()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()